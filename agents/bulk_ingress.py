@@ -0,0 +1,302 @@
+"""
+Bulk ingestion engine for large resume folders.
+
+Walks a directory tree and pushes every resume (PDF, DOCX or TXT) through
+three pipelined stages:
+- text extraction in a process pool (CPU bound)
+- LLM parsing with bounded concurrency (network bound)
+- batched embedding generation and ChromaDB insertion on a dedicated indexer thread
+
+Files are hashed in the extraction pool. Identical files in one run are
+ingested once. Files already in the ingest cache skip whichever stages have
+stored outputs; each file's resume id is reserved in the cache before it is
+parsed, so a re-run after a crash finishes half-ingested files under their
+original ids.
+
+At the end it reports throughput and a per-file success/failure manifest.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from extractors import SUPPORTED_EXTENSIONS
+
+from .resume_ingress import ResumeIngressAgent, compute_content_hash, extract_document_result
+
+
+_INDEX_DONE = object()
+
+
+@dataclass
+class FileResult:
+    """Outcome of ingesting a single file."""
+    path: str
+    status: str = "pending"  # pending, success, failed
+    resume_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    cached: bool = False
+    failed_stage: Optional[str] = None  # extract, parse, embed, index
+    error: Optional[str] = None
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
+
+
+@dataclass
+class IngestionReport:
+    """Throughput numbers and manifest for a bulk run."""
+    root: str
+    started_at: float
+    finished_at: float = 0.0
+    results: Dict[str, FileResult] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> List[FileResult]:
+        return [r for r in self.results.values() if r.status == "success"]
+
+    @property
+    def failed(self) -> List[FileResult]:
+        return [r for r in self.results.values() if r.status != "success"]
+
+    @property
+    def elapsed(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
+
+    @property
+    def resumes_per_minute(self) -> float:
+        if not self.elapsed:
+            return 0.0
+        return len(self.succeeded) / (self.elapsed / 60)
+
+    def to_dict(self) -> dict:
+        return {
+            "root": self.root,
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "elapsed_seconds": round(self.elapsed, 2),
+            "resumes_per_minute": round(self.resumes_per_minute, 2),
+            "files": [
+                {**asdict(r), "elapsed_seconds": round(r.elapsed, 2)}
+                for r in sorted(self.results.values(), key=lambda r: r.path)
+            ],
+        }
+
+    def write_manifest(self, manifest_path: str) -> None:
+        with open(manifest_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print_summary(self) -> None:
+        print(f"\n=== Bulk Ingestion Summary ===")
+        print(f"Root: {self.root}")
+        print(f"Successfully processed: {len(self.succeeded)}")
+        print(f"Served from ingest cache: {len([r for r in self.succeeded if r.cached])}")
+        print(f"Failed: {len(self.failed)}")
+        print(f"Total: {len(self.results)}")
+        print(f"Elapsed: {self.elapsed:.1f}s")
+        print(f"Throughput: {self.resumes_per_minute:.1f} resumes/min")
+        for result in self.failed:
+            print(f"❌ {result.path} [{result.failed_stage}]: {result.error}")
+
+
+def find_resume_files(root: str, extensions=SUPPORTED_EXTENSIONS) -> List[str]:
+    """Recursively collect resume files under root, in a stable order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                found.append(os.path.join(dirpath, filename))
+    return found
+
+
+class BulkIngestionPipeline:
+    def __init__(self, agent: ResumeIngressAgent = None, extract_workers: int = None,
+                 llm_concurrency: int = 4, index_queue_size: int = 64):
+        self.agent = agent or ResumeIngressAgent()
+        self.extract_workers = extract_workers or os.cpu_count() or 1
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.index_queue_size = index_queue_size
+
+    def run(self, root: str) -> IngestionReport:
+        """Ingest every supported resume file under root and return the run report."""
+        paths = find_resume_files(root)
+        report = IngestionReport(root=root, started_at=time.time())
+        for path in paths:
+            report.results[path] = FileResult(path=path, started_at=report.started_at)
+
+        print(f"Bulk ingesting {len(paths)} resumes from {root} "
+              f"({self.extract_workers} extract workers, {self.llm_concurrency} concurrent LLM calls)")
+
+        # Bounded so a fast parser cannot run arbitrarily far ahead of indexing
+        index_queue = queue.Queue(maxsize=self.index_queue_size)
+        indexer = threading.Thread(target=self._index_worker, args=(index_queue, report), daemon=True)
+        indexer.start()
+
+        with ProcessPoolExecutor(max_workers=self.extract_workers) as extract_pool, \
+                ThreadPoolExecutor(max_workers=self.llm_concurrency) as parse_pool:
+            extract_futures = {}
+            parse_futures = []
+            # First file seen with each content hash; identical copies in the
+            # same run take its outcome instead of being parsed again
+            first_by_hash: Dict[str, str] = {}
+            duplicates: List[FileResult] = []
+
+            # Hashing reads every byte, so it runs in the extract workers too
+            hash_futures = {extract_pool.submit(compute_content_hash, path): path for path in paths}
+            for hash_future in as_completed(hash_futures):
+                path = hash_futures[hash_future]
+                result = report.results[path]
+                try:
+                    result.content_hash = hash_future.result()
+                    if result.content_hash in first_by_hash:
+                        duplicates.append(result)
+                        continue
+                    first_by_hash[result.content_hash] = path
+                    cached = self.agent.db.get_ingest_cache_entry(result.content_hash)
+                except Exception as e:
+                    self._fail(result, "extract", e)
+                    continue
+
+                if cached and cached.is_complete:
+                    self.agent._restore_parsed_resume(cached.resume_id, cached.parsed_json)
+                    result.resume_id = cached.resume_id
+                    result.cached = True
+                    result.status = "success"
+                    result.finished_at = time.time()
+                elif cached and cached.resume_id and cached.parsed_json and cached.embedding is not None:
+                    # Embedded before a failed ChromaDB write: index the stored vector
+                    self._index_stored(result, cached)
+                elif cached and cached.resume_id and cached.parsed_json:
+                    self.agent._restore_parsed_resume(cached.resume_id, cached.parsed_json)
+                    result.resume_id = cached.resume_id
+                    index_queue.put(result)
+                elif cached and cached.raw_text:
+                    parse_futures.append(parse_pool.submit(self._parse, path, cached.raw_text, report, index_queue))
+                else:
+                    # Files already run in parallel here, so pages are extracted inline
+                    future = extract_pool.submit(extract_document_result, path, self.agent.settings.pdf_backend)
+                    extract_futures[future] = path
+
+            for future in as_completed(extract_futures):
+                path = extract_futures[future]
+                try:
+                    raw_text = self.agent._record_extraction(path, future.result())
+                except Exception as e:
+                    self._fail(report.results[path], "extract", e)
+                    continue
+                self.agent.db.upsert_ingest_cache_entry(report.results[path].content_hash, raw_text=raw_text,
+                                                        stage="extracted")
+                parse_futures.append(parse_pool.submit(self._parse, path, raw_text, report, index_queue))
+
+            for future in parse_futures:
+                future.result()
+
+        index_queue.put(_INDEX_DONE)
+        indexer.join()
+
+        for result in duplicates:
+            self._copy_outcome(result, report.results[first_by_hash[result.content_hash]])
+
+        report.finished_at = time.time()
+        return report
+
+    def _parse(self, path: str, raw_text: str, report: IngestionReport, index_queue: queue.Queue) -> None:
+        """LLM stage: parse one resume and hand it to the indexer."""
+        result = report.results[path]
+        try:
+            resume_id = self.agent.db.reserve_ingest_resume_id(result.content_hash)
+            result.resume_id = self.agent._extract_structured_data(raw_text, path, resume_id)
+            self.agent.db.upsert_ingest_cache_entry(
+                result.content_hash,
+                resume_id=result.resume_id,
+                parsed_json=self.agent._read_parsed_json(result.resume_id),
+                stage="parsed",
+            )
+        except Exception as e:
+            self._fail(result, "parse", e)
+            return
+        index_queue.put(result)
+
+    def _index_worker(self, index_queue: queue.Queue, report: IngestionReport) -> None:
+        """Embedding/indexing stage, fed by the parse stage.
+
+        Texts are handed to the agent's embedding batcher so many resumes share
+        one embed call and one ChromaDB write.
+        """
+        batcher = self.agent.embedding_batcher
+        in_flight = []
+        while True:
+            result = index_queue.get()
+            if result is _INDEX_DONE:
+                break
+
+            if batcher is None:
+                self._fail(result, "embed", RuntimeError("Embedding provider not available"))
+                continue
+
+            try:
+                parsed_json = self.agent._read_parsed_json(result.resume_id)
+                embedding_text = self.agent._get_embedding_text(result.resume_id, parsed_json)
+                future = batcher.submit(result.resume_id, embedding_text,
+                                        metadata=self.agent._embedding_metadata(parsed_json))
+            except Exception as e:
+                self._fail(result, "embed", e)
+                continue
+            future.add_done_callback(lambda f, result=result: self._indexed(result, f))
+            in_flight.append(future)
+
+        if batcher is not None:
+            batcher.flush()
+        wait(in_flight)
+
+    def _indexed(self, result: FileResult, future) -> None:
+        error = future.exception()
+        if error is not None:
+            self._fail(result, getattr(error, "stage", "embed"), error)
+            return
+        result.status = "success"
+        result.finished_at = time.time()
+
+    def _index_stored(self, result: FileResult, cached) -> None:
+        """Finish the indexed stage from an embedding already in the ingest cache."""
+        self.agent._restore_parsed_resume(cached.resume_id, cached.parsed_json)
+        result.resume_id = cached.resume_id
+        result.cached = True
+        try:
+            self.agent._commit_embeddings(
+                [cached.resume_id], [cached.embedding],
+                [self.agent._get_embedding_text(cached.resume_id, cached.parsed_json)],
+                [self.agent._embedding_metadata(cached.parsed_json)],
+            )
+        except Exception as e:
+            self._fail(result, "index", e)
+            return
+        result.status = "success"
+        result.finished_at = time.time()
+
+    @staticmethod
+    def _copy_outcome(result: FileResult, original: FileResult) -> None:
+        """Finish a file identical to one already ingested in this run with that file's outcome."""
+        result.status = original.status
+        result.resume_id = original.resume_id
+        result.cached = original.status == "success"
+        result.failed_stage = original.failed_stage
+        result.error = original.error
+        result.finished_at = original.finished_at or time.time()
+
+    @staticmethod
+    def _fail(result: FileResult, stage: str, error: Exception) -> None:
+        result.status = "failed"
+        result.failed_stage = stage
+        result.error = str(error)
+        result.finished_at = time.time()
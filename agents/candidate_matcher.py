@@ -7,15 +7,23 @@ Crew AI Agent that takes in a Job Description
 
 import os
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from pydantic_settings import BaseSettings
 
 import chromadb
-import voyageai
 from crewai import Agent, Task, Crew, LLM
 from crewai.tools import tool
 
+from database.models import JobRequirement
+from database.operations import DatabaseOperations, job_description_hash
+from utils.embedding_providers import get_embedding_provider
+from utils.hybrid_retrieval import DEFAULT_RRF_K, RETRIEVAL_MODES, HybridRetriever
+from utils.llm_cache import with_llm_cache
+from utils.query_embedding_cache import get_query_embedding_cache
+from utils.ranking_cache import get_ranking_cache, ranking_cache_key
+from utils.resume_metadata import build_where, normalize_filters
+
 from .scheduler_agent import get_available_slots_direct
 
 
@@ -24,6 +32,15 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     voyage_api_key: str = ""
     chroma_db_path: str = "./chroma_db"
+    sqlite_db_path: str = "recruiter.db"
+    # Must match the provider and model used for ingestion
+    embedding_provider: str = "voyage"
+    embedding_model: str = "voyage-2"
+    # vector, lexical (BM25 over resume_fts) or hybrid (both, fused by reciprocal rank)
+    retrieval_mode: str = "hybrid"
+    hybrid_rrf_k: int = DEFAULT_RRF_K
+    # Candidates taken from each ranking before fusion
+    hybrid_candidate_pool: int = 50
     
     model_config = ConfigDict(env_file=".env", extra="ignore")
 
@@ -60,25 +77,38 @@ class EmailDraft(BaseModel):
 class CandidateMatcherAgent:
     def __init__(self, settings: Settings = None):
         self.settings = settings or Settings()
+        self.db = DatabaseOperations(self.settings.sqlite_db_path)
         
         # Configure LLM to use Anthropic Claude
-        self.llm = LLM(
-            model="claude-3-5-sonnet-20241022", 
+        self.llm_model = "claude-3-5-sonnet-20241022"
+        self.llm = with_llm_cache(LLM(
+            model=self.llm_model, 
             api_key=self.settings.anthropic_api_key
+        ))
+        
+        # Query embeddings must come from the same provider and model as ingestion
+        self.embedding_provider = get_embedding_provider(
+            embedding_provider=self.settings.embedding_provider,
+            voyage_api_key=self.settings.voyage_api_key,
+            embedding_model=self.settings.embedding_model,
         )
+        if self.embedding_provider is None:
+            raise Exception("Voyage API key required for the voyage embedding provider (or set EMBEDDING_PROVIDER=local)")
+        self.query_cache = get_query_embedding_cache()
+        self.ranking_cache = get_ranking_cache()
         
         # Initialize ChromaDB
         self.chroma_client = chromadb.PersistentClient(path=self.settings.chroma_db_path)
         try:
-            self.collection = self.chroma_client.get_collection("resume_embeddings")
+            self.collection = self.chroma_client.get_collection(self.embedding_provider.collection_name)
         except Exception as e:
             raise Exception(f"Resume embeddings collection not found. Run resume_ingress.py first. Error: {e}")
-        
-        # Initialize Voyage client for consistent embeddings
-        if self.settings.voyage_api_key:
-            self.voyage_client = voyageai.Client(api_key=self.settings.voyage_api_key)
-        else:
-            raise Exception("Voyage API key required for consistent embeddings")
+        if self.settings.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"RETRIEVAL_MODE must be one of: {', '.join(RETRIEVAL_MODES)}")
+        self.retriever = HybridRetriever(
+            self.collection, self.db, self._embed_query,
+            rrf_k=self.settings.hybrid_rrf_k, pool_size=self.settings.hybrid_candidate_pool
+        )
         
         # Create the RAG search tool and scheduling tool
         self.search_tool = self._create_search_tool()
@@ -94,15 +124,7 @@ class CandidateMatcherAgent:
             llm=self.llm
         )
         
-        self.candidate_ranker = Agent(
-            role="Candidate Ranking Specialist", 
-            goal="Rank and evaluate candidates based on job requirements with detailed rationale",
-            backstory="You are a senior recruiter with expertise in matching candidates to roles. You provide detailed analysis of why candidates are good matches, including strengths, concerns, and specific relevant experience.",
-            verbose=True,
-            allow_delegation=False,
-            llm=self.llm,
-            tools=[self.search_tool]
-        )
+        self.candidate_ranker = self._create_candidate_ranker(self.search_tool)
         
         self.email_writer = Agent(
             role="Personalized Email Writer",
@@ -114,8 +136,23 @@ class CandidateMatcherAgent:
             tools=[self.schedule_tool]
         )
     
-    def _create_search_tool(self):
-        """Create a custom ChromaDB search tool for finding candidates."""
+    def _create_candidate_ranker(self, search_tool) -> Agent:
+        return Agent(
+            role="Candidate Ranking Specialist", 
+            goal="Rank and evaluate candidates based on job requirements with detailed rationale",
+            backstory="You are a senior recruiter with expertise in matching candidates to roles. You provide detailed analysis of why candidates are good matches, including strengths, concerns, and specific relevant experience.",
+            verbose=True,
+            allow_delegation=False,
+            llm=self.llm,
+            tools=[search_tool]
+        )
+    
+    def _create_search_tool(self, where: Dict[str, Any] = None):
+        """Create a custom ChromaDB search tool for finding candidates.
+        
+        `where` (see utils.resume_metadata.build_where) restricts every search
+        to matching resumes before similarity ranking.
+        """
         
         @tool("Search Resume Database")
         def search_candidates(query: str) -> str:
@@ -129,40 +166,31 @@ class CandidateMatcherAgent:
                 JSON string containing candidate information and resume data
             """
             try:
-                # Generate embedding using the same model as resume ingestion (Voyage AI)
-                embedding_result = self.voyage_client.embed(
-                    texts=[query], 
-                    model="voyage-2",  # Same model used in resume_ingress.py
-                    input_type="query"  # Use 'query' for search queries
-                )
-                query_embedding = embedding_result.embeddings[0]
-                
-                # Query ChromaDB for similar resumes using embedding
-                results = self.collection.query(
-                    query_embeddings=[query_embedding],
+                # Vector search (embedded with the same provider and model as
+                # resume ingestion) and/or BM25 over exact terms
+                hits = self.retriever.search(
+                    query,
                     n_results=10,  # Get top 10 to have more options for ranking
-                    include=["documents", "metadatas", "distances"]
+                    where=where,
+                    mode=self.settings.retrieval_mode
                 )
                 
+                # Documents hold the embedding text; the full resumes come
+                # from resume_data in one query
+                resumes = self.db.get_resumes([hit["id"] for hit in hits])
                 candidates = []
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results['documents'][0], 
-                    results.get('metadatas', [[{}] * len(results['documents'][0])])[0],
-                    results['distances'][0]
-                )):
-                    # Parse the resume JSON
-                    try:
-                        resume_data = json.loads(doc)
-                        similarity_score = max(0, 1 - distance)  # Convert distance to similarity
-                        
-                        candidate_info = {
-                            "candidate_id": results['ids'][0][i],
-                            "similarity_score": similarity_score,
-                            "resume_data": resume_data
-                        }
-                        candidates.append(candidate_info)
-                    except json.JSONDecodeError:
+                for hit in hits:
+                    resume_data = resumes.get(hit["id"])
+                    if resume_data is None:
                         continue
+                    
+                    candidate_info = {
+                        "candidate_id": hit["id"],
+                        "similarity_score": hit["similarity_score"],
+                        "keyword_match": hit["lexical_rank"] is not None,
+                        "resume_data": resume_data
+                    }
+                    candidates.append(candidate_info)
                 
                 return json.dumps({
                     "total_found": len(candidates),
@@ -175,6 +203,14 @@ class CandidateMatcherAgent:
         
         return search_candidates
     
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a search query; repeats (and concurrent duplicates) skip the provider call."""
+        if self.query_cache is None:
+            return self.embedding_provider.embed_query(query)
+        return self.query_cache.get_or_embed(
+            self.embedding_provider.name, self.embedding_provider.model, query, self.embedding_provider.embed_query
+        )
+    
     def _create_schedule_tool(self):
         """Create a tool to get available time slots."""
         
@@ -194,6 +230,112 @@ class CandidateMatcherAgent:
         
         return get_time_slots
     
+    def get_job_analysis(self, job_description: str) -> Optional[JobRequirement]:
+        """The stored analysis of a job description, if it has been analyzed with the current model."""
+        requirement = self.db.get_job_requirement(job_description_hash(job_description))
+        if requirement is None or requirement.model != self.llm_model:
+            return None
+        return requirement
+    
+    def analyze_job(self, job_description: str, job_title: str = "") -> JobRequirement:
+        """
+        Analyze a job description with the Job Requirements Analyzer, once per posting.
+        
+        The analysis is stored in job_requirements keyed by the normalized
+        description's hash, so repeat searches for the same posting skip the
+        LLM round trip.
+        """
+        requirement = self.get_job_analysis(job_description)
+        if requirement is not None:
+            print(f"📋 Reusing stored job analysis for '{requirement.title}'")
+            return requirement
+        
+        job_analysis_task = Task(
+            description=f"""
+            Analyze the following job description and extract the key requirements:
+            
+            Job Title: {job_title}
+            Job Description: {job_description}
+            
+            Extract and identify:
+            1. Required technical skills and technologies
+            2. Years of experience needed
+            3. Industry/domain requirements
+            4. Education requirements
+            5. Soft skills and leadership requirements
+            6. Key responsibilities
+            
+            Create a search query that would help find the most relevant candidates.
+            Focus on the most important 3-5 criteria that would differentiate strong candidates.
+            
+            Return your analysis as a JSON object with this exact structure:
+            {{
+                "search_query": "<optimized search query for finding relevant candidates>",
+                "required_skills": ["skill1", "skill2"],
+                "min_yoe": <minimum years of experience, or null>,
+                "max_yoe": <maximum years of experience, or null>,
+                "industry": "<industry or domain, or null>",
+                "key_requirements": ["requirement1", "requirement2"]
+            }}
+            """,
+            agent=self.job_analyzer,
+            expected_output="JSON object with search query and key requirements analysis"
+        )
+        
+        crew = Crew(
+            agents=[self.job_analyzer],
+            tasks=[job_analysis_task],
+            verbose=True
+        )
+        result = crew.kickoff()
+        
+        requirement = JobRequirement(
+            id=None,
+            title=job_title,
+            required_skills=[],
+            min_yoe=None,
+            max_yoe=None,
+            industry=None,
+            description=job_description,
+            jd_hash=job_description_hash(job_description),
+            model=self.llm_model
+        )
+        result_str = str(result)
+        try:
+            if "{" not in result_str:
+                raise ValueError("No JSON found in result")
+            analysis = json.loads(result_str[result_str.find("{"):result_str.rfind("}") + 1])
+            requirement.search_query = str(analysis.get("search_query") or "").strip() or None
+            requirement.required_skills = [str(s) for s in analysis.get("required_skills") or []]
+            requirement.min_yoe = analysis.get("min_yoe") if isinstance(analysis.get("min_yoe"), int) else None
+            requirement.max_yoe = analysis.get("max_yoe") if isinstance(analysis.get("max_yoe"), int) else None
+            requirement.industry = analysis.get("industry") or None
+            requirement.key_requirements = [str(r) for r in analysis.get("key_requirements") or []]
+        except Exception as e:
+            # Not stored, so the next search for this posting analyzes it again
+            print(f"⚠️ Could not parse job analysis: {e}")
+            requirement.key_requirements = [result_str.strip()] if result_str.strip() else []
+            return requirement
+        
+        requirement.id = self.db.save_job_requirement(requirement)
+        return requirement
+    
+    def _format_job_analysis(self, requirement: JobRequirement) -> str:
+        """Job analysis as prompt text for the ranking and email tasks."""
+        lines = []
+        if requirement.search_query:
+            lines.append(f"Search Query: {requirement.search_query}")
+        if requirement.required_skills:
+            lines.append(f"Required Skills: {', '.join(requirement.required_skills)}")
+        if requirement.min_yoe is not None or requirement.max_yoe is not None:
+            lines.append(f"Years of Experience: {requirement.min_yoe if requirement.min_yoe is not None else 'any'}"
+                         f" to {requirement.max_yoe if requirement.max_yoe is not None else 'any'}")
+        if requirement.industry:
+            lines.append(f"Industry: {requirement.industry}")
+        if requirement.key_requirements:
+            lines.append("Key Requirements:\n" + "\n".join(f"- {r}" for r in requirement.key_requirements))
+        return "\n".join(lines) or "No analysis available; derive the requirements from the job description."
+    
     def create_email_draft(self, candidate: CandidateMatch, job_description: str, job_title: str, company_name: str = "Our Company") -> EmailDraft:
         """
         Create a personalized email draft for a specific candidate.
@@ -208,6 +350,16 @@ class CandidateMatcherAgent:
             EmailDraft object with personalized email content and time slots
         """
         
+        # Reuse the analysis from the search for this posting; drafting an
+        # email never pays for a new one
+        analysis = self.get_job_analysis(job_description)
+        requirements_text = ""
+        if analysis is not None:
+            requirements_text = f"""
+            Role Requirements (from the job analysis):
+            {self._format_job_analysis(analysis)}
+            """
+        
         # Task to create personalized email
         email_task = Task(
             description=f"""
@@ -223,7 +375,7 @@ class CandidateMatcherAgent:
             Company: {company_name}
             Position: {job_title}
             Job Description: {job_description}
-            
+            {requirements_text}
             Instructions:
             1. First, use the "Get Available Time Slots" tool to retrieve 3 available interview times
             2. Write a compelling subject line (max 60 characters)
@@ -285,52 +437,60 @@ class CandidateMatcherAgent:
                 time_slots=["Monday: 9:00 AM - 9:30 AM", "Tuesday: 2:00 PM - 2:30 PM", "Wednesday: 4:00 PM - 4:30 PM"]
             )
     
-    def find_best_candidates(self, job_description: str, job_title: str = "") -> CandidateRanking:
+    def find_best_candidates(self, job_description: str, job_title: str = "", use_cache: bool = True,
+                             filters: Dict[str, Any] = None) -> CandidateRanking:
         """
         Main method to find and rank the best candidates for a job.
         
+        Rankings are cached per posting, title and model until the next
+        change to the searchable corpus.
+        
         Args:
             job_description: The job description text
             job_title: Optional job title
+            use_cache: Set False to rank again even if a cached ranking is current
+            filters: Optional structured filters (category, seniority_level,
+                min_yoe, max_yoe, skills) applied inside the vector search
             
         Returns:
             CandidateRanking object with top 5 ranked candidates
         """
         
-        # Task 1: Analyze job requirements
-        job_analysis_task = Task(
-            description=f"""
-            Analyze the following job description and extract the key requirements:
-            
-            Job Title: {job_title}
-            Job Description: {job_description}
-            
-            Extract and identify:
-            1. Required technical skills and technologies
-            2. Years of experience needed
-            3. Industry/domain requirements
-            4. Education requirements
-            5. Soft skills and leadership requirements
-            6. Key responsibilities
-            
-            Create a search query that would help find the most relevant candidates.
-            Focus on the most important 3-5 criteria that would differentiate strong candidates.
-            
-            Return your analysis in this format:
-            SEARCH_QUERY: [optimized search query for finding relevant candidates]
-            KEY_REQUIREMENTS: [list of the most important requirements]
-            """,
-            agent=self.job_analyzer,
-            expected_output="Search query and key requirements analysis"
-        )
+        # Read before ranking: a resume indexed meanwhile bumps the version
+        # past this one, so the ranking is never served for the newer corpus
+        corpus_version = self.db.get_corpus_version()
+        filters = normalize_filters(filters)
+        # Retrieval mode changes which candidates the ranker sees
+        cache_key = ranking_cache_key(job_description_hash(job_description), job_title,
+                                      f"{self.llm_model}/{self.settings.retrieval_mode}", filters)
+        if self.ranking_cache is not None and use_cache:
+            cached = self.ranking_cache.get(cache_key, corpus_version)
+            if cached is not None:
+                print(f"📋 Reusing cached ranking for '{job_title}' (corpus version {corpus_version})")
+                return CandidateRanking(**cached)
+        
+        # Analyze job requirements (stored per posting, so repeats skip the LLM)
+        analysis = self.analyze_job(job_description, job_title)
         
-        # Task 2: Search and rank candidates
+        # Filtered searches get their own tool so concurrent searches don't share filters
+        ranker = self.candidate_ranker
+        filter_text = ""
+        if filters:
+            ranker = self._create_candidate_ranker(self._create_search_tool(build_where(filters)))
+            filter_text = f"""
+            The search only returns candidates matching these filters: {json.dumps(filters)}
+            """
+        
+        # Search and rank candidates
         ranking_task = Task(
             description=f"""
             Using the job analysis, search for candidates and provide a detailed ranking.
             
             Job Description: {job_description}
             
+            Job Analysis:
+            {self._format_job_analysis(analysis)}
+            {filter_text}
             Steps:
             1. Use the Search Resume Database tool with the search query from the job analysis
             2. Evaluate each candidate against the job requirements
@@ -360,15 +520,14 @@ class CandidateMatcherAgent:
                 "summary": "<overall summary of the candidate pool and top recommendations>"
             }}
             """,
-            agent=self.candidate_ranker,
-            expected_output="JSON object with ranked candidates",
-            context=[job_analysis_task]
+            agent=ranker,
+            expected_output="JSON object with ranked candidates"
         )
         
         # Create and run the crew
         crew = Crew(
-            agents=[self.job_analyzer, self.candidate_ranker],
-            tasks=[job_analysis_task, ranking_task],
+            agents=[ranker],
+            tasks=[ranking_task],
             verbose=True
         )
         
@@ -384,11 +543,11 @@ class CandidateMatcherAgent:
                 json_end = result_str.rfind("}") + 1
                 json_str = result_str[json_start:json_end]
                 result_data = json.loads(json_str)
-                return CandidateRanking(**result_data)
+                ranking = CandidateRanking(**result_data)
             else:
                 raise ValueError("No JSON found in result")
         except Exception as e:
-            # Fallback: return empty result
+            # Fallback: return empty result (not cached, the next run ranks again)
             return CandidateRanking(
                 job_title=job_title or "Unknown Position",
                 total_candidates_found=0,
@@ -396,6 +555,11 @@ class CandidateMatcherAgent:
                 search_query_used="",
                 summary=f"Error processing results: {str(e)}"
             )
+        
+        if self.ranking_cache is not None:
+            self.ranking_cache.put(cache_key, corpus_version, ranking.model_dump(), model=self.llm_model,
+                                   job_title=job_title)
+        return ranking
 
 
 def main():
@@ -0,0 +1,297 @@
+"""
+Directory watcher feeding new resume files into the durable ingestion queue.
+
+Watches the configured folders (uploads/ and data/ by default) with inotify
+through watchdog when it is installed, or by polling otherwise. A file is
+only picked up once its size and mtime have stayed put for the debounce
+window, so half-copied files are never parsed. Every handled path is kept in
+the watch_manifest table with its stat and content hash:
+- an unchanged file is skipped on the stat alone, without reading it;
+- a touched but identical file, or a copy of a file already queued, is
+  skipped on its hash;
+- a file that is not a readable PDF/DOCX/TXT is recorded as rejected.
+
+Only new work reaches the queue, so the archive never needs a full re-ingest.
+
+    python -m agents.directory_watcher uploads data
+    python -m agents.directory_watcher data --once   # one pass, e.g. from cron
+"""
+
+import argparse
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+from database.job_queue import IngestJobQueue
+from database.models import WatchedFile
+from database.watch_manifest import WatchManifest
+from extractors import DEFAULT_PDF_BACKEND, SUPPORTED_EXTENSIONS, UnsupportedFileError, validate_document
+
+from .resume_ingress import compute_content_hash
+
+
+# Editor swap files and in-progress downloads
+IGNORED_SUFFIXES = (".part", ".partial", ".tmp", ".crdownload", ".swp", "~")
+
+
+class WatcherSettings(BaseSettings):
+    """Directory watcher settings from environment variables."""
+    sqlite_db_path: str = "recruiter.db"
+    pdf_backend: str = DEFAULT_PDF_BACKEND
+    # Comma-separated folders to watch
+    watch_directories: str = "uploads,data"
+    # A file must be unchanged this long before it is queued
+    watch_debounce_seconds: float = 2.0
+    # Rescan interval when inotify (watchdog) is unavailable or disabled
+    watch_poll_interval_seconds: float = 30.0
+    watch_use_inotify: bool = True
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+
+def _file_stat(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DirectoryWatcher:
+    def __init__(self, submit: Callable[[str, str, str], object], directories: List[str],
+                 manifest: WatchManifest, debounce_seconds: float = 2.0, poll_interval: float = 30.0,
+                 use_inotify: bool = True, pdf_backend: str = DEFAULT_PDF_BACKEND):
+        """`submit(job_id, file_path, filename)` enqueues one ingestion job."""
+        self.submit = submit
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.manifest = manifest
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.pdf_backend = pdf_backend
+
+        self._known: Dict[str, tuple] = manifest.load_stats()
+        # path -> (size, mtime_ns, monotonic time of the last change)
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._observer = None
+        self.queued = 0
+
+    # -- discovery -------------------------------------------------------
+
+    @staticmethod
+    def _is_candidate(path: str) -> bool:
+        name = os.path.basename(path)
+        if name.startswith(".") or name.endswith(IGNORED_SUFFIXES):
+            return False
+        return name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+    def notice(self, path: str):
+        """Note a created/modified file; it is queued once it settles."""
+        path = os.path.abspath(path)
+        if not self._is_candidate(path):
+            return
+        stat = _file_stat(path)
+        if stat is None:
+            return
+        with self._lock:
+            if self._known.get(path) == stat:
+                return
+            pending = self._pending.get(path)
+            if pending is None or pending[:2] != stat:
+                self._pending[path] = (*stat, time.monotonic())
+
+    def scan(self):
+        """Stat every file under the watched folders (no reads for known files)."""
+        for directory in self.directories:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for filename in filenames:
+                    self.notice(os.path.join(dirpath, filename))
+
+    def _settled(self) -> List[tuple]:
+        """Pop the pending files whose stat has not changed for the debounce window."""
+        ready = []
+        now = time.monotonic()
+        with self._lock:
+            for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+                stat = _file_stat(path)
+                if stat is None:
+                    del self._pending[path]
+                elif stat != (size, mtime_ns):
+                    self._pending[path] = (*stat, now)
+                elif now - changed_at >= self.debounce_seconds:
+                    del self._pending[path]
+                    ready.append((path, stat))
+        return ready
+
+    # -- processing ------------------------------------------------------
+
+    def _process(self, path: str, stat: tuple):
+        size, mtime_ns = stat
+        entry = WatchedFile(path=path, size=size, mtime_ns=mtime_ns)
+        try:
+            validate_document(path, self.pdf_backend)
+        except UnsupportedFileError as e:
+            entry.status, entry.error = "rejected", str(e)
+            self.manifest.record(entry)
+            self._known[path] = stat
+            print(f"Watcher rejected {path}: {e}")
+            return
+
+        entry.content_hash = compute_content_hash(path)
+        previous = self.manifest.get(path)
+        if previous and previous.content_hash == entry.content_hash and previous.status in ("queued", "uploaded"):
+            # Touched or copied over with identical bytes
+            entry.status = previous.status
+        elif (duplicate := self.manifest.find_by_hash(entry.content_hash)) is not None and duplicate.path != path:
+            entry.status, entry.job_id = "duplicate", duplicate.job_id
+        else:
+            entry.status, entry.job_id = "queued", str(uuid.uuid4())
+            # Queued before recording: a crash in between only queues the file
+            # again, and the ingest cache serves that repeat without LLM work
+            self.submit(entry.job_id, path, os.path.basename(path))
+            self.queued += 1
+            print(f"Watcher queued {path} as job {entry.job_id}")
+        self.manifest.record(entry)
+        self._known[path] = stat
+
+    def process_settled(self) -> int:
+        """Queue every settled file; returns how many were handled."""
+        ready = self._settled()
+        for path, stat in ready:
+            try:
+                self._process(path, stat)
+            except Exception as e:
+                # Left out of _known so the next scan retries it
+                print(f"Watcher failed on {path}: {e}")
+        return len(ready)
+
+    # -- lifecycle -------------------------------------------------------
+
+    def _start_observer(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            print("watchdog not installed, falling back to polling")
+            return False
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher.notice(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher.notice(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher.notice(event.dest_path)
+
+        self._observer = Observer()
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            self._observer.schedule(Handler(), directory, recursive=True)
+        self._observer.start()
+        return True
+
+    def run_once(self) -> int:
+        """Scan, wait for files to settle and queue them; returns the number queued."""
+        queued_before = self.queued
+        self.scan()
+        while self._pending:
+            self.process_settled()
+            if self._pending:
+                time.sleep(min(self.debounce_seconds, 1.0))
+        return self.queued - queued_before
+
+    def start(self):
+        """Catch up on changes made while stopped, then watch in the background."""
+        if self._thread is not None:
+            return
+        inotify = self.use_inotify and self._start_observer()
+        mode = "inotify" if inotify else f"polling every {self.poll_interval:g}s"
+        print(f"Watching {', '.join(self.directories)} ({mode})")
+        self._thread = threading.Thread(target=self._run, args=(not inotify,), name="directory-watcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stopping.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, polling: bool):
+        self.scan()
+        last_scan = time.monotonic()
+        tick = min(self.debounce_seconds / 2, 1.0) or 0.1
+        while not self._stopping.wait(tick):
+            if polling and time.monotonic() - last_scan >= self.poll_interval:
+                self.scan()
+                last_scan = time.monotonic()
+            self.process_settled()
+
+
+def create_directory_watcher(submit: Callable[[str, str, str], object] = None,
+                             settings: WatcherSettings = None) -> DirectoryWatcher:
+    """Watcher over WATCH_DIRECTORIES; jobs go to `submit` or straight to the durable queue."""
+    settings = settings or WatcherSettings()
+    if submit is None:
+        submit = IngestJobQueue(settings.sqlite_db_path).enqueue
+    return DirectoryWatcher(
+        submit,
+        [d.strip() for d in settings.watch_directories.split(",") if d.strip()],
+        WatchManifest(settings.sqlite_db_path),
+        debounce_seconds=settings.watch_debounce_seconds,
+        poll_interval=settings.watch_poll_interval_seconds,
+        use_inotify=settings.watch_use_inotify,
+        pdf_backend=settings.pdf_backend,
+    )
+
+
+def main():
+    """Watch folders and feed new resumes to the ingestion queue drained by the app's workers."""
+    parser = argparse.ArgumentParser(description="Queue new or changed resume files for ingestion")
+    parser.add_argument("directories", nargs="*", help="Folders to watch (default: WATCH_DIRECTORIES)")
+    parser.add_argument("--once", action="store_true", help="Queue what changed since the last run, then exit")
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    args = parser.parse_args()
+
+    settings = WatcherSettings()
+    if args.directories:
+        settings.watch_directories = ",".join(args.directories)
+    if args.poll:
+        settings.watch_use_inotify = False
+    watcher = create_directory_watcher(settings=settings)
+
+    if args.once:
+        queued = watcher.run_once()
+        print(f"Queued {queued} new files; manifest: {watcher.manifest.count_by_status()}")
+        return
+
+    watcher.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ from pydantic_settings import BaseSettings
 from crewai import Agent, Task, Crew, LLM
 from crewai.tools import tool
 
+from utils.llm_cache import with_llm_cache
+
 from .candidate_matcher import CandidateMatch, CandidateRanking, CandidateMatcherAgent
 from .scheduler_agent import get_available_slots_direct
 
@@ -39,10 +41,10 @@ class EmailDraftAgent:
         self.settings = settings or Settings()
         
         # Configure LLM to use Anthropic Claude
-        self.llm = LLM(
+        self.llm = with_llm_cache(LLM(
             model="claude-3-5-sonnet-20241022", 
             api_key=self.settings.anthropic_api_key
-        )
+        ))
         
         # Initialize candidate matcher
         self.candidate_matcher = CandidateMatcherAgent(self.settings)
@@ -0,0 +1,127 @@
+"""
+Benchmark the per-resume overhead of the crew vs. direct extraction modes.
+
+The LLM is replaced by an instant stub returning a fixed resume, so the
+timings measure only what each mode adds around the model call (Task/Crew
+construction, crew orchestration and logging vs. building one request on
+the long-lived client and validating into ResumeData).
+
+    python -m agents.extraction_benchmark data --limit 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List
+
+from crewai.llms.base_llm import BaseLLM
+
+from extractors import extract_pdf_text
+
+from .resume_ingress import ResumeIngressAgent, Settings
+
+
+STUB_RESUME = {
+    "personal_info": {"name": "John Doe", "email": "john.doe@example.com"},
+    "professional_summary": "Engineer",
+    "work_experience": [{"job_title": "Engineer", "company": "Company Name", "duration": "2015-2020"}],
+    "skills": ["Python", "SQL"],
+    "category": "Engineering",
+    "seniority_level": "Mid-level",
+}
+
+
+class StubLLM(BaseLLM):
+    """Answers every crew call immediately with the stub resume."""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        return f"Thought: I have the resume data\nFinal Answer: {json.dumps(STUB_RESUME)}"
+
+
+class StubMessages:
+    """Answers every direct call immediately with the stub resume as tool input."""
+
+    def create(self, **request):
+        return SimpleNamespace(content=[SimpleNamespace(type="tool_use", input=STUB_RESUME)])
+
+
+def _time_mode(extract, texts: List[tuple]) -> List[float]:
+    timings = []
+    for path, raw_text in texts:
+        started = time.perf_counter()
+        # Crew logging goes to stdout; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract(raw_text, path)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summary(timings: List[float]) -> dict:
+    return {
+        "resumes": len(timings),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "p50_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def run_benchmark(root: str, limit: int = 20, backend: str = "pypdf2") -> dict:
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        paths.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.lower().endswith(".pdf"))
+    texts = [(path, extract_pdf_text(path, backend)) for path in paths[:limit]]
+
+    workdir = tempfile.mkdtemp(prefix="extraction-benchmark-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        agent = ResumeIngressAgent(Settings(
+            sqlite_db_path=os.path.join(workdir, "recruiter.db"),
+            chroma_db_path=os.path.join(workdir, "chroma"),
+        ))
+        agent.llm_cache = None
+        agent.llm = StubLLM(model="anthropic/claude-3-5-sonnet-20241022")
+        agent._thread_local.parser_agent = agent._create_parser_agent()
+        agent.anthropic_client = SimpleNamespace(messages=StubMessages())
+
+        crew = _time_mode(agent._extract_structured_data_with_crew, texts)
+        direct = _time_mode(agent._extract_structured_data_direct, texts)
+    finally:
+        os.chdir(cwd)
+
+    report = {"crew": _summary(crew), "direct": _summary(direct)}
+    report["overhead_removed_ms"] = round(report["crew"]["mean_ms"] - report["direct"]["mean_ms"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare crew vs. direct extraction overhead per resume")
+    parser.add_argument("root", nargs="?", default="data", help="Folder of resume PDFs")
+    parser.add_argument("--limit", type=int, default=20, help="Number of resumes to parse in each mode")
+    parser.add_argument("--backend", default="pypdf2", help="PDF backend used to extract the texts")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.root, args.limit, args.backend)
+    print(f"{'mode':<8} {'resumes':>8} {'mean ms':>9} {'p50 ms':>8} {'max ms':>8}")
+    for mode in ("crew", "direct"):
+        r = report[mode]
+        print(f"{mode:<8} {r['resumes']:>8} {r['mean_ms']:>9} {r['p50_ms']:>8} {r['max_ms']:>8}")
+    print(f"Overhead removed per resume: {report['overhead_removed_ms']} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Benchmark end-to-end ingestion throughput and where the time goes per stage.
+
+Runs the real pipeline (hash, extract, parse, write, embed, index) over a
+folder of resumes in a scratch directory, so the ingest cache never serves
+the files. The LLM and the embedding provider are stubbed by default, each
+with a configurable latency, which makes the numbers about our own code and
+stable enough to compare between commits:
+
+    python -m agents.ingest_benchmark data --limit 50 --output ingest_benchmark.json
+    python -m agents.ingest_benchmark data --baseline ingest_benchmark.json  # exits 1 on regression
+
+Use `--llm live` / `--embedding live` to measure against the real providers.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List
+
+import numpy as np
+
+from utils.embedding_providers import EmbeddingProvider
+from utils.stage_profiler import get_stage_profiler, percentile
+
+from .bulk_ingress import BulkIngestionPipeline, find_resume_files
+from .extraction_benchmark import STUB_RESUME
+from .resume_ingress import ResumeIngressAgent, Settings
+
+
+MODES = ("sequential", "async", "bulk")
+
+# Stages with a baseline p95 below this are too noisy to flag
+MIN_COMPARED_P95_MS = 1.0
+
+
+def _stub_response(request: dict):
+    """Tool-use response with the stub resume and plausible token usage."""
+    prompt_chars = len(json.dumps(request.get("messages", [])))
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=STUB_RESUME)],
+        usage=SimpleNamespace(input_tokens=prompt_chars // 4 + 1, output_tokens=len(json.dumps(STUB_RESUME)) // 4),
+    )
+
+
+class StubMessages:
+    """Answers direct calls with the stub resume after `latency` seconds."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def create(self, **request):
+        if self.latency:
+            time.sleep(self.latency)
+        return _stub_response(request)
+
+
+class AsyncStubMessages(StubMessages):
+    async def create(self, **request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return _stub_response(request)
+
+
+class StubEmbeddingProvider(EmbeddingProvider):
+    """Deterministic unit vectors derived from the text hash, after `latency` seconds per call."""
+    name = "stub"
+    model = "stub"
+
+    def __init__(self, dimensions: int = 1024, latency: float = 0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _build_agent(workdir: str, llm: str, embedding: str, llm_latency: float, embed_latency: float):
+    agent = ResumeIngressAgent(Settings(
+        sqlite_db_path=os.path.join(workdir, "recruiter.db"),
+        chroma_db_path=os.path.join(workdir, "chroma"),
+        embedding_matrix_path=os.path.join(workdir, "embedding_matrix"),
+    ))
+    # Every resume must go through every stage
+    agent.llm_cache = None
+    if llm == "stub":
+        agent.anthropic_client = SimpleNamespace(messages=StubMessages(llm_latency))
+        agent.async_anthropic_client = SimpleNamespace(messages=AsyncStubMessages(llm_latency))
+        agent.rate_governor = None
+        agent.settings.extraction_mode = "direct"
+    if embedding == "stub":
+        agent.embedding_provider = StubEmbeddingProvider(latency=embed_latency)
+        agent.embedding_batcher = agent._create_embedding_batcher()
+    if agent.embedding_batcher is None:
+        raise RuntimeError("Embedding provider not available; use --embedding stub or set VOYAGE_API_KEY")
+    return agent
+
+
+def _run_sequential(agent: ResumeIngressAgent, paths: List[str]) -> List[tuple]:
+    outcomes = []
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            agent.process_resume(path)
+            outcomes.append((True, time.perf_counter() - started))
+        except Exception:
+            outcomes.append((False, time.perf_counter() - started))
+    return outcomes
+
+
+def _run_async(agent: ResumeIngressAgent, paths: List[str]) -> List[tuple]:
+    async def one(path):
+        started = time.perf_counter()
+        try:
+            await agent.aprocess_resume(path, strict=True)
+            return True, time.perf_counter() - started
+        except Exception:
+            return False, time.perf_counter() - started
+
+    async def run():
+        return await asyncio.gather(*(one(path) for path in paths))
+
+    return list(asyncio.run(run()))
+
+
+def _run_bulk(agent: ResumeIngressAgent, paths: List[str]) -> List[tuple]:
+    pipeline = BulkIngestionPipeline(agent)
+    # The pipeline walks a folder, so hand it the selected files only
+    selected = os.path.join(os.getcwd(), "bulk_input")
+    os.makedirs(selected)
+    for index, path in enumerate(paths):
+        os.symlink(os.path.abspath(path), os.path.join(selected, f"{index:05d}_{os.path.basename(path)}"))
+    report = pipeline.run(selected)
+    return [(r.status == "success", r.elapsed) for r in report.results.values()]
+
+
+def run_benchmark(root: str, limit: int = 50, mode: str = "sequential", llm: str = "stub",
+                  embedding: str = "stub", llm_latency_ms: float = 0.0, embed_latency_ms: float = 0.0) -> dict:
+    """Ingest up to `limit` resumes under root in a scratch directory and return the report."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose one of: {', '.join(MODES)}")
+    paths = [os.path.abspath(p) for p in find_resume_files(root)[:limit]]
+    if not paths:
+        raise ValueError(f"No resume files found under {root}")
+
+    workdir = tempfile.mkdtemp(prefix="ingest-benchmark-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    profiler = get_stage_profiler()
+    try:
+        agent = _build_agent(workdir, llm, embedding, llm_latency_ms / 1000, embed_latency_ms / 1000)
+        profiler.reset()
+        started = time.perf_counter()
+        # Per-resume progress goes to stdout; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            if mode == "sequential":
+                outcomes = _run_sequential(agent, paths)
+            elif mode == "async":
+                outcomes = _run_async(agent, paths)
+            else:
+                outcomes = _run_bulk(agent, paths)
+        elapsed = time.perf_counter() - started
+        stages = profiler.stats()["stages"]
+    finally:
+        os.chdir(cwd)
+
+    succeeded = [seconds * 1000 for ok, seconds in outcomes if ok]
+    ordered = sorted(succeeded)
+    return {
+        "config": {
+            "root": root,
+            "mode": mode,
+            "llm": llm,
+            "embedding": embedding,
+            "llm_latency_ms": llm_latency_ms,
+            "embed_latency_ms": embed_latency_ms,
+            "pdf_backend": agent.settings.pdf_backend,
+            "workdir": workdir,
+        },
+        "resumes": len(outcomes),
+        "succeeded": len(succeeded),
+        "failed": len(outcomes) - len(succeeded),
+        "elapsed_seconds": round(elapsed, 3),
+        "resumes_per_minute": round(len(succeeded) / (elapsed / 60), 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 0.50), 2),
+            "p95": round(percentile(ordered, 0.95), 2),
+            "p99": round(percentile(ordered, 0.99), 2),
+        },
+        "stages": stages,
+    }
+
+
+def compare_reports(report: dict, baseline: dict, max_regression: float = 0.2) -> List[str]:
+    """Regressions of throughput or a stage's p95 beyond `max_regression` (a fraction)."""
+    regressions = []
+    before, after = baseline.get("resumes_per_minute", 0), report["resumes_per_minute"]
+    if before and after < before * (1 - max_regression):
+        regressions.append(f"throughput {before} -> {after} resumes/min")
+    for stage, stats in report["stages"].items():
+        before = baseline.get("stages", {}).get(stage, {}).get("p95_ms", 0)
+        if before >= MIN_COMPARED_P95_MS and stats["p95_ms"] > before * (1 + max_regression):
+            regressions.append(f"{stage} p95 {before} -> {stats['p95_ms']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ingestion throughput and per-stage latency")
+    parser.add_argument("root", nargs="?", default="data", help="Folder of resumes")
+    parser.add_argument("--limit", type=int, default=50, help="Number of resumes to ingest")
+    parser.add_argument("--mode", choices=MODES, default="sequential", help="Ingestion path to exercise")
+    parser.add_argument("--llm", choices=("stub", "live"), default="stub", help="Parse with a stub or the real model")
+    parser.add_argument("--embedding", choices=("stub", "live"), default="stub",
+                        help="Embed with a stub or the configured provider")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency of each stub LLM call")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated latency of each stub embed call")
+    parser.add_argument("--output", default="ingest_benchmark.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed slowdown vs. the baseline as a fraction (default 0.2)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        # Read first: the baseline may be the file this run overwrites
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = run_benchmark(args.root, args.limit, args.mode, args.llm, args.embedding,
+                           args.llm_latency_ms, args.embed_latency_ms)
+
+    print(f"{report['succeeded']}/{report['resumes']} resumes in {report['elapsed_seconds']}s "
+          f"({report['resumes_per_minute']} resumes/min, p95 {report['latency_ms']['p95']} ms per resume)")
+    print(f"{'stage':<8} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'tokens':>9}")
+    for stage, s in sorted(report["stages"].items(), key=lambda item: -item[1]["total_seconds"]):
+        print(f"{stage:<8} {s['count']:>6} {s['total_seconds']:>9} {s['p50_ms']:>9} {s['p95_ms']:>9} "
+              f"{s['p99_ms']:>9} {s['tokens']:>9}")
+
+    if baseline is not None:
+        report["regressions"] = compare_reports(report, baseline, args.max_regression)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"❌ Regression: {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
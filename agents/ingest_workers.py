@@ -0,0 +1,111 @@
+"""
+Fixed-size worker pool draining the durable ingestion job queue.
+
+Workers are coroutines on one background event loop. Each leases a job from
+`ingest_jobs`, runs it through ResumeIngressAgent.aprocess_resume and records
+every completed stage. Stage outputs live in the ingest cache, so a retried or
+restarted job resumes after its last completed stage and never repeats the
+paid LLM parse. Failures are retried with exponential backoff and parked in
+the dead-letter table after `max_attempts`.
+"""
+
+import asyncio
+import threading
+import uuid
+from typing import Callable
+
+from database.job_queue import IngestJobQueue
+from database.models import IngestJob
+
+from .resume_ingress import ResumeIngressAgent
+
+
+class IngestWorkerPool:
+    def __init__(self, agent: ResumeIngressAgent, job_queue: IngestJobQueue = None, workers: int = 8,
+                 max_attempts: int = 5, base_backoff: float = 5.0, max_backoff: float = 300.0,
+                 lease_seconds: float = 600, poll_interval: float = 1.0,
+                 on_complete: Callable[[IngestJob, str], None] = None,
+                 on_dead: Callable[[IngestJob, str], None] = None):
+        self.agent = agent
+        self.job_queue = job_queue or IngestJobQueue(agent.settings.sqlite_db_path)
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.on_complete = on_complete
+        self.on_dead = on_dead
+
+        self.loop = None
+        self._thread = None
+        self._stopping = None
+        self._wakeup = None
+        self._owner_prefix = f"worker-{uuid.uuid4().hex[:8]}"
+
+    def start(self) -> None:
+        """Start the event loop thread and its worker coroutines."""
+        if self._thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="ingest-workers", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop leasing new jobs; in-flight jobs finish or are re-leased after a restart."""
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, job_id: str, file_path: str, filename: str = None) -> IngestJob:
+        """Enqueue a file and wake an idle worker."""
+        job = self.job_queue.enqueue(job_id, file_path, filename)
+        if self.loop is not None and self._wakeup is not None:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+        return job
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        workers = [self._worker(f"{self._owner_prefix}-{i}") for i in range(self.workers)]
+        self.loop.run_until_complete(asyncio.gather(*workers))
+        self.loop.close()
+
+    async def _worker(self, owner: str) -> None:
+        while not self._stopping.is_set():
+            job = await asyncio.to_thread(self.job_queue.lease_next_job, owner, self.lease_seconds)
+            if job is None:
+                await self._idle()
+                continue
+            await self._run_job(job)
+
+    async def _idle(self) -> None:
+        """Sleep until polled, woken by submit() or stopped."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_job(self, job: IngestJob) -> None:
+        async def record_stage(stage: str, resume_id: str = None):
+            await asyncio.to_thread(self.job_queue.complete_stage, job.id, stage, resume_id, self.lease_seconds)
+
+        try:
+            resume_id = await self.agent.aprocess_resume(job.file_path, on_stage=record_stage, strict=True)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            dead = await asyncio.to_thread(
+                self.job_queue.fail_job, job.id, error, self.max_attempts, self.base_backoff, self.max_backoff
+            )
+            print(f"Ingest job {job.id} failed (attempt {job.attempts}/{self.max_attempts}): {error}")
+            if dead and self.on_dead:
+                self.on_dead(job, error)
+            return
+
+        await asyncio.to_thread(self.job_queue.complete_job, job.id, resume_id)
+        if self.on_complete:
+            self.on_complete(job, resume_id)
@@ -1,25 +1,58 @@
 """
 Crew AI Agent that takes in a Resume
-- parses the PDF
-- extracts data in a structured format as defined in ResumeData model (using CrewAI task)
-- embeds the structured information to an embedding model (Voyage)
+- extracts the text of the PDF (streamed page by page through a configurable backend), DOCX or TXT file
+- extracts data in a structured format as defined in ResumeData model (direct tool-use call, or a CrewAI task)
+- embeds the structured information to an embedding model (Voyage, or a local sentence-transformers model)
 - inserts the structured data to a sqlite db with UUID and returns the id
 - inserts the embedding to chroma db with the UUID as the key.
+
+Stage outputs are cached per file content hash, so identical files are only
+ever parsed and embedded once.
 """
 
+import argparse
+import asyncio
+import hashlib
+import inspect
 import json
+import os
+import random
 import sqlite3
+import threading
+import time
 import uuid
-from typing import List
-import json
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
 
-import PyPDF2
-import voyageai
+import anthropic
 import chromadb
 from crewai import Agent, Task, Crew, LLM
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from pydantic_settings import BaseSettings
 
+import extractors
+from database.operations import DatabaseOperations
+from extractors import DEFAULT_PDF_BACKEND
+from utils.embedding_matrix import EmbeddingMatrix
+from utils.embedding_providers import get_embedding_provider
+from utils.embedding_text import (
+    DEFAULT_EMBEDDING_TEXT_MAX_TOKENS, DEFAULT_FIELD_WEIGHTS, EMBEDDING_TEXT_VERSION, build_embedding_text
+)
+from utils.embeddings import EmbeddingBatcher, estimate_tokens
+from utils.llm_cache import get_llm_cache, make_cache_key, with_llm_cache
+from utils.rate_limiter import get_rate_governor
+from utils.resume_heuristics import PreExtraction
+from utils.resume_metadata import RESUME_CATEGORIES, RESUME_METADATA_VERSION, resume_metadata
+from utils.stage_profiler import get_stage_profiler
+
+from .parse_prompt import (
+    DEFAULT_PROMPT_TOKEN_BUDGET, merge_parsed_resume, prepare_parse_prompts, reduce_parsed_parts
+)
+
+
+PARSER_BACKSTORY = "You are an expert at parsing resumes and extracting structured data. You always return valid JSON that matches the requested schema."
+
 
 class Settings(BaseSettings):
     """Application settings from environment variables."""
@@ -27,6 +60,41 @@ class Settings(BaseSettings):
     voyage_api_key: str = ""
     sqlite_db_path: str = "recruiter.db"
     chroma_db_path: str = "./chroma_db"
+    llm_model: str = "claude-3-5-sonnet-20241022"
+    llm_max_tokens: int = 4096
+    # Max resumes in flight on one event loop in the async ingestion path
+    ingest_max_concurrency: int = 50
+    async_extract_workers: int = 4
+    # PDF extraction backend: pypdf2, pypdfium2 or pymupdf
+    pdf_backend: str = DEFAULT_PDF_BACKEND
+    # Documents with at least this many pages are split across pdf_page_workers processes
+    pdf_parallel_page_threshold: int = 8
+    pdf_page_workers: int = 4
+    # "voyage" or "local" (sentence-transformers, see utils.embedding_providers)
+    embedding_provider: str = "voyage"
+    embedding_model: str = "voyage-2"
+    # Voyage accepts up to 128 texts per embed call; the token cap stays
+    # well under the per-request limit since our estimate is approximate.
+    embedding_batch_size: int = 128
+    embedding_batch_max_tokens: int = 120000
+    embedding_batch_max_wait_ms: int = 50
+    # Quantized memory-mapped copy of the vectors for NumPy scoring (float16 or int8)
+    embedding_matrix_enabled: bool = True
+    embedding_matrix_path: str = "./embedding_matrix"
+    embedding_matrix_dtype: str = "float16"
+    # Embedding document: field weights (share of the token cap) and the cap
+    embedding_text_weights: Dict[str, float] = Field(default_factory=lambda: dict(DEFAULT_FIELD_WEIGHTS))
+    embedding_text_max_tokens: int = DEFAULT_EMBEDDING_TEXT_MAX_TOKENS
+    # Resolve contacts, education and years of experience with rules and
+    # send the LLM only what is left
+    heuristic_pre_extraction: bool = True
+    # Resume text tokens per parse call. Longer resumes are parsed in parts
+    # and merged (map_reduce) or cut to their most useful sections (truncate).
+    parse_prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
+    parse_overflow_strategy: str = "map_reduce"
+    # "direct" fills ResumeData with one forced tool-use call on a long-lived
+    # client; "crew" runs the parse through a CrewAI Task/Crew
+    extraction_mode: str = "direct"
     
     class Config:
         env_file = ".env"
@@ -34,256 +102,874 @@ class Settings(BaseSettings):
 
 class PersonalInfo(BaseModel):
     """Personal information from resume."""
-    name: str = None
-    email: str = None
-    phone: str = None
-    location: str = None
-    linkedin: str = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    linkedin: Optional[str] = None
 
 
 class WorkExperience(BaseModel):
     """Work experience entry."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
     job_title: str
     company: str
-    duration: str = None
-    location: str = None
-    description: str = None
+    duration: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
     responsibilities: List[str] = Field(default_factory=list)
 
 
 class Education(BaseModel):
     """Education entry."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
     degree: str
-    field_of_study: str = None
+    field_of_study: Optional[str] = None
     institution: str
-    graduation_year: str = None
-    gpa: str = None
-    location: str = None
+    graduation_year: Optional[str] = None
+    gpa: Optional[str] = None
+    location: Optional[str] = None
 
 
 class Certification(BaseModel):
     """Professional certification."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
     name: str
-    issuer: str = None
-    year: str = None
-    expiry: str = None
+    issuer: Optional[str] = None
+    year: Optional[str] = None
+    expiry: Optional[str] = None
 
 
 class ResumeData(BaseModel):
     """Complete structured resume data."""
     personal_info: PersonalInfo = Field(default_factory=PersonalInfo)
-    professional_summary: str = None
+    professional_summary: Optional[str] = None
     work_experience: List[WorkExperience] = Field(default_factory=list)
     education: List[Education] = Field(default_factory=list)
     skills: List[str] = Field(default_factory=list)
     certifications: List[Certification] = Field(default_factory=list)
     languages: List[str] = Field(default_factory=list)
-    category: str = None
-    years_of_experience: int = None
-    seniority_level: str = None
+    category: Optional[str] = None
+    years_of_experience: Optional[int] = None
+    seniority_level: Optional[str] = None
     keywords: List[str] = Field(default_factory=list)
-    pdf_path: str = None
+    pdf_path: Optional[str] = None
+
+
+# Forced tool used by direct extraction so the model returns ResumeData
+# fields as structured input instead of free text
+RESUME_TOOL = {
+    "name": "record_resume",
+    "description": "Record the structured data extracted from a resume.",
+    "input_schema": ResumeData.model_json_schema(),
+}
 
 
 class ResumeIngressAgent:
     def __init__(self, settings: Settings = None):
         self.settings = settings or Settings()
+        self.db = DatabaseOperations(self.settings.sqlite_db_path)
+        self.profiler = get_stage_profiler()
         
         # Configure LLM to use Anthropic Claude
-        self.llm = LLM(
-            model="claude-3-5-sonnet-20241022", 
+        self.llm = with_llm_cache(LLM(
+            model=self.settings.llm_model, 
             api_key=self.settings.anthropic_api_key
-        )
+        ))
+        self.llm_cache = get_llm_cache()
         
-        # Initialize Voyage client for embeddings
-        if self.settings.voyage_api_key:
-            self.voyage_client = voyageai.Client(api_key=self.settings.voyage_api_key)
-        else:
-            self.voyage_client = None
+        # Long-lived clients for direct extraction and the asyncio ingestion path.
+        # With the rate governor on, it owns retries of rate-limited calls.
+        self.rate_governor = get_rate_governor("anthropic")
+        client_retries = 0 if self.rate_governor else anthropic.DEFAULT_MAX_RETRIES
+        self.anthropic_client = anthropic.Anthropic(api_key=self.settings.anthropic_api_key,
+                                                    max_retries=client_retries)
+        self.async_anthropic_client = anthropic.AsyncAnthropic(api_key=self.settings.anthropic_api_key,
+                                                               max_retries=client_retries)
+        self._extract_executor = None
+        # One semaphore per event loop: an asyncio.Semaphore is bound to the loop that first waits on it
+        self._ingest_semaphores = weakref.WeakKeyDictionary()
+        self._ingest_semaphores_lock = threading.Lock()
+        
+        # Embedding provider (None when Voyage is selected without an API key)
+        self.embedding_provider = get_embedding_provider(
+            embedding_provider=self.settings.embedding_provider,
+            voyage_api_key=self.settings.voyage_api_key,
+            embedding_model=self.settings.embedding_model,
+        )
         
-        # Initialize ChromaDB
+        # Initialize ChromaDB; each embedding model has its own collection
         self.chroma_client = chromadb.PersistentClient(path=self.settings.chroma_db_path)
         self.collection = self.chroma_client.get_or_create_collection(
-            name="resume_embeddings",
+            name=self.embedding_provider.collection_name if self.embedding_provider else "resume_embeddings",
             metadata={"hnsw:space": "cosine"}
         )
         
+        # Mirror every vector into the memory-mapped matrix (one per collection)
+        self.embedding_matrix = None
+        if self.settings.embedding_matrix_enabled:
+            self.embedding_matrix = EmbeddingMatrix(
+                os.path.join(self.settings.embedding_matrix_path, self.collection.name),
+                dtype=self.settings.embedding_matrix_dtype,
+            )
+            if not len(self.embedding_matrix) and self.collection.count():
+                synced = self.embedding_matrix.sync_from_collection(self.collection)
+                print(f"Embedding matrix backfilled with {synced} vectors")
+        
+        # Coalesce concurrent embedding requests into one embed + one add call
+        self.embedding_batcher = self._create_embedding_batcher()
+        
         # Create CrewAI agent for resume parsing with Anthropic Claude
-        self.resume_parser_agent = Agent(
+        self.resume_parser_agent = self._create_parser_agent()
+        
+        # Crew agents keep per-run executor state, so concurrent parses
+        # (bulk ingestion) each get their own agent on their own thread.
+        self._thread_local = threading.local()
+        self._thread_local.parser_agent = self.resume_parser_agent
+    
+    def _create_embedding_batcher(self) -> Optional[EmbeddingBatcher]:
+        """Batcher over the current embedding provider, or None without one."""
+        if not self.embedding_provider:
+            return None
+        return EmbeddingBatcher(
+            embed_fn=self._generate_embeddings,
+            sink_fn=self._commit_embeddings,
+            max_batch_size=min(self.settings.embedding_batch_size, self.embedding_provider.max_batch_size),
+            max_batch_tokens=self.settings.embedding_batch_max_tokens,
+            max_wait=self.settings.embedding_batch_max_wait_ms / 1000,
+        )
+    
+    def _create_parser_agent(self) -> Agent:
+        """Create the CrewAI agent used for resume parsing."""
+        return Agent(
             role="Resume Data Extractor",
             goal="Extract structured information from resume text",
-            backstory="You are an expert at parsing resumes and extracting structured data. You always return valid JSON that matches the requested schema.",
+            backstory=PARSER_BACKSTORY,
             verbose=True,
             allow_delegation=False,
             llm=self.llm
         )
+    
+    def _get_parser_agent(self) -> Agent:
+        """Return the parser agent owned by the calling thread."""
+        agent = getattr(self._thread_local, "parser_agent", None)
+        if agent is None:
+            agent = self._create_parser_agent()
+            self._thread_local.parser_agent = agent
+        return agent
         
     def process_resume(self, pdf_path: str) -> str:
-        """Main method to process a resume PDF and return the generated UUID."""
+        """Main method to process a resume PDF and return the generated UUID.
+        
+        Stage outputs are cached by the SHA-256 of the file bytes, so a repeat
+        upload of the same file skips extraction, the LLM parse and embedding.
+        The cache row is also the write-ahead record of the ingest: the resume
+        id is reserved before anything is written and each stage is committed
+        only after its output is stored, so a retry after a crash resumes at
+        the first unfinished stage under the same id.
+        """
+        content_hash = compute_content_hash(pdf_path)
+        cached = self.db.get_ingest_cache_entry(content_hash)
+        if cached and cached.is_complete:
+            self._restore_parsed_resume(cached.resume_id, cached.parsed_json)
+            print(f"Ingest cache hit for {pdf_path} -> {cached.resume_id}")
+            return cached.resume_id
+        resume_id = (cached and cached.resume_id) or self.db.reserve_ingest_resume_id(content_hash)
         
         # Extract text from PDF
-        raw_text = self._extract_pdf_text(pdf_path)
+        if cached and cached.raw_text:
+            raw_text = cached.raw_text
+        else:
+            raw_text = self._extract_text(pdf_path)
+            self.db.upsert_ingest_cache_entry(content_hash, raw_text=raw_text, stage='extracted')
         
         # Extract structured data using CrewAI task
-        resume_id = self._extract_structured_data_with_crew(raw_text, pdf_path)
-        embedding_text = self._get_embedding_text(resume_id)
-        # Generate embeddings after successful DB insertion
-        embedding = self._generate_embedding(embedding_text)
-        
-        # Insert embedding to ChromaDB with same UUID
-        if embedding:
-            self._insert_to_chromadb(resume_id, embedding, embedding_text)
+        if cached and cached.parsed_json:
+            self._restore_parsed_resume(resume_id, cached.parsed_json)
+        else:
+            self._extract_structured_data(raw_text, pdf_path, resume_id)
+        parsed_json = self._read_parsed_json(resume_id)
+        self.db.upsert_ingest_cache_entry(content_hash, resume_id=resume_id, parsed_json=parsed_json, stage='parsed')
+        embedding_text = self._get_embedding_text(resume_id, parsed_json)
+        
+        # An embedding stored before a failed ChromaDB write is indexed as is
+        if cached and cached.embedding is not None:
+            try:
+                self._commit_embeddings([resume_id], [cached.embedding], [embedding_text],
+                                        [self._embedding_metadata(parsed_json)])
+            except Exception as e:
+                print(f"Skipping ChromaDB insertion - {e}")
+        # Generate the embedding and insert it to ChromaDB with the same UUID.
+        # The batcher shares the call with any other in-flight resumes.
+        elif self.embedding_batcher:
+            try:
+                self.embedding_batcher.embed(resume_id, embedding_text,
+                                             metadata=self._embedding_metadata(parsed_json))
+            except Exception as e:
+                print(f"Skipping ChromaDB insertion - {e}")
         else:
-            print(f"Skipping ChromaDB insertion - no embedding generated")
+            print("Embedding provider not available, skipping embedding generation")
         
         return resume_id
     
+    async def aprocess_resume(self, pdf_path: str, on_stage: Callable = None, strict: bool = False) -> str:
+        """Asyncio-native version of process_resume.
+        
+        PDF extraction runs in a process pool, the LLM call uses the async
+        Anthropic client and the embedding is awaited from the shared batcher,
+        so one event loop can drive hundreds of resumes without a thread each.
+        At most `ingest_max_concurrency` resumes are in flight at once.
+        
+        `on_stage(stage, resume_id)` is called as each stage (extracted, parsed,
+        embedded, indexed) completes or is found in the ingest cache; it may be
+        a coroutine function, which is awaited. With `strict`, embedding/indexing
+        failures raise instead of being skipped.
+        """
+        async def report(stage: str, resume_id: str = None):
+            if on_stage:
+                result = on_stage(stage, resume_id)
+                if inspect.isawaitable(result):
+                    await result
+        
+        async with self._get_ingest_semaphore():
+            loop = asyncio.get_running_loop()
+            content_hash = await asyncio.to_thread(compute_content_hash, pdf_path)
+            cached = await asyncio.to_thread(self.db.get_ingest_cache_entry, content_hash)
+            if cached and cached.is_complete:
+                await asyncio.to_thread(self._restore_parsed_resume, cached.resume_id, cached.parsed_json)
+                await report("indexed", cached.resume_id)
+                return cached.resume_id
+            resume_id = (cached and cached.resume_id) or await asyncio.to_thread(
+                self.db.reserve_ingest_resume_id, content_hash
+            )
+            
+            # Extract text from PDF off the event loop
+            if cached and cached.raw_text:
+                raw_text = cached.raw_text
+            else:
+                extraction = await loop.run_in_executor(
+                    self._get_extract_executor(), extract_document_result, pdf_path, self.settings.pdf_backend
+                )
+                raw_text = self._record_extraction(pdf_path, extraction)
+                await asyncio.to_thread(
+                    self.db.upsert_ingest_cache_entry, content_hash, raw_text=raw_text, stage='extracted'
+                )
+            await report("extracted")
+            
+            # Extract structured data with the async LLM client
+            if cached and cached.parsed_json:
+                await asyncio.to_thread(self._restore_parsed_resume, resume_id, cached.parsed_json)
+            else:
+                await self._aextract_structured_data(raw_text, pdf_path, resume_id)
+            parsed_json = await asyncio.to_thread(self._read_parsed_json, resume_id)
+            await asyncio.to_thread(
+                self.db.upsert_ingest_cache_entry, content_hash, resume_id=resume_id, parsed_json=parsed_json,
+                stage='parsed'
+            )
+            embedding_text, metadata = await asyncio.to_thread(
+                lambda: (self._get_embedding_text(resume_id, parsed_json), self._embedding_metadata(parsed_json))
+            )
+            await report("parsed", resume_id)
+            
+            # Await the batched embedding + ChromaDB insert without blocking the loop;
+            # an embedding stored before a failed ChromaDB write is indexed as is
+            stored_embedding = cached.embedding if cached else None
+            if stored_embedding is not None or self.embedding_batcher:
+                try:
+                    if stored_embedding is not None:
+                        await asyncio.to_thread(self._commit_embeddings, [resume_id], [stored_embedding],
+                                                [embedding_text], [metadata])
+                    else:
+                        await asyncio.wrap_future(self.embedding_batcher.submit(
+                            resume_id, embedding_text, metadata=metadata
+                        ))
+                    await report("embedded", resume_id)
+                    await report("indexed", resume_id)
+                except Exception as e:
+                    if strict:
+                        raise
+                    print(f"Skipping ChromaDB insertion - {e}")
+            elif strict:
+                raise RuntimeError("Embedding provider not available, cannot generate embeddings")
+            else:
+                print("Embedding provider not available, skipping embedding generation")
+            
+            return resume_id
     
-    def _get_embedding_text(self, resume_id: str) -> str:
-        with open(f"parsed_resumes/{resume_id}.json",'r') as f:
-            text = f.read()
-        return text
+    async def aprocess_resumes(self, pdf_paths: List[str]) -> List:
+        """Process many resumes concurrently; failures are returned as exceptions."""
+        return await asyncio.gather(*(self.aprocess_resume(p) for p in pdf_paths), return_exceptions=True)
     
-    def _extract_pdf_text(self, pdf_path: str) -> str:
-        """Extract text from PDF file."""
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+    def _get_ingest_semaphore(self) -> asyncio.Semaphore:
+        """The ingest concurrency limit of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._ingest_semaphores_lock:
+            semaphore = self._ingest_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._ingest_semaphores[loop] = asyncio.Semaphore(self.settings.ingest_max_concurrency)
+        return semaphore
     
-    def _extract_structured_data_with_crew(self, raw_text: str, pdf_path: str) -> str:
-        """Extract structured data from resume text using CrewAI task."""
+    def _get_extract_executor(self) -> ProcessPoolExecutor:
+        if self._extract_executor is None:
+            self._extract_executor = ProcessPoolExecutor(max_workers=self.settings.async_extract_workers)
+        return self._extract_executor
+    
+    def lookup_cached_resume_id(self, pdf_path: str, content_hash: str = None) -> str:
+        """Return the resume id of an identical, fully ingested file, or None.
         
-        # Create the task for resume parsing
-        parse_task = Task(
-            description=f"""
-            Extract structured information from this resume text and return it as valid JSON.
-            
-            Use these placeholder names like these for personal information:
-            - Name: "John Doe" 
-            - Email: "john.doe@example.com"
-            - Phone: "(555) 123-4567"
-            - Location: "San Francisco, CA"
-
-            Make sure you change the names so they appear unique.
-            
-            Resume text:
-            {raw_text[:3000]}  # Limit text to avoid token limits
+        Pass `content_hash` when the caller has already hashed the file.
+        """
+        cached = self.db.get_ingest_cache_entry(content_hash or compute_content_hash(pdf_path))
+        if cached and cached.is_complete:
+            self._restore_parsed_resume(cached.resume_id, cached.parsed_json)
+            return cached.resume_id
+        return None
+    
+    def _restore_parsed_resume(self, resume_id: str, parsed_json: str) -> None:
+        """Re-insert the resume_data row from the cache if it has gone missing."""
+        if self.db.get_resume_document(resume_id) is None:
+            self._store_parsed_resume(resume_id, parsed_json)
+    
+    def _store_parsed_resume(self, resume_id: str, parsed_json: str, pdf_path: str = None) -> None:
+        with self.profiler.stage("write", bytes=len(parsed_json.encode())):
+            self.db.save_resume_data(resume_id, parsed_json, pdf_path)
+    
+    def _read_parsed_json(self, resume_id: str) -> str:
+        parsed_json = self.db.get_resume_document(resume_id)
+        if parsed_json is None:
+            raise LookupError(f"Parsed resume {resume_id} not found")
+        return parsed_json
+    
+    def migrate_parsed_resume_files(self, directory: str = "parsed_resumes") -> int:
+        """One-shot import of legacy per-UUID JSON files into resume_data.
+        
+        Run by the app at startup and by `--migrate-parsed-files`, not by the
+        agent itself, since it renames the folder. Rows already in the table
+        are kept. The folder is then renamed to
+        `<directory>.migrated` so the import never runs twice. Returns the
+        number of resumes imported.
+        """
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".json")) \
+            if os.path.isdir(directory) else []
+        if not names:
+            return 0
+        migrated = 0
+        batch = []
+        for index, name in enumerate(names, 1):
+            with open(os.path.join(directory, name), 'r') as f:
+                batch.append((name[:-len(".json")], f.read()))
+            if len(batch) == 500 or index == len(names):
+                migrated += self.db.save_resume_data_many(batch, overwrite=False)
+                batch = []
+        target = f"{directory}.migrated"
+        if os.path.exists(target):
+            target = f"{target}-{int(time.time())}"
+        os.replace(directory, target)
+        print(f"Migrated {migrated} parsed resume files into resume_data (files moved to {target})")
+        return migrated
+    
+    def _get_embedding_text(self, resume_id: str, parsed_json: str = None) -> str:
+        """Render the canonical embedding document for a parsed resume."""
+        parsed_json = parsed_json or self._read_parsed_json(resume_id)
+        try:
+            resume = json.loads(parsed_json)
+        except json.JSONDecodeError:
+            # Unparseable model output is still better embedded than dropped
+            return parsed_json
+        return build_embedding_text(
+            resume, self.settings.embedding_text_weights, self.settings.embedding_text_max_tokens
+        ) or parsed_json
+    
+    def _embedding_metadata(self, parsed_json: str = None) -> dict:
+        """ChromaDB metadata of a resume vector: document version plus the filterable fields."""
+        try:
+            resume = json.loads(parsed_json) if parsed_json else None
+        except json.JSONDecodeError:
+            resume = None
+        return {**resume_metadata(resume), "embedding_text_version": EMBEDDING_TEXT_VERSION}
+    
+    def backfill_embedding_metadata(self, batch_size: int = 500) -> int:
+        """Attach the filterable metadata to vectors stored before it existed, without re-embedding.
+        
+        Returns the number of vectors updated.
+        """
+        stored = self.collection.get(include=["metadatas"])
+        outdated = {
+            resume_id: metadata or {}
+            for resume_id, metadata in zip(stored["ids"], stored["metadatas"] or [None] * len(stored["ids"]))
+            if (metadata or {}).get("metadata_version") != RESUME_METADATA_VERSION
+        }
+        ids = list(outdated)
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            documents = self.db.get_resume_documents(batch)
+            batch = [resume_id for resume_id in batch if resume_id in documents]
+            if not batch:
+                continue
+            metadatas = {}
+            for resume_id in batch:
+                # Keep the document version: the stored vector was not rebuilt
+                metadata = self._embedding_metadata(documents[resume_id])
+                metadata["embedding_text_version"] = outdated[resume_id].get("embedding_text_version", 0)
+                metadatas[resume_id] = metadata
+            # Chroma merges metadata on update and cannot remove a field, so
+            # vectors with fields the resume no longer has are written again
+            rewrite = [resume_id for resume_id in batch if set(outdated[resume_id]) - set(metadatas[resume_id])]
+            merge = [resume_id for resume_id in batch if resume_id not in set(rewrite)]
+            if merge:
+                self.collection.update(ids=merge, metadatas=[metadatas[resume_id] for resume_id in merge])
+            if rewrite:
+                vectors = self.collection.get(ids=rewrite, include=["embeddings", "documents"])
+                self.collection.delete(ids=vectors["ids"])
+                self.collection.add(ids=vectors["ids"], embeddings=vectors["embeddings"],
+                                    documents=vectors["documents"],
+                                    metadatas=[metadatas[resume_id] for resume_id in vectors["ids"]])
+            updated += len(batch)
+        if updated:
+            # Filtered searches now see these resumes
+            self.db.bump_corpus_version()
+        return updated
+    
+    def rebuild_embedding_documents(self) -> int:
+        """Re-embed every indexed resume whose document predates EMBEDDING_TEXT_VERSION.
+        
+        Returns the number of resumes rebuilt.
+        """
+        if not self.embedding_batcher:
+            raise RuntimeError("Embedding provider not available, cannot generate embeddings")
+        stored = self.collection.get(include=["metadatas"])
+        stale = [
+            resume_id
+            for resume_id, metadata in zip(stored["ids"], stored["metadatas"] or [None] * len(stored["ids"]))
+            if (metadata or {}).get("embedding_text_version") != EMBEDDING_TEXT_VERSION
+        ]
+        documents = self.db.get_resume_documents(stale)
+        futures = []
+        for resume_id in stale:
+            if resume_id not in documents:
+                print(f"Skipping {resume_id}: parsed resume not found")
+                continue
+            futures.append(self.embedding_batcher.submit(
+                resume_id, self._get_embedding_text(resume_id, documents[resume_id]),
+                metadata=self._embedding_metadata(documents[resume_id])
+            ))
+        self.embedding_batcher.flush()
+        for future in futures:
+            future.result()
+        return len(futures)
+    
+    def repair_ingest_state(self) -> Dict[str, int]:
+        """Finish or roll back resumes left half-written by a crash.
+        
+        The ingest cache is the write-ahead record, so each stage is either
+        finished from its stored output (no LLM or embedding call is repeated)
+        or, for resumes the cache never reserved, rolled back:
+        - a resume_data row written but not committed is rolled forward;
+        - a missing resume_data row is restored from the cache;
+        - a stored embedding missing from ChromaDB is indexed again;
+        - a parsed but unembedded resume is embedded;
+        - vectors with neither a resume_data row nor a cache row are deleted;
+        - vectors without the current filterable metadata are backfilled.
+        
+        Returns the count of each repair.
+        """
+        counts = dict(rolled_forward=0, restored=0, reindexed=0, embedded=0, vectors_removed=0, metadata_backfilled=0)
+        
+        # Committed as indexed but the vector is gone (e.g. the Chroma directory was reset)
+        indexed_ids = set(self.collection.get(include=[])["ids"])
+        lost = [rid for rid in self.db.get_ingest_resume_ids(stage="indexed") if rid not in indexed_ids]
+        if lost:
+            self.db.reset_ingest_stage(lost, "embedded")
+        
+        entries = [entry for entry in self.db.get_incomplete_ingest_entries() if entry.resume_id]
+        documents = self.db.get_resume_documents([entry.resume_id for entry in entries])
+        futures = []
+        for entry in entries:
+            if entry.parsed_json is None:
+                if entry.resume_id not in documents:
+                    # Not parsed yet: the next ingest of the file resumes from here
+                    continue
+                entry.parsed_json = documents[entry.resume_id]
+                self.db.upsert_ingest_cache_entry(entry.content_hash, parsed_json=entry.parsed_json, stage="parsed")
+                counts["rolled_forward"] += 1
+            elif entry.resume_id not in documents:
+                self._store_parsed_resume(entry.resume_id, entry.parsed_json)
+                counts["restored"] += 1
             
-            Return ONLY valid JSON matching this exact structure:
-            {{
-                "personal_info": {{
-                    "name": "John Doe",
-                    "email": "john.doe@example.com", 
-                    "phone": "(555) 123-4567",
-                    "location": "San Francisco, CA",
-                    "linkedin": null
-                }},
-                "professional_summary": "Brief professional summary based on the resume",
-                "work_experience": [
-                    {{
-                        "job_title": "Job Title",
-                        "company": "Company Name",
-                        "duration": "YYYY-YYYY",
-                        "location": "City, State",
-                        "description": "Brief job description",
-                        "responsibilities": ["Responsibility 1", "Responsibility 2"]
-                    }}
-                ],
-                "education": [
-                    {{
-                        "degree": "Degree Name",
-                        "field_of_study": "Field of Study",
-                        "institution": "Institution Name",
-                        "graduation_year": "YYYY",
-                        "gpa": null,
-                        "location": "City, State"
-                    }}
-                ],
-                "skills": ["Skill1", "Skill2", "Skill3"],
-                "certifications": [
-                    {{
-                        "name": "Certification Name",
-                        "issuer": "Issuing Organization",
-                        "year": "YYYY",
-                        "expiry": null
-                    }}
-                ],
-                "languages": ["English"],
-                "category": "Engineering",
-                "years_of_experience": 0,
-                "seniority_level": "Junior",
-                "keywords": ["keyword1", "keyword2"],
-                "pdf_path": "{pdf_path}"
-            }}
-            """,
-            agent=self.resume_parser_agent,
-            expected_output="Valid JSON object containing structured resume data",
-        )
+            embedding_text = self._get_embedding_text(entry.resume_id, entry.parsed_json)
+            if entry.embedding is not None:
+                self._commit_embeddings([entry.resume_id], [entry.embedding], [embedding_text],
+                                        [self._embedding_metadata(entry.parsed_json)])
+                counts["reindexed"] += 1
+            elif self.embedding_batcher:
+                futures.append(self.embedding_batcher.submit(
+                    entry.resume_id, embedding_text, metadata=self._embedding_metadata(entry.parsed_json)
+                ))
+        if futures:
+            self.embedding_batcher.flush()
+        for future in futures:
+            try:
+                future.result()
+                counts["embedded"] += 1
+            except Exception as e:
+                print(f"Repair could not embed a resume - {e}")
+        
+        # Vectors whose parsed resume is gone: restore it from the cache or drop the vector
+        indexed_ids = self.collection.get(include=[])["ids"]
+        documents = self.db.get_resume_documents(indexed_ids)
+        missing = [rid for rid in indexed_ids if rid not in documents]
+        for entry in self.db.get_ingest_entries_by_resume_ids(missing):
+            if entry.parsed_json:
+                self._store_parsed_resume(entry.resume_id, entry.parsed_json)
+                documents[entry.resume_id] = entry.parsed_json
+                counts["restored"] += 1
+        stray = [rid for rid in missing if rid not in documents]
+        if stray:
+            self.collection.delete(ids=stray)
+            if self.embedding_matrix is not None:
+                self.embedding_matrix.delete(stray)
+            self.db.bump_corpus_version()
+            counts["vectors_removed"] = len(stray)
         
-        # Create and run the crew
-        crew = Crew(
-            agents=[self.resume_parser_agent],
-            tasks=[parse_task],
-            verbose=True
+        # Vectors indexed before they carried filterable metadata
+        counts["metadata_backfilled"] = self.backfill_embedding_metadata()
+        
+        print(f"Ingest repair: {counts}")
+        return counts
+    
+    def _extract_text(self, pdf_path: str) -> str:
+        """Extract text from the resume file (PDF, DOCX or plain text)."""
+        return self._record_extraction(pdf_path, extract_document_result(
+            pdf_path,
+            backend=self.settings.pdf_backend,
+            max_workers=self.settings.pdf_page_workers,
+            parallel_page_threshold=self.settings.pdf_parallel_page_threshold,
+        ))
+    
+    def _record_extraction(self, pdf_path: str, result: extractors.ExtractionResult) -> str:
+        """Profile an extraction (possibly run in a worker process) and return its text."""
+        self.profiler.record("extract", result.seconds, bytes=os.path.getsize(pdf_path),
+                             tokens=estimate_tokens(result.text))
+        return result.text
+    
+    def _prepare_parse(self, raw_text: str, pdf_path: str, sample=None):
+        """Build the parse prompts, pre-extracting what the rules can resolve.
+        
+        The resume is compacted to `parse_prompt_token_budget` tokens; longer
+        resumes get one prompt per part. Returns the prompts and the
+        PreExtraction (or None) to merge back into the LLM output. The prompt
+        tokens and count are added to the profiler `sample` when given.
+        """
+        prompts, pre, compacted = prepare_parse_prompts(
+            raw_text,
+            pdf_path,
+            budget=self.settings.parse_prompt_token_budget,
+            strategy=self.settings.parse_overflow_strategy,
+            heuristics=self.settings.heuristic_pre_extraction,
         )
+        if compacted.over_budget:
+            print(f"{pdf_path} is over the prompt budget ({compacted.tokens} tokens), parsing in {len(prompts)} parts")
+        if sample is not None:
+            sample.tokens = sum(estimate_tokens(prompt) for prompt in prompts)
+            sample.items = len(prompts)
+        return prompts, pre
+    
+    def _extract_structured_data_with_crew(self, raw_text: str, pdf_path: str, resume_id: str = None) -> str:
+        """Extract structured data from resume text using CrewAI task."""
+        parser_agent = self._get_parser_agent()
         
-        # Execute the crew - no fallback, fail if it fails
-        result = crew.kickoff()
-        resume_id = uuid.uuid4()
-        with open(f'parsed_resumes/{resume_id}.json','w') as f:
-            f.write(str(result))
-        return str(resume_id)
+        results = []
+        with self.profiler.stage("parse") as sample:
+            prompts, pre = self._prepare_parse(raw_text, pdf_path, sample)
+            for prompt in prompts:
+                # Create the task for resume parsing
+                parse_task = Task(
+                    description=prompt,
+                    agent=parser_agent,
+                    expected_output="Valid JSON object containing structured resume data",
+                )
+                
+                # Create and run the crew
+                crew = Crew(
+                    agents=[parser_agent],
+                    tasks=[parse_task],
+                    verbose=True
+                )
+                
+                # Execute the crew - no fallback, fail if it fails
+                results.append(str(crew.kickoff()))
+        return self._save_parsed_resume(results, pre, pdf_path, resume_id)
     
+    def _extract_structured_data(self, raw_text: str, pdf_path: str, resume_id: str = None) -> str:
+        """Parse resume text with the configured extraction mode (direct or crew).
+        
+        The result is saved under `resume_id` (the id reserved for the file) or a fresh UUID.
+        """
+        if self.settings.extraction_mode == "crew":
+            return self._extract_structured_data_with_crew(raw_text, pdf_path, resume_id)
+        return self._extract_structured_data_direct(raw_text, pdf_path, resume_id)
     
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding using Voyage AI."""
-        if not self.voyage_client:
-            print("Voyage client not available, skipping embedding generation")
-            return None
-            
-        try:
-            result = self.voyage_client.embed(
-                texts=[text], 
-                model="voyage-2", 
-                input_type="document"
+    def _extract_structured_data_direct(self, raw_text: str, pdf_path: str, resume_id: str = None) -> str:
+        """Extract structured data with forced tool-use calls on the long-lived client.
+        
+        No Task/Crew is built per resume; the model fills the ResumeData
+        schema directly and the result is validated into ResumeData.
+        """
+        with self.profiler.stage("parse") as sample:
+            prompts, pre = self._prepare_parse(raw_text, pdf_path, sample)
+            results = [self._call_direct(prompt) for prompt in prompts]
+        return self._save_parsed_resume(results, pre, pdf_path, resume_id)
+    
+    async def _aextract_structured_data(self, raw_text: str, pdf_path: str, resume_id: str = None) -> str:
+        """Extract structured data with direct async Anthropic calls (no crew thread)."""
+        with self.profiler.stage("parse") as sample:
+            # Heuristics and prompt compaction are CPU work; keep them off the event loop
+            prompts, pre = await asyncio.to_thread(self._prepare_parse, raw_text, pdf_path, sample)
+            results = await asyncio.gather(*(self._acall_direct(prompt) for prompt in prompts))
+        # Writes resume_data, whose triggers also update the full-text index
+        return await asyncio.to_thread(self._save_parsed_resume, list(results), pre, pdf_path, resume_id)
+    
+    def _direct_request(self, prompt: str):
+        """Anthropic request forcing the resume tool, and its LLM cache key."""
+        request = dict(
+            model=self.settings.llm_model,
+            max_tokens=self.settings.llm_max_tokens,
+            system=PARSER_BACKSTORY,
+            messages=[{"role": "user", "content": prompt}],
+            tools=[RESUME_TOOL],
+            tool_choice={"type": "tool", "name": RESUME_TOOL["name"]},
+        )
+        key = make_cache_key(request["model"], request["messages"], request["tools"], system=request["system"],
+                             max_tokens=request["max_tokens"]) if self.llm_cache else None
+        return request, key
+    
+    @staticmethod
+    def _direct_response_text(response) -> str:
+        """The tool input as JSON, falling back to any text the model returned."""
+        for block in response.content:
+            if block.type == "tool_use":
+                return json.dumps(block.input)
+        return "".join(block.text for block in response.content if block.type == "text")
+    
+    @staticmethod
+    def _request_tokens(request: dict) -> int:
+        """Estimated input tokens of a direct request, charged to the rate governor."""
+        return estimate_tokens(request["system"] + json.dumps(request["messages"]) + json.dumps(request["tools"]))
+    
+    def _settle_tokens(self, response, estimated: int):
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "input_tokens", None) is not None:
+            self.rate_governor.settle(estimated, usage.input_tokens)
+    
+    def _call_direct(self, prompt: str) -> str:
+        request, key = self._direct_request(prompt)
+        if key:
+            cached = self.llm_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.rate_governor:
+            tokens = self._request_tokens(request)
+            response = self.rate_governor.call(lambda: self.anthropic_client.messages.create(**request), tokens)
+            self._settle_tokens(response, tokens)
+        else:
+            response = self.anthropic_client.messages.create(**request)
+        result_text = self._direct_response_text(response)
+        if key and result_text:
+            self.llm_cache.put(key, result_text, request["model"])
+        return result_text
+    
+    async def _acall_direct(self, prompt: str) -> str:
+        request, key = self._direct_request(prompt)
+        if key:
+            cached = await asyncio.to_thread(self.llm_cache.get, key)
+            if cached is not None:
+                return cached
+        if self.rate_governor:
+            tokens = self._request_tokens(request)
+            response = await self.rate_governor.acall(
+                lambda: self.async_anthropic_client.messages.create(**request), tokens
             )
-            return result.embeddings[0]
-        except Exception as e:
-            print(f"Embedding generation failed: {e}")
-            return None
+            self._settle_tokens(response, tokens)
+        else:
+            response = await self.async_anthropic_client.messages.create(**request)
+        result_text = self._direct_response_text(response)
+        if key and result_text:
+            await asyncio.to_thread(self.llm_cache.put, key, result_text, request["model"])
+        return result_text
+    
+    def _save_parsed_resume(self, result_texts: List[str], pre: PreExtraction = None, pdf_path: str = None,
+                            resume_id: str = None) -> str:
+        """Validate the parsed resume into ResumeData, write it under `resume_id` (or a fresh UUID) and return the id.
+        
+        Results of a resume parsed in parts are reduced into one, and fields
+        resolved by the pre-extractor are merged in.
+        """
+        # Drop any prose or code fences the model put around the JSON objects
+        result_texts = [text[text.find("{"):text.rfind("}") + 1] if "{" in text else text for text in result_texts]
+        result_text = result_texts[0]
+        parts = []
+        for text in result_texts:
+            try:
+                parts.append(json.loads(text))
+            except json.JSONDecodeError:
+                print("Skipping a parsed resume part that is not valid JSON")
+        if parts:
+            merged = merge_parsed_resume(reduce_parsed_parts(parts), pre, pdf_path)
+            try:
+                result_text = ResumeData.model_validate(merged).model_dump_json()
+            except ValidationError as e:
+                print(f"Parsed resume does not match ResumeData, storing it unvalidated: {e}")
+                result_text = json.dumps(merged)
+        resume_id = str(resume_id or uuid.uuid4())
+        self._store_parsed_resume(resume_id, result_text, pdf_path)
+        return resume_id
+    
+    
+    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of documents in a single provider call."""
+        with self.profiler.stage("embed", bytes=sum(len(text) for text in texts),
+                                 tokens=sum(estimate_tokens(text) for text in texts), items=len(texts)):
+            return self.embedding_provider.embed_documents(texts)
     
    
-    def _insert_to_chromadb(self, resume_id: str, embedding: List[float], embedding_text: str) -> None:
-        """Insert embedding to ChromaDB with resume UUID as key."""
-        # Insert into ChromaDB
-        self.collection.add(
-            embeddings=[embedding],
-            documents=[embedding_text],
-            ids=[resume_id]
-        )
+    def _insert_many_to_chromadb(self, resume_ids: List[str], embeddings: List[List[float]],
+                                 embedding_texts: List[str], metadatas: List[dict] = None) -> None:
+        """Insert a batch of embeddings to ChromaDB in one write."""
+        with self.profiler.stage("index", items=len(resume_ids)):
+            self.collection.upsert(
+                embeddings=embeddings,
+                documents=embedding_texts,
+                metadatas=metadatas,
+                ids=resume_ids
+            )
+            if self.embedding_matrix is not None:
+                self.embedding_matrix.upsert(resume_ids, embeddings)
+        # Invalidates cached search results over the previous corpus
+        self.db.bump_corpus_version()
+    
+    def _commit_embeddings(self, resume_ids: List[str], embeddings: List[List[float]],
+                           embedding_texts: List[str], metadatas: List[dict] = None) -> None:
+        """Embedding batcher sink: commit the embedded and indexed stages in order.
+        
+        The vectors are stored in the ingest cache before ChromaDB is written,
+        so an interrupted insert is finished from the cache without a new
+        provider call; the indexed stage is recorded only after the insert.
+        """
+        self.db.store_ingest_embeddings(resume_ids, embeddings)
+        self._insert_many_to_chromadb(resume_ids, embeddings, embedding_texts, metadatas)
+        self.db.mark_ingest_indexed(resume_ids)
+
+
+def compute_content_hash(file_path: str) -> str:
+    """SHA-256 of the file bytes, used as the ingest cache key."""
+    digest = hashlib.sha256()
+    with get_stage_profiler().stage("hash") as sample, open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+            sample.bytes += len(chunk)
+    return digest.hexdigest()
+
+
+def extract_document_result(path: str, backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                            parallel_page_threshold: int = 8) -> extractors.ExtractionResult:
+    """Extract text from a PDF, DOCX or plain-text resume, chosen by its sniffed type.
+
+    Module level so it can be shipped to a process pool during bulk ingestion;
+    the result carries its own timing for the parent's stage profiler.
+    """
+    result = extractors.extract_document(path, backend, max_workers, parallel_page_threshold)
+    print(f"Extracted {len(result.text)} chars from {os.path.basename(path)} "
+          f"({result.extractor}) in {result.milliseconds:.0f} ms")
+    return result
+
+
+def extract_document_text(path: str, backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                          parallel_page_threshold: int = 8) -> str:
+    """Extract just the text of a resume; see extract_document_result."""
+    return extract_document_result(path, backend, max_workers, parallel_page_threshold).text
 
 
 def main():
-    """Process 20 sample resumes from the data folder."""
+    """Ingest resumes from the data folder, either a random sample or in bulk."""
+    parser = argparse.ArgumentParser(description="Ingest resume PDFs into the recruiter stores")
+    parser.add_argument("data_folder", nargs="?", default="data", help="Folder containing resume PDFs")
+    parser.add_argument("--sample", type=int, default=20, help="Number of random resumes to process sequentially")
+    parser.add_argument("--bulk", action="store_true", help="Walk the whole folder tree with the pipelined bulk ingester")
+    parser.add_argument("--extract-workers", type=int, default=None, help="Processes used for PDF extraction (bulk only)")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Concurrent LLM parse calls (bulk only)")
+    parser.add_argument("--manifest", default="ingest_manifest.json", help="Where to write the per-file manifest (bulk only)")
+    parser.add_argument("--rebuild-embeddings", action="store_true",
+                        help="Re-embed indexed resumes whose embedding document is out of date, then exit")
+    parser.add_argument("--sync-embedding-matrix", action="store_true",
+                        help="Rebuild the memory-mapped embedding matrix from ChromaDB, then exit")
+    parser.add_argument("--backfill-metadata", action="store_true",
+                        help="Attach filterable metadata to indexed resumes that lack it, then exit")
+    parser.add_argument("--repair", action="store_true",
+                        help="Finish or roll back resumes left half-ingested by a crash, then exit")
+    parser.add_argument("--migrate-parsed-files", action="store_true",
+                        help="Import legacy parsed_resumes/*.json files into resume_data, then exit")
+    args = parser.parse_args()
+    
     agent = ResumeIngressAgent()
     
+    if args.rebuild_embeddings:
+        rebuilt = agent.rebuild_embedding_documents()
+        print(f"Rebuilt embedding documents for {rebuilt} resumes")
+        return
+    
+    if args.backfill_metadata:
+        updated = agent.backfill_embedding_metadata()
+        print(f"Backfilled metadata for {updated} resumes")
+        return
+    
+    if args.repair:
+        agent.repair_ingest_state()
+        return
+    
+    if args.migrate_parsed_files:
+        migrated = agent.migrate_parsed_resume_files()
+        print(f"Imported {migrated} parsed resume files")
+        return
+    
+    if args.sync_embedding_matrix:
+        if agent.embedding_matrix is None:
+            print("Embedding matrix is disabled (EMBEDDING_MATRIX_ENABLED=false)")
+            return
+        synced = agent.embedding_matrix.sync_from_collection(agent.collection)
+        print(f"Embedding matrix rebuilt with {synced} vectors ({agent.embedding_matrix.nbytes() / 1024:.1f} KiB)")
+        return
+    
+    if args.bulk:
+        from agents.bulk_ingress import BulkIngestionPipeline
+        
+        pipeline = BulkIngestionPipeline(
+            agent,
+            extract_workers=args.extract_workers,
+            llm_concurrency=args.llm_concurrency,
+        )
+        report = pipeline.run(args.data_folder)
+        report.print_summary()
+        report.write_manifest(args.manifest)
+        print(f"Manifest written to {args.manifest}")
+        return
+    
     # Get all PDF files from all categories
-    data_folder = "/Users/ada/fun/AI-Recruiter/data"
+    data_folder = args.data_folder
     pdf_files = []
     
     # Collect PDFs from all category folders
-    for category in ["ENGINEERING", "DESIGNER", "BUSINESS-DEVELOPMENT"]:
+    for category in RESUME_CATEGORIES:
         category_path = os.path.join(data_folder, category)
         if os.path.exists(category_path):
             category_pdfs = [os.path.join(category_path, f) for f in os.listdir(category_path) if f.endswith('.pdf')]
             pdf_files.extend(category_pdfs)
     
-    # Sample 20 resumes
-    import random
-    sample_size = min(20, len(pdf_files))
+    # Sample resumes
+    sample_size = min(args.sample, len(pdf_files))
     sample_pdfs = random.sample(pdf_files, sample_size)
     
     print(f"Processing {sample_size} resumes from {len(pdf_files)} total PDFs")
@@ -308,6 +994,4 @@ def main():
 
 
 if __name__ == "__main__":
-    import os
-    import random
-    main()
\ No newline at end of file
+    main()
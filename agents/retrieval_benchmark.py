@@ -0,0 +1,165 @@
+"""
+Benchmark candidate retrieval: recall and latency of vector, lexical and
+hybrid search over the configured stores.
+
+Without labelled queries, queries are generated from the corpus itself: a
+distinctive skill (listed by at most --max-df of the resumes) is the query
+and every indexed resume listing it is relevant. This is the exact-term case
+hybrid retrieval is meant to fix; pass --queries with a JSON list of
+{"query": ..., "relevant": [resume ids]} to measure on real searches:
+
+    python -m agents.retrieval_benchmark --queries 200 --k 10 --output retrieval_benchmark.json
+
+Query embeddings are computed once up front, so latencies are retrieval only.
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import chromadb
+
+from database.operations import DatabaseOperations
+from utils.embedding_providers import get_embedding_provider
+from utils.hybrid_retrieval import RETRIEVAL_MODES, HybridRetriever
+from utils.stage_profiler import percentile
+
+from .candidate_matcher import Settings
+
+
+def _skill_key(skill: str) -> str:
+    return " ".join(str(skill).lower().split())
+
+
+def generate_skill_queries(db: DatabaseOperations, searchable: set, count: int, max_df: float = 0.05,
+                           seed: int = 0) -> List[Dict]:
+    """Queries of one distinctive skill each, relevant = the searchable resumes listing it."""
+    holders = defaultdict(set)
+    spellings = defaultdict(Counter)
+    for rows in db.iter_resume_data():
+        for row in rows:
+            if row["id"] not in searchable:
+                continue
+            try:
+                skills = json.loads(row["document"]).get("skills") or []
+            except (json.JSONDecodeError, AttributeError):
+                continue
+            for skill in skills:
+                if isinstance(skill, str) and skill.strip():
+                    holders[_skill_key(skill)].add(row["id"])
+                    spellings[_skill_key(skill)][skill.strip()] += 1
+    limit = max(1, int(len(searchable) * max_df))
+    distinctive = sorted(key for key, ids in holders.items() if len(ids) <= limit)
+    random.Random(seed).shuffle(distinctive)
+    return [
+        {"query": spellings[key].most_common(1)[0][0], "relevant": sorted(holders[key])}
+        for key in distinctive[:count]
+    ]
+
+
+def evaluate(retriever: HybridRetriever, queries: List[Dict], mode: str, k: int) -> Dict:
+    """Mean recall@k, hit rate and MRR of one retrieval mode, plus its latency percentiles."""
+    recalls, hits, reciprocal_ranks, latencies = [], [], [], []
+    for item in queries:
+        relevant = set(item["relevant"])
+        started = time.perf_counter()
+        results = retriever.search(item["query"], n_results=k, mode=mode)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ranked = [result["id"] for result in results]
+        found = [rank for rank, resume_id in enumerate(ranked, 1) if resume_id in relevant]
+        recalls.append(len(found) / min(len(relevant), k))
+        hits.append(1.0 if found else 0.0)
+        reciprocal_ranks.append(1.0 / found[0] if found else 0.0)
+    ordered = sorted(latencies)
+    count = len(queries) or 1
+    return {
+        f"recall_at_{k}": round(sum(recalls) / count, 4),
+        f"hit_rate_at_{k}": round(sum(hits) / count, 4),
+        "mrr": round(sum(reciprocal_ranks) / count, 4),
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 2),
+            "p50": round(percentile(ordered, 0.50), 2),
+            "p95": round(percentile(ordered, 0.95), 2),
+        },
+    }
+
+
+def run_benchmark(settings: Settings = None, queries: List[Dict] = None, count: int = 200, k: int = 10,
+                  max_df: float = 0.05, modes=RETRIEVAL_MODES, seed: int = 0) -> Dict:
+    settings = settings or Settings()
+    db = DatabaseOperations(settings.sqlite_db_path)
+    provider = get_embedding_provider(
+        embedding_provider=settings.embedding_provider,
+        voyage_api_key=settings.voyage_api_key,
+        embedding_model=settings.embedding_model,
+    )
+    if provider is None:
+        raise RuntimeError("Embedding provider not available; set VOYAGE_API_KEY or EMBEDDING_PROVIDER=local")
+    collection = chromadb.PersistentClient(path=settings.chroma_db_path).get_collection(provider.collection_name)
+    searchable = set(collection.get(include=[])["ids"])
+
+    generated = queries is None
+    if generated:
+        queries = generate_skill_queries(db, searchable, count, max_df, seed)
+    else:
+        # Only indexed resumes can be retrieved by any mode
+        queries = [dict(item, relevant=[rid for rid in item["relevant"] if rid in searchable]) for item in queries]
+        queries = [item for item in queries if item["relevant"]]
+    if not queries:
+        raise ValueError("No benchmark queries with relevant indexed resumes")
+
+    vectors = {item["query"]: provider.embed_query(item["query"]) for item in queries}
+    retriever = HybridRetriever(collection, db, lambda query: vectors[query], rrf_k=settings.hybrid_rrf_k,
+                                pool_size=settings.hybrid_candidate_pool)
+    return {
+        "config": {
+            "k": k,
+            "queries": len(queries),
+            "corpus": len(searchable),
+            "embedding_provider": provider.name,
+            "embedding_model": provider.model,
+            "rrf_k": settings.hybrid_rrf_k,
+            "candidate_pool": settings.hybrid_candidate_pool,
+            "generated": generated,
+        },
+        "modes": {mode: evaluate(retriever, queries, mode, k) for mode in modes},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare recall and latency of vector, lexical and hybrid retrieval")
+    parser.add_argument("--queries", default="200",
+                        help="Number of generated skill queries, or a JSON file of labelled queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query (the ranking tool uses 10)")
+    parser.add_argument("--max-df", type=float, default=0.05,
+                        help="Generated queries use skills listed by at most this fraction of resumes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for sampling generated queries")
+    parser.add_argument("--output", default="retrieval_benchmark.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    queries, count = None, 0
+    if args.queries.isdigit():
+        count = int(args.queries)
+    else:
+        with open(args.queries) as f:
+            queries = json.load(f)
+
+    report = run_benchmark(queries=queries, count=count, k=args.k, max_df=args.max_df, seed=args.seed)
+
+    k = args.k
+    print(f"{report['config']['queries']} queries over {report['config']['corpus']} indexed resumes")
+    print(f"{'mode':<8} {f'recall@{k}':>10} {f'hit@{k}':>8} {'mrr':>7} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, m in report["modes"].items():
+        print(f"{mode:<8} {m[f'recall_at_{k}']:>10} {m[f'hit_rate_at_{k}']:>8} {m['mrr']:>7} "
+              f"{m['latency_ms']['mean']:>9} {m['latency_ms']['p50']:>8} {m['latency_ms']['p95']:>8}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ from crewai.tools import tool
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
+from utils.llm_cache import with_llm_cache
+
 
 class Settings(BaseSettings):
     """Application settings from environment variables."""
@@ -237,10 +239,10 @@ def find_available_slots_tool(events_text: str) -> str:
 settings = Settings()
 
 # Configure LLM to use Anthropic Claude
-llm = LLM(
+llm = with_llm_cache(LLM(
     model="claude-3-5-sonnet-20241022", 
     api_key=settings.anthropic_api_key
-)
+))
 
 # Create the Calendar Agent
 calendar_agent = Agent(
@@ -6,7 +6,6 @@ Integrates with CrewAI agents for resume processing and candidate matching
 import os
 import json
 import uuid
-import time
 from pathlib import Path
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, session
@@ -16,23 +15,36 @@ import threading
 # Import our CrewAI agents
 import sys
 sys.path.insert(0, os.getcwd())
-from agents.resume_ingress import ResumeIngressAgent
+from agents.resume_ingress import ResumeIngressAgent, compute_content_hash
 from agents.candidate_matcher import CandidateMatcherAgent
+from agents.ingest_workers import IngestWorkerPool
+from agents.directory_watcher import create_directory_watcher
+from database.models import WatchedFile
+from database.watch_manifest import WatchManifest
+from extractors import UnsupportedFileError, validate_document
+from utils.llm_cache import get_llm_cache
+from utils.query_embedding_cache import get_query_embedding_cache
+from utils.ranking_cache import get_ranking_cache
+from utils.resume_metadata import normalize_filters
+from utils.rate_limiter import rate_limit_stats
+from utils.stage_profiler import get_stage_profiler
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 # Ensure upload folder exists
 Path(UPLOAD_FOLDER).mkdir(exist_ok=True)
-Path('parsed_resumes').mkdir(exist_ok=True)
 
 # Initialize CrewAI agents
 resume_agent = ResumeIngressAgent()
+# Parsed resumes used to be one JSON file each under parsed_resumes/; import
+# them once, before the matcher or the workers read resume_data
+resume_agent.migrate_parsed_resume_files()
 matcher_agent = CandidateMatcherAgent()
 
 # Store processing status (in production, use Redis or database)
@@ -40,6 +52,52 @@ processing_status = {}
 recent_uploads = []
 search_results = {}
 
+def record_recent_upload(entry):
+    """Add to recent uploads, keeping only the last 20"""
+    recent_uploads.insert(0, entry)
+    if len(recent_uploads) > 20:
+        recent_uploads.pop()
+
+def on_ingest_complete(job, resume_id):
+    record_recent_upload({
+        'filename': job.filename,
+        'timestamp': datetime.now().isoformat(),
+        'status': 'success',
+        'resume_id': resume_id
+    })
+
+def on_ingest_dead(job, error):
+    record_recent_upload({
+        'filename': job.filename,
+        'timestamp': datetime.now().isoformat(),
+        'status': 'error',
+        'error': error
+    })
+
+# Uploads are persisted as jobs in recruiter.db and drained by a fixed-size
+# worker pool, so a restart resumes in-flight resumes instead of losing them
+ingest_workers = IngestWorkerPool(
+    resume_agent,
+    workers=int(os.environ.get('INGEST_WORKERS', 8)),
+    on_complete=on_ingest_complete,
+    on_dead=on_ingest_dead
+)
+ingest_workers.start()
+
+# Finish or roll back resumes a crash left half-written; runs alongside the
+# workers because every repair step is idempotent
+if os.environ.get('INGEST_REPAIR_ON_START', 'true').lower() == 'true':
+    threading.Thread(target=resume_agent.repair_ingest_state, name='ingest-repair', daemon=True).start()
+
+# Files already handled by the upload endpoint or the directory watcher
+watch_manifest = WatchManifest(resume_agent.settings.sqlite_db_path)
+
+# Optionally pick up resumes dropped into the watched folders (WATCH_DIRECTORIES)
+directory_watcher = None
+if os.environ.get('WATCH_ENABLED', 'false').lower() == 'true':
+    directory_watcher = create_directory_watcher(ingest_workers.submit)
+    directory_watcher.start()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -69,7 +127,7 @@ def upload_resume():
         return jsonify({'error': 'No file selected'}), 400
     
     if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Only PDF and DOCX allowed'}), 400
+        return jsonify({'error': 'Invalid file type. Only PDF, DOCX and TXT allowed'}), 400
     
     if file and allowed_file(file.filename):
         # Generate unique ID for this upload
@@ -81,27 +139,51 @@ def upload_resume():
         
         # Save file
         file.save(filepath)
-        
-        # Initialize processing status
-        processing_status[upload_id] = {
-            'status': 'uploading',
-            'filename': filename,
-            'progress': 0,
-            'steps': {
-                'uploaded': False,
-                'extracting': False,
-                'parsing': False,
-                'embedding': False,
-                'storing': False
-            },
-            'error': None,
-            'result': None
-        }
-        
-        # Start processing in background thread
-        thread = threading.Thread(target=process_resume_background, args=(upload_id, filepath, filename))
-        thread.daemon = True
-        thread.start()
+
+        # Check the real file type and that it opens, before any ingest work
+        try:
+            validate_document(filepath, resume_agent.settings.pdf_backend)
+        except UnsupportedFileError as e:
+            os.remove(filepath)
+            return jsonify({'error': f'Invalid file: {e}'}), 400
+
+        # Claim the file so the directory watcher does not queue it again
+        stat = os.stat(filepath)
+        content_hash = compute_content_hash(filepath)
+        watch_manifest.record(WatchedFile(
+            path=os.path.abspath(filepath), content_hash=content_hash,
+            size=stat.st_size, mtime_ns=stat.st_mtime_ns, status='uploaded', job_id=upload_id
+        ))
+
+        # Identical file already ingested - return its resume id straight away
+        cached_resume_id = resume_agent.lookup_cached_resume_id(filepath, content_hash)
+        if cached_resume_id:
+            processing_status[upload_id] = {
+                'status': 'completed',
+                'filename': filename,
+                'progress': 100,
+                'steps': {
+                    'uploaded': True,
+                    'extracting': True,
+                    'parsing': True,
+                    'embedding': True,
+                    'storing': True
+                },
+                'error': None,
+                'result': {
+                    'resume_id': cached_resume_id,
+                    'message': 'Resume already processed'
+                }
+            }
+            return jsonify({
+                'upload_id': upload_id,
+                'filename': filename,
+                'resume_id': cached_resume_id,
+                'message': 'Resume already processed'
+            }), 200
+
+        # Queue the resume for the ingestion workers
+        ingest_workers.submit(upload_id, filepath, filename)
         
         return jsonify({
             'upload_id': upload_id,
@@ -109,74 +191,101 @@ def upload_resume():
             'message': 'Upload successful, processing started'
         }), 200
 
-def process_resume_background(upload_id, filepath, filename):
-    """Process resume in background using CrewAI agent"""
-    try:
-        # Update status - file uploaded
-        processing_status[upload_id]['steps']['uploaded'] = True
-        processing_status[upload_id]['progress'] = 20
-        processing_status[upload_id]['status'] = 'extracting'
-        time.sleep(1)  # Simulate processing time
-        
-        # Update status - extracting text
-        processing_status[upload_id]['steps']['extracting'] = True
-        processing_status[upload_id]['progress'] = 40
-        processing_status[upload_id]['status'] = 'parsing'
-        time.sleep(1)
-        
-        # Update status - parsing resume
-        processing_status[upload_id]['steps']['parsing'] = True
-        processing_status[upload_id]['progress'] = 60
-        processing_status[upload_id]['status'] = 'embedding'
-        
-        # Actually process the resume using CrewAI agent
-        resume_id = resume_agent.process_resume(filepath)
-        
-        # Update status - generating embeddings
-        processing_status[upload_id]['steps']['embedding'] = True
-        processing_status[upload_id]['progress'] = 80
-        processing_status[upload_id]['status'] = 'storing'
-        time.sleep(1)
-        
-        # Update status - storing in database
-        processing_status[upload_id]['steps']['storing'] = True
-        processing_status[upload_id]['progress'] = 100
-        processing_status[upload_id]['status'] = 'completed'
-        processing_status[upload_id]['result'] = {
-            'resume_id': resume_id,
+# Status reported to the upload page for each last completed ingest stage
+STAGE_STATUS = {
+    'queued': ('extracting', 20),
+    'extracted': ('parsing', 40),
+    'parsed': ('embedding', 60),
+    'embedded': ('storing', 80),
+    'indexed': ('completed', 100)
+}
+
+def job_status(job):
+    """Render an ingest job in the upload page's status format"""
+    status, progress = STAGE_STATUS[job.stage]
+    if job.status == 'completed':
+        status, progress = 'completed', 100
+    elif job.status == 'dead':
+        status = 'error'
+    
+    return {
+        'status': status,
+        'filename': job.filename,
+        'progress': progress,
+        'steps': {
+            'uploaded': True,
+            'extracting': job.has_completed('extracted'),
+            'parsing': job.has_completed('parsed'),
+            'embedding': job.has_completed('embedded'),
+            'storing': job.has_completed('indexed')
+        },
+        'attempts': job.attempts,
+        'error': job.last_error if job.status == 'dead' else None,
+        'result': {
+            'resume_id': job.resume_id,
             'message': 'Resume processed successfully'
-        }
-        
-        # Add to recent uploads
-        recent_uploads.insert(0, {
-            'filename': filename,
-            'timestamp': datetime.now().isoformat(),
-            'status': 'success',
-            'resume_id': resume_id
-        })
-        
-        # Keep only last 20 uploads
-        if len(recent_uploads) > 20:
-            recent_uploads.pop()
-            
-    except Exception as e:
-        processing_status[upload_id]['status'] = 'error'
-        processing_status[upload_id]['error'] = str(e)
-        
-        recent_uploads.insert(0, {
-            'filename': filename,
-            'timestamp': datetime.now().isoformat(),
-            'status': 'error',
-            'error': str(e)
-        })
+        } if job.status == 'completed' else None
+    }
 
 @app.route('/api/status/<upload_id>')
 def get_status(upload_id):
     """Get processing status for an upload"""
-    if upload_id not in processing_status:
+    if upload_id in processing_status:
+        return jsonify(processing_status[upload_id])
+    
+    job = ingest_workers.job_queue.get_job(upload_id)
+    if job is None:
         return jsonify({'error': 'Upload ID not found'}), 404
     
-    return jsonify(processing_status[upload_id])
+    return jsonify(job_status(job))
+
+@app.route('/api/ingest/jobs')
+def get_ingest_jobs():
+    """Summarize the ingestion queue and its dead letters"""
+    return jsonify({
+        'counts': ingest_workers.job_queue.count_by_status(),
+        'dead_letters': ingest_workers.job_queue.get_dead_letters()
+    })
+
+@app.route('/api/llm-cache/stats')
+def get_llm_cache_stats():
+    """Hit/miss counters of the shared LLM response cache"""
+    cache = get_llm_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **cache.stats()})
+
+@app.route('/api/query-embeddings/stats')
+def get_query_embedding_stats():
+    """Hit/miss counters of the search query embedding cache"""
+    cache = get_query_embedding_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **cache.stats()})
+
+@app.route('/api/search-cache/stats')
+def get_search_cache_stats():
+    """Hit/miss and invalidation counters of the candidate ranking cache"""
+    cache = get_ranking_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, 'corpus_version': matcher_agent.db.get_corpus_version(), **cache.stats()})
+
+@app.route('/api/rate-limits/stats')
+def get_rate_limit_stats():
+    """Concurrency limit, bucket levels and 429 counts per model provider"""
+    return jsonify(rate_limit_stats())
+
+@app.route('/api/ingest/profile')
+def get_ingest_profile():
+    """Per-stage ingestion timings (p50/p95/p99, histogram, bytes and tokens)"""
+    return jsonify(get_stage_profiler().stats())
+
+@app.route('/api/ingest/profile/reset', methods=['POST'])
+def reset_ingest_profile():
+    """Start a fresh profiling window, e.g. before a load test"""
+    get_stage_profiler().reset()
+    return jsonify({'reset': True})
 
 @app.route('/api/search', methods=['POST'])
 def search_candidates():
@@ -188,12 +297,21 @@ def search_candidates():
     
     job_description = data['job_description']
     job_title = data.get('job_title', 'Position')
+    # Rank again even if a cached ranking for the current corpus exists
+    use_cache = not data.get('refresh', False)
+    # Structured filters applied inside the vector search, e.g.
+    # {"category": "ENGINEERING", "min_yoe": 5, "skills": ["Python"]}
+    try:
+        filters = normalize_filters(data.get('filters'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid filters: {e}'}), 400
     
     # Generate search ID
     search_id = str(uuid.uuid4())
     
     # Start search in background
-    thread = threading.Thread(target=search_candidates_background, args=(search_id, job_description, job_title))
+    thread = threading.Thread(target=search_candidates_background,
+                              args=(search_id, job_description, job_title, use_cache, filters))
     thread.daemon = True
     thread.start()
     
@@ -202,7 +320,7 @@ def search_candidates():
         'message': 'Search started'
     }), 200
 
-def search_candidates_background(search_id, job_description, job_title):
+def search_candidates_background(search_id, job_description, job_title, use_cache=True, filters=None):
     """Search for candidates in background using CrewAI agent"""
     try:
         # Initialize search status
@@ -214,7 +332,8 @@ def search_candidates_background(search_id, job_description, job_title):
         }
         
         # Use the candidate matcher agent
-        result = matcher_agent.find_best_candidates(job_description, job_title)
+        result = matcher_agent.find_best_candidates(job_description, job_title, use_cache=use_cache,
+                                                    filters=filters)
         
         # Format results for frontend
         formatted_results = {
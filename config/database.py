@@ -10,6 +10,83 @@ def get_sqlite_connection(db_path: str = "recruiter.db") -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
     return conn
 
+def _add_missing_columns(cursor, table: str, columns: dict) -> list:
+    """ALTER TABLE ADD COLUMN for columns an older database does not have yet"""
+    existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    added = []
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+            added.append(name)
+    return added
+
+def _resume_fts_values(row: str) -> str:
+    """resume_fts column values for a resume_data row (NEW in a trigger, or the table name)"""
+    return f'''
+        {row}.rowid,
+        {row}.id,
+        (SELECT group_concat(value, ' ; ') FROM json_each({row}.skills)),
+        (SELECT group_concat(value, ' ; ') FROM json_each({row}.keywords)),
+        (SELECT group_concat(json_extract(value, '$.job_title'), ' ; ') FROM json_each({row}.work_experience)
+         WHERE type = 'object'),
+        {row}.professional_summary
+    '''
+
+_RESUME_DATA_COLUMNS = '''
+            id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || substr(lower(hex(randomblob(2))),2) || '-' || substr('ab89',abs(random()) % 4 + 1, 1) || substr(lower(hex(randomblob(2))),2) || '-' || lower(hex(randomblob(6)))),
+            professional_summary TEXT,
+            category TEXT,
+            years_of_experience INTEGER,
+            seniority_level TEXT,
+            pdf_path TEXT,
+            personal_info TEXT CHECK (personal_info IS NULL OR json_valid(personal_info)),
+            work_experience TEXT CHECK (work_experience IS NULL OR json_valid(work_experience)),
+            education TEXT CHECK (education IS NULL OR json_valid(education)),
+            skills TEXT CHECK (skills IS NULL OR json_valid(skills)),
+            certifications TEXT CHECK (certifications IS NULL OR json_valid(certifications)),
+            languages TEXT CHECK (languages IS NULL OR json_valid(languages)),
+            keywords TEXT CHECK (keywords IS NULL OR json_valid(keywords)),
+            document TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+'''
+
+# Parsed-resume fields kept as JSON columns of resume_data
+_RESUME_DATA_JSON_COLUMNS = ['personal_info', 'work_experience', 'education', 'skills', 'certifications',
+                             'languages', 'keywords']
+
+def _migrate_resume_data(cursor):
+    """Bring a resume_data table created before the document column up to date.
+
+    Rows get a document rebuilt from their columns. Tables with the original
+    CHECK (json_valid(x)) constraints, which reject NULL fields on SQLite
+    builds where json_valid(NULL) is 0, are rebuilt with the current
+    definition; columns it no longer has are dropped.
+    """
+    row = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'resume_data'").fetchone()
+    if row is None:
+        return
+    if _add_missing_columns(cursor, 'resume_data', {'document': 'TEXT'}):
+        fields = ', '.join(
+            [f"'{column}', {column}" for column in
+             ['professional_summary', 'category', 'years_of_experience', 'seniority_level', 'pdf_path']]
+            + [f"'{column}', json({column})" for column in _RESUME_DATA_JSON_COLUMNS]
+        )
+        cursor.execute(f'UPDATE resume_data SET document = json_object({fields}) WHERE document IS NULL')
+    document = next(info for info in cursor.execute('PRAGMA table_info(resume_data)') if info[1] == 'document')
+    if document[3] and 'IS NULL OR json_valid' in row[0]:
+        return
+    columns = ', '.join(['id', 'professional_summary', 'category', 'years_of_experience', 'seniority_level',
+                         'pdf_path', *_RESUME_DATA_JSON_COLUMNS, 'document', 'created_at', 'updated_at'])
+    # Dropping the old table also drops its trigger and indexes; they are
+    # created again for the new table below
+    cursor.execute('ALTER TABLE resume_data RENAME TO resume_data_old')
+    cursor.execute(f'CREATE TABLE resume_data ({_RESUME_DATA_COLUMNS})')
+    cursor.execute(f'INSERT INTO resume_data ({columns}) SELECT {columns} FROM resume_data_old')
+    cursor.execute('DROP TABLE resume_data_old')
+    # Rows were copied under new rowids, which key resume_fts; it is rebuilt below
+    cursor.execute('DROP TABLE IF EXISTS resume_fts')
+
 def init_sqlite_database(db_path: str = "recruiter.db"):
     """Initialize SQLite database with required tables"""
     conn = get_sqlite_connection(db_path)
@@ -50,7 +127,8 @@ def init_sqlite_database(db_path: str = "recruiter.db"):
         )
     ''')
     
-    # Create job_requirements table
+    # Create job_requirements table; also the store of job description
+    # analyses, keyed by the hash of the normalized description
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS job_requirements (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -59,9 +137,192 @@ def init_sqlite_database(db_path: str = "recruiter.db"):
             min_yoe INTEGER,
             max_yoe INTEGER,
             industry TEXT,
-            description TEXT
+            description TEXT,
+            jd_hash TEXT,
+            search_query TEXT,
+            key_requirements TEXT,  -- JSON array
+            model TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # SQLite cannot ADD COLUMN with a non-constant default
+    _add_missing_columns(cursor, 'job_requirements', {
+        'jd_hash': 'TEXT',
+        'search_query': 'TEXT',
+        'key_requirements': 'TEXT',
+        'model': 'TEXT',
+        'created_at': 'TIMESTAMP',
+        'updated_at': 'TIMESTAMP',
+    })
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_job_requirements_jd_hash ON job_requirements(jd_hash)
+    ''')
+    
+    # Create resume_data table (see create_resume_table.sql); document is the
+    # parsed resume exactly as produced, the other columns are its queryable fields
+    _migrate_resume_data(cursor)
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS resume_data ({_RESUME_DATA_COLUMNS})')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS update_resume_data_updated_at
+            AFTER UPDATE ON resume_data
+            FOR EACH ROW
+        BEGIN
+            UPDATE resume_data SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+        END
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_category ON resume_data(category)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_seniority ON resume_data(seniority_level)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_experience ON resume_data(years_of_experience)')
+    
+    # Create resume_fts full-text index over the fields exact-term searches
+    # hit (skills, keywords, job titles, summary); triggers keep it in step
+    # with resume_data, so every ingest path maintains it. Each entry has the
+    # rowid of its resume_data row, so the triggers replace it by rowid
+    # instead of scanning the UNINDEXED resume_id.
+    fts_delete = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'resume_fts_delete'"
+    ).fetchone()
+    if fts_delete and 'OLD.rowid' not in fts_delete[0]:
+        # Index built before entries were keyed by rowid: build it again
+        for trigger in ('resume_fts_insert', 'resume_fts_update', 'resume_fts_delete'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute('DROP TABLE IF EXISTS resume_fts')
+    fts_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resume_fts'"
+    ).fetchone()
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+            resume_id UNINDEXED,
+            skills,
+            keywords,
+            titles,
+            summary,
+            tokenize = "unicode61 tokenchars '+#'"
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS resume_fts_insert AFTER INSERT ON resume_data
+        BEGIN
+            INSERT INTO resume_fts (rowid, resume_id, skills, keywords, titles, summary)
+            VALUES ({_resume_fts_values('NEW')});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS resume_fts_update
+            AFTER UPDATE OF skills, keywords, work_experience, professional_summary ON resume_data
+        BEGIN
+            DELETE FROM resume_fts WHERE rowid = OLD.rowid;
+            INSERT INTO resume_fts (rowid, resume_id, skills, keywords, titles, summary)
+            VALUES ({_resume_fts_values('NEW')});
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS resume_fts_delete AFTER DELETE ON resume_data
+        BEGIN
+            DELETE FROM resume_fts WHERE rowid = OLD.rowid;
+        END
+    ''')
+    if not fts_exists:
+        # Index resumes stored before the full-text index existed
+        cursor.execute(f'''
+            INSERT INTO resume_fts (rowid, resume_id, skills, keywords, titles, summary)
+            SELECT {_resume_fts_values('resume_data')} FROM resume_data
+        ''')
+    
+    # Create ingest_cache table keyed by SHA-256 of the uploaded file bytes.
+    # It doubles as the write-ahead record of an ingest: the resume id is
+    # reserved before any store is written and stage is the last stage
+    # committed (reserved, extracted, parsed, embedded, indexed).
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ingest_cache (
+            content_hash TEXT PRIMARY KEY,
+            resume_id TEXT,
+            raw_text TEXT,
+            parsed_json TEXT,
+            embedding TEXT,  -- JSON array of floats
+            stage TEXT DEFAULT 'reserved',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    if _add_missing_columns(cursor, 'ingest_cache', {'stage': "TEXT DEFAULT 'reserved'"}):
+        # Older caches stored the embedding only after the ChromaDB insert
+        cursor.execute('''
+            UPDATE ingest_cache SET stage = CASE
+                WHEN embedding IS NOT NULL THEN 'indexed'
+                WHEN parsed_json IS NOT NULL THEN 'parsed'
+                WHEN raw_text IS NOT NULL THEN 'extracted'
+                ELSE 'reserved' END
+        ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_ingest_cache_resume_id ON ingest_cache(resume_id)
+    ''')
+    
+    # Create single-row corpus version, bumped after every write to the vector
+    # index (ingest, re-embed, delete) so cached search results can be
+    # invalidated by comparing versions
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS corpus_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO corpus_state (id, version) VALUES (1, 0)')
+    
+    # Create durable ingestion job queue; stage is the last completed stage
+    # (queued, extracted, parsed, embedded, indexed)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ingest_jobs (
+            id TEXT PRIMARY KEY,
+            file_path TEXT NOT NULL,
+            filename TEXT,
+            stage TEXT DEFAULT 'queued',
+            status TEXT DEFAULT 'pending',  -- pending, running, completed, dead
+            resume_id TEXT,
+            attempts INTEGER DEFAULT 0,
+            last_error TEXT,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            next_attempt_at REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs(status, next_attempt_at)
+    ''')
+    
+    # Create dead-letter table for jobs that exhausted their retries
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ingest_dead_letters (
+            job_id TEXT PRIMARY KEY,
+            file_path TEXT NOT NULL,
+            stage TEXT,
+            attempts INTEGER,
+            last_error TEXT,
+            failed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create manifest of files seen by the directory watcher
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS watch_manifest (
+            path TEXT PRIMARY KEY,
+            content_hash TEXT,
+            size INTEGER,
+            mtime_ns INTEGER,
+            status TEXT,  -- queued, uploaded, duplicate, rejected
+            job_id TEXT,
+            error TEXT,
+            first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_watch_manifest_hash ON watch_manifest(content_hash)
+    ''')
     
     conn.commit()
     conn.close()
@@ -10,13 +10,16 @@ CREATE TABLE resume_data (
     pdf_path TEXT,
     
     -- Complex fields stored as JSON
-    personal_info TEXT CHECK (json_valid(personal_info)),
-    work_experience TEXT CHECK (json_valid(work_experience)),
-    education TEXT CHECK (json_valid(education)),
-    skills TEXT CHECK (json_valid(skills)),
-    certifications TEXT CHECK (json_valid(certifications)),
-    languages TEXT CHECK (json_valid(languages)),
-    keywords TEXT CHECK (json_valid(keywords)),
+    personal_info TEXT CHECK (personal_info IS NULL OR json_valid(personal_info)),
+    work_experience TEXT CHECK (work_experience IS NULL OR json_valid(work_experience)),
+    education TEXT CHECK (education IS NULL OR json_valid(education)),
+    skills TEXT CHECK (skills IS NULL OR json_valid(skills)),
+    certifications TEXT CHECK (certifications IS NULL OR json_valid(certifications)),
+    languages TEXT CHECK (languages IS NULL OR json_valid(languages)),
+    keywords TEXT CHECK (keywords IS NULL OR json_valid(keywords)),
+    
+    -- The parsed resume exactly as produced by ingestion
+    document TEXT NOT NULL,
     
     -- Metadata
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -36,4 +39,49 @@ END;
 -- Create indexes for common queries
 CREATE INDEX idx_resume_category ON resume_data(category);
 CREATE INDEX idx_resume_seniority ON resume_data(seniority_level);
-CREATE INDEX idx_resume_experience ON resume_data(years_of_experience);
\ No newline at end of file
+CREATE INDEX idx_resume_experience ON resume_data(years_of_experience);
+-- Create full-text index over the fields exact-term searches hit
+CREATE VIRTUAL TABLE resume_fts USING fts5(
+    resume_id UNINDEXED,
+    skills,
+    keywords,
+    titles,
+    summary,
+    tokenize = "unicode61 tokenchars '+#'"
+);
+
+-- Keep resume_fts in step with resume_data; entries share the rowid of their row
+CREATE TRIGGER resume_fts_insert AFTER INSERT ON resume_data
+BEGIN
+    INSERT INTO resume_fts (rowid, resume_id, skills, keywords, titles, summary)
+    VALUES (
+        NEW.rowid,
+        NEW.id,
+        (SELECT group_concat(value, ' ; ') FROM json_each(NEW.skills)),
+        (SELECT group_concat(value, ' ; ') FROM json_each(NEW.keywords)),
+        (SELECT group_concat(json_extract(value, '$.job_title'), ' ; ') FROM json_each(NEW.work_experience)
+         WHERE type = 'object'),
+        NEW.professional_summary
+    );
+END;
+
+CREATE TRIGGER resume_fts_update
+    AFTER UPDATE OF skills, keywords, work_experience, professional_summary ON resume_data
+BEGIN
+    DELETE FROM resume_fts WHERE rowid = OLD.rowid;
+    INSERT INTO resume_fts (rowid, resume_id, skills, keywords, titles, summary)
+    VALUES (
+        NEW.rowid,
+        NEW.id,
+        (SELECT group_concat(value, ' ; ') FROM json_each(NEW.skills)),
+        (SELECT group_concat(value, ' ; ') FROM json_each(NEW.keywords)),
+        (SELECT group_concat(json_extract(value, '$.job_title'), ' ; ') FROM json_each(NEW.work_experience)
+         WHERE type = 'object'),
+        NEW.professional_summary
+    );
+END;
+
+CREATE TRIGGER resume_fts_delete AFTER DELETE ON resume_data
+BEGIN
+    DELETE FROM resume_fts WHERE rowid = OLD.rowid;
+END;
@@ -0,0 +1,185 @@
+# database/job_queue.py
+import time
+from typing import List, Optional
+
+from .models import INGEST_STAGES, IngestJob
+from config.database import get_sqlite_connection, init_sqlite_database
+
+
+class IngestJobQueue:
+    """
+    Durable resume ingestion queue stored in recruiter.db.
+
+    Workers lease jobs for a limited time; a job whose worker died is picked
+    up again once its lease expires. Failed jobs are retried with exponential
+    backoff and parked in ingest_dead_letters after max_attempts.
+    """
+
+    def __init__(self, db_path: str = "recruiter.db"):
+        self.db_path = db_path
+        init_sqlite_database(db_path)
+
+    def enqueue(self, job_id: str, file_path: str, filename: str = None) -> IngestJob:
+        """Add a new ingestion job"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO ingest_jobs (id, file_path, filename) VALUES (?, ?, ?)
+        ''', (job_id, file_path, filename))
+
+        conn.commit()
+        conn.close()
+        return IngestJob(id=job_id, file_path=file_path, filename=filename)
+
+    def get_job(self, job_id: str) -> Optional[IngestJob]:
+        """Fetch a job by id"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT * FROM ingest_jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return IngestJob.from_dict(dict(row)) if row else None
+
+    def lease_next_job(self, owner: str, lease_seconds: float = 600) -> Optional[IngestJob]:
+        """Atomically claim the oldest runnable job for a worker"""
+        now = time.time()
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            # IMMEDIATE takes the write lock up front so two workers can't
+            # claim the same row
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('''
+                SELECT * FROM ingest_jobs
+                WHERE status IN ('pending', 'running')
+                  AND next_attempt_at <= ?
+                  AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                ORDER BY created_at, rowid
+                LIMIT 1
+            ''', (now, now)).fetchone()
+            if row is None:
+                conn.commit()
+                return None
+
+            conn.execute('''
+                UPDATE ingest_jobs
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (owner, now + lease_seconds, row['id']))
+            conn.commit()
+        finally:
+            conn.close()
+
+        job = IngestJob.from_dict(dict(row))
+        job.status = 'running'
+        job.attempts += 1
+        return job
+
+    def complete_stage(self, job_id: str, stage: str, resume_id: str = None, lease_seconds: float = 600):
+        """Record a finished stage and extend the worker's lease"""
+        if stage not in INGEST_STAGES:
+            raise ValueError(f"Unknown ingest stage '{stage}'")
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE ingest_jobs
+            SET stage = ?, resume_id = COALESCE(?, resume_id), lease_expires_at = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (stage, resume_id, time.time() + lease_seconds, job_id))
+
+        conn.commit()
+        conn.close()
+
+    def complete_job(self, job_id: str, resume_id: str):
+        """Mark a job as fully ingested"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE ingest_jobs
+            SET status = 'completed', stage = 'indexed', resume_id = ?, last_error = NULL,
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (resume_id, job_id))
+
+        conn.commit()
+        conn.close()
+
+    def fail_job(self, job_id: str, error: str, max_attempts: int = 5,
+                 base_backoff: float = 5.0, max_backoff: float = 300.0) -> bool:
+        """Release a failed job for retry, or dead-letter it. Returns True if dead-lettered."""
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT * FROM ingest_jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                conn.commit()
+                return False
+
+            if row['attempts'] >= max_attempts:
+                conn.execute('''
+                    UPDATE ingest_jobs
+                    SET status = 'dead', last_error = ?, lease_owner = NULL, lease_expires_at = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (error, job_id))
+                conn.execute('''
+                    INSERT OR REPLACE INTO ingest_dead_letters (job_id, file_path, stage, attempts, last_error)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (job_id, row['file_path'], row['stage'], row['attempts'], error))
+                conn.commit()
+                return True
+
+            backoff = min(max_backoff, base_backoff * 2 ** (row['attempts'] - 1))
+            conn.execute('''
+                UPDATE ingest_jobs
+                SET status = 'pending', last_error = ?, next_attempt_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (error, time.time() + backoff, job_id))
+            conn.commit()
+            return False
+        finally:
+            conn.close()
+
+    def requeue_dead_letter(self, job_id: str):
+        """Give a dead-lettered job a fresh set of attempts"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE ingest_jobs
+            SET status = 'pending', attempts = 0, next_attempt_at = 0, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'dead'
+        ''', (job_id,))
+        cursor.execute('DELETE FROM ingest_dead_letters WHERE job_id = ?', (job_id,))
+
+        conn.commit()
+        conn.close()
+
+    def get_dead_letters(self) -> List[dict]:
+        """List jobs that exhausted their retries"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT * FROM ingest_dead_letters ORDER BY failed_at DESC')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [dict(row) for row in rows]
+
+    def count_by_status(self) -> dict:
+        """Number of jobs in each status"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT status, COUNT(*) AS n FROM ingest_jobs GROUP BY status')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {row['status']: row['n'] for row in rows}
@@ -1,5 +1,5 @@
 # database/models.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 from datetime import datetime
 import json
@@ -77,4 +77,115 @@ class JobRequirement:
     min_yoe: int
     max_yoe: int
     industry: str
-    description: str
\ No newline at end of file
+    description: str
+    jd_hash: Optional[str] = None  # see database.operations.job_description_hash
+    search_query: Optional[str] = None
+    key_requirements: List[str] = field(default_factory=list)
+    model: Optional[str] = None  # LLM that produced the analysis
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create instance from database dictionary"""
+        return cls(
+            id=data.get('id'),
+            title=data['title'],
+            required_skills=json.loads(data['required_skills']) if data['required_skills'] else [],
+            min_yoe=data['min_yoe'],
+            max_yoe=data['max_yoe'],
+            industry=data['industry'],
+            description=data['description'],
+            jd_hash=data.get('jd_hash'),
+            search_query=data.get('search_query'),
+            key_requirements=json.loads(data['key_requirements']) if data.get('key_requirements') else [],
+            model=data.get('model'),
+            created_at=datetime.fromisoformat(data['created_at']) if data.get('created_at') else None
+        )
+
+# Stages committed for a content hash, in order; each one's output is stored
+# in ingest_cache before the stage is recorded
+INGEST_CACHE_STAGES = ['reserved', 'extracted', 'parsed', 'embedded', 'indexed']
+
+
+@dataclass
+class IngestCacheEntry:
+    content_hash: str
+    resume_id: Optional[str] = None
+    raw_text: Optional[str] = None
+    parsed_json: Optional[str] = None
+    embedding: Optional[List[float]] = None
+    stage: str = 'reserved'  # last committed stage, see INGEST_CACHE_STAGES
+
+    @property
+    def is_complete(self) -> bool:
+        """True once the resume is parsed, embedded and in ChromaDB."""
+        return bool(self.resume_id and self.parsed_json and self.embedding is not None and self.stage == 'indexed')
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create instance from database dictionary"""
+        return cls(
+            content_hash=data['content_hash'],
+            resume_id=data['resume_id'],
+            raw_text=data['raw_text'],
+            parsed_json=data['parsed_json'],
+            embedding=json.loads(data['embedding']) if data['embedding'] else None,
+            stage=data.get('stage') or 'reserved'
+        )
+
+
+INGEST_STAGES = ['queued', 'extracted', 'parsed', 'embedded', 'indexed']
+
+
+@dataclass
+class IngestJob:
+    id: str
+    file_path: str
+    filename: Optional[str] = None
+    stage: str = 'queued'  # last completed stage, see INGEST_STAGES
+    status: str = 'pending'  # pending, running, completed, dead
+    resume_id: Optional[str] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    def has_completed(self, stage: str) -> bool:
+        return INGEST_STAGES.index(self.stage) >= INGEST_STAGES.index(stage)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create instance from database dictionary"""
+        return cls(
+            id=data['id'],
+            file_path=data['file_path'],
+            filename=data['filename'],
+            stage=data['stage'],
+            status=data['status'],
+            resume_id=data['resume_id'],
+            attempts=data['attempts'],
+            last_error=data['last_error'],
+            created_at=datetime.fromisoformat(data['created_at']) if data['created_at'] else None
+        )
+
+@dataclass
+class WatchedFile:
+    path: str
+    content_hash: Optional[str] = None
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+    status: Optional[str] = None  # queued, uploaded, duplicate, rejected
+    job_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create instance from database dictionary"""
+        return cls(
+            path=data['path'],
+            content_hash=data['content_hash'],
+            size=data['size'],
+            mtime_ns=data['mtime_ns'],
+            status=data['status'],
+            job_id=data['job_id'],
+            error=data['error']
+        )
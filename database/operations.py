@@ -1,9 +1,80 @@
 # database/operations.py
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
-from .models import Candidate, ParsedResume, JobRequirement
+from .models import Candidate, ParsedResume, JobRequirement, IngestCacheEntry, INGEST_CACHE_STAGES
 from config.database import get_sqlite_connection, init_sqlite_database
+import hashlib
 import json
+import re
+import uuid
+
+
+def _stage_rank_sql(column: str) -> str:
+    """SQL expression ranking an ingest_cache stage column by INGEST_CACHE_STAGES order"""
+    cases = " ".join(f"WHEN '{stage}' THEN {rank}" for rank, stage in enumerate(INGEST_CACHE_STAGES))
+    return f"(CASE {column} {cases} ELSE -1 END)"
+
+
+RESUME_DATA_JSON_FIELDS = ['personal_info', 'work_experience', 'education', 'skills', 'certifications',
+                           'languages', 'keywords']
+
+# Ids per IN (...) query, under SQLite's bound-parameter limit
+_ID_CHUNK = 500
+
+
+def _chunks(ids: List[str]):
+    for start in range(0, len(ids), _ID_CHUNK):
+        yield ids[start:start + _ID_CHUNK]
+
+
+def _resume_data_row(resume_id: str, document: str, pdf_path: str = None) -> tuple:
+    """resume_data column values for a parsed resume document"""
+    try:
+        data = json.loads(document)
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        # Unparseable model output is kept as the document only
+        return (resume_id, None, None, None, None, pdf_path, *[None] * len(RESUME_DATA_JSON_FIELDS), document)
+    years = data.get('years_of_experience')
+    return (
+        resume_id,
+        data.get('professional_summary'),
+        data.get('category'),
+        years if isinstance(years, int) else None,
+        data.get('seniority_level'),
+        data.get('pdf_path') or pdf_path,
+        *[json.dumps(data[field]) if data.get(field) is not None else None for field in RESUME_DATA_JSON_FIELDS],
+        document,
+    )
+
+
+# bm25 weights of the resume_fts columns (resume_id, skills, keywords, titles, summary)
+RESUME_FTS_WEIGHTS = (0.0, 4.0, 2.0, 2.0, 1.0)
+
+_FTS_TERM = re.compile(r"[\w+#]+")
+_FTS_STOPWORDS = frozenset("a an and are as at be by for from in is of on or the to with years year experience".split())
+
+
+def resume_fts_query(text: str) -> Optional[str]:
+    """FTS5 query matching any term of free text, with adjacent term pairs as
+    phrases so exact multi-word skills ("Cinema 4D") score higher"""
+    terms = [term for term in _FTS_TERM.findall(text.lower()) if term not in _FTS_STOPWORDS]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in dict.fromkeys(terms)]
+    phrases = [f'"{first} {second}"' for first, second in dict.fromkeys(zip(terms, terms[1:]))]
+    return " OR ".join(quoted + phrases)
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Case- and whitespace-insensitive form of a job description"""
+    return " ".join(job_description.lower().split())
+
+
+def job_description_hash(job_description: str) -> str:
+    """Key of a job description in job_requirements; reformatting the same posting keeps the key"""
+    return hashlib.sha256(normalize_job_description(job_description).encode('utf-8')).hexdigest()
 
 
 class DatabaseOperations:
@@ -152,4 +223,324 @@ class DatabaseOperations:
         row = cursor.fetchone()
         conn.close()
         
-        return ParsedResume.from_dict(dict(row)) if row else None
\ No newline at end of file
+        return ParsedResume.from_dict(dict(row)) if row else None
+
+    def get_job_requirement(self, jd_hash: str) -> Optional[JobRequirement]:
+        """Get the stored analysis of a job description by its job_description_hash"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM job_requirements WHERE jd_hash = ?', (jd_hash,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return JobRequirement.from_dict(dict(row)) if row else None
+
+    def save_job_requirement(self, requirement: JobRequirement) -> int:
+        """Insert or replace the analysis stored for requirement.jd_hash"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO job_requirements (title, required_skills, min_yoe, max_yoe, industry, description,
+                                          jd_hash, search_query, key_requirements, model, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT(jd_hash) DO UPDATE SET
+                title = excluded.title,
+                required_skills = excluded.required_skills,
+                min_yoe = excluded.min_yoe,
+                max_yoe = excluded.max_yoe,
+                industry = excluded.industry,
+                description = excluded.description,
+                search_query = excluded.search_query,
+                key_requirements = excluded.key_requirements,
+                model = excluded.model,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (
+            requirement.title, json.dumps(requirement.required_skills), requirement.min_yoe, requirement.max_yoe,
+            requirement.industry, requirement.description, requirement.jd_hash, requirement.search_query,
+            json.dumps(requirement.key_requirements), requirement.model
+        ))
+        requirement_id = cursor.execute(
+            'SELECT id FROM job_requirements WHERE jd_hash = ?', (requirement.jd_hash,)
+        ).fetchone()['id']
+        conn.commit()
+        conn.close()
+        
+        return requirement_id
+
+    def get_corpus_version(self) -> int:
+        """Current version of the searchable corpus, see bump_corpus_version"""
+        conn = get_sqlite_connection(self.db_path)
+        row = conn.execute('SELECT version FROM corpus_state WHERE id = 1').fetchone()
+        conn.close()
+        return row['version'] if row else 0
+
+    def bump_corpus_version(self) -> int:
+        """Record a change to the vector index; call after the write so no reader sees the new version early"""
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('UPDATE corpus_state SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1')
+            version = conn.execute('SELECT version FROM corpus_state WHERE id = 1').fetchone()['version']
+            conn.commit()
+        finally:
+            conn.close()
+        return version
+
+    def get_ingest_cache_entry(self, content_hash: str) -> Optional[IngestCacheEntry]:
+        """Get cached ingest artifacts for a file content hash"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM ingest_cache WHERE content_hash = ?', (content_hash,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return IngestCacheEntry.from_dict(dict(row)) if row else None
+
+    def reserve_ingest_resume_id(self, content_hash: str) -> str:
+        """Write-ahead: fix the resume id for a content hash before any store is written.
+
+        Returns the id already reserved for the hash, so retries reuse it.
+        """
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('''
+                INSERT INTO ingest_cache (content_hash, resume_id, stage) VALUES (?, ?, 'reserved')
+                ON CONFLICT(content_hash) DO UPDATE SET resume_id = COALESCE(resume_id, excluded.resume_id)
+            ''', (content_hash, str(uuid.uuid4())))
+            row = conn.execute('SELECT resume_id FROM ingest_cache WHERE content_hash = ?', (content_hash,)).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        return row['resume_id']
+
+    def upsert_ingest_cache_entry(self, content_hash: str, resume_id: str = None, raw_text: str = None,
+                                  parsed_json: str = None, embedding: List[float] = None, stage: str = None):
+        """Store ingest artifacts for a content hash, keeping any already cached values.
+
+        `stage` records the stage these artifacts complete; it only ever moves forward.
+        """
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            INSERT INTO ingest_cache (content_hash, resume_id, raw_text, parsed_json, embedding, stage)
+            VALUES (?, ?, ?, ?, ?, COALESCE(?, 'reserved'))
+            ON CONFLICT(content_hash) DO UPDATE SET
+                resume_id = COALESCE(excluded.resume_id, resume_id),
+                raw_text = COALESCE(excluded.raw_text, raw_text),
+                parsed_json = COALESCE(excluded.parsed_json, parsed_json),
+                embedding = COALESCE(excluded.embedding, embedding),
+                stage = CASE WHEN {_stage_rank_sql('excluded.stage')} > {_stage_rank_sql('stage')}
+                             THEN excluded.stage ELSE stage END,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (
+            content_hash,
+            resume_id,
+            raw_text,
+            parsed_json,
+            json.dumps(embedding) if embedding is not None else None,
+            stage
+        ))
+        
+        conn.commit()
+        conn.close()
+
+    def store_ingest_embeddings(self, resume_ids: List[str], embeddings: List[List[float]]):
+        """Commit the embedding stage for a batch of resumes in one transaction"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany(f'''
+            UPDATE ingest_cache
+            SET embedding = ?,
+                stage = CASE WHEN {_stage_rank_sql('stage')} < {INGEST_CACHE_STAGES.index('embedded')}
+                             THEN 'embedded' ELSE stage END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE resume_id = ?
+        ''', [(json.dumps(embedding), resume_id) for resume_id, embedding in zip(resume_ids, embeddings)])
+        
+        conn.commit()
+        conn.close()
+
+    def mark_ingest_indexed(self, resume_ids: List[str]):
+        """Commit the final stage once the vectors are in ChromaDB"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            UPDATE ingest_cache SET stage = 'indexed', updated_at = CURRENT_TIMESTAMP
+            WHERE resume_id = ? AND embedding IS NOT NULL
+        ''', [(resume_id,) for resume_id in resume_ids])
+        
+        conn.commit()
+        conn.close()
+
+    def get_incomplete_ingest_entries(self) -> List[IngestCacheEntry]:
+        """Ingest records that stopped before the indexed stage"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM ingest_cache WHERE stage IS NULL OR stage != 'indexed'")
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [IngestCacheEntry.from_dict(dict(row)) for row in rows]
+
+    def get_ingest_resume_ids(self, stage: str = None) -> List[str]:
+        """Resume ids known to the ingest cache, optionally only those at one stage"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        if stage:
+            cursor.execute('SELECT resume_id FROM ingest_cache WHERE resume_id IS NOT NULL AND stage = ?', (stage,))
+        else:
+            cursor.execute('SELECT resume_id FROM ingest_cache WHERE resume_id IS NOT NULL')
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [row['resume_id'] for row in rows]
+
+    def reset_ingest_stage(self, resume_ids: List[str], stage: str):
+        """Move resumes back to an earlier stage (used by the repair job)"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            UPDATE ingest_cache SET stage = ?, updated_at = CURRENT_TIMESTAMP WHERE resume_id = ?
+        ''', [(stage, resume_id) for resume_id in resume_ids])
+        
+        conn.commit()
+        conn.close()
+
+    def get_ingest_entries_by_resume_ids(self, resume_ids: List[str]) -> List[IngestCacheEntry]:
+        """Ingest records for the given resume ids"""
+        if not resume_ids:
+            return []
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        entries = []
+        for chunk in _chunks(resume_ids):
+            cursor.execute(f'''
+                SELECT * FROM ingest_cache WHERE resume_id IN ({",".join("?" * len(chunk))})
+            ''', chunk)
+            entries.extend(IngestCacheEntry.from_dict(dict(row)) for row in cursor.fetchall())
+        conn.close()
+        
+        return entries
+
+    def save_resume_data(self, resume_id: str, document: str, pdf_path: str = None):
+        """Insert or replace one parsed resume"""
+        self.save_resume_data_many([(resume_id, document)], pdf_path=pdf_path)
+
+    def save_resume_data_many(self, resumes: Iterable[Tuple[str, str]], overwrite: bool = True,
+                              pdf_path: str = None) -> int:
+        """Bulk insert (resume_id, document) pairs in one transaction; returns the rows written.
+
+        With overwrite=False existing rows are kept (used by the file migration).
+        """
+        rows = [_resume_data_row(resume_id, document, pdf_path) for resume_id, document in resumes]
+        columns = ['id', 'professional_summary', 'category', 'years_of_experience', 'seniority_level', 'pdf_path',
+                   *RESUME_DATA_JSON_FIELDS, 'document']
+        if overwrite:
+            conflict = 'DO UPDATE SET ' + ', '.join(f'{column} = excluded.{column}' for column in columns[1:])
+        else:
+            conflict = 'DO NOTHING'
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany(f'''
+            INSERT INTO resume_data ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})
+            ON CONFLICT(id) {conflict}
+        ''', rows)
+        written = cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        return written
+
+    def get_resume_document(self, resume_id: str) -> Optional[str]:
+        """The parsed resume document stored for an id"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT document FROM resume_data WHERE id = ?', (resume_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return row['document'] if row else None
+
+    def get_resume_documents(self, resume_ids: List[str]) -> Dict[str, str]:
+        """Parsed resume documents for many ids, fetched in batched IN queries"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        documents = {}
+        for chunk in _chunks(list(resume_ids)):
+            cursor.execute(f'''
+                SELECT id, document FROM resume_data WHERE id IN ({",".join("?" * len(chunk))})
+            ''', chunk)
+            documents.update((row['id'], row['document']) for row in cursor.fetchall())
+        conn.close()
+        
+        return documents
+
+    def get_resumes(self, resume_ids: List[str]) -> Dict[str, dict]:
+        """Parsed resumes for many ids as dicts; unparseable documents are left out"""
+        resumes = {}
+        for resume_id, document in self.get_resume_documents(resume_ids).items():
+            try:
+                resumes[resume_id] = json.loads(document)
+            except json.JSONDecodeError:
+                continue
+        return resumes
+
+    def get_resume_data_ids(self) -> List[str]:
+        """Ids of every stored parsed resume"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id FROM resume_data')
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [row['id'] for row in rows]
+
+    def search_resume_text(self, query: str, limit: int = 50) -> List[Tuple[str, float]]:
+        """BM25 full-text search of resume_fts; (resume_id, score) best first, higher is better"""
+        match = resume_fts_query(query)
+        if match is None:
+            return []
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            rows = conn.execute(f'''
+                SELECT resume_id, -bm25(resume_fts, {", ".join(map(str, RESUME_FTS_WEIGHTS))}) AS score
+                FROM resume_fts WHERE resume_fts MATCH ?
+                ORDER BY score DESC LIMIT ?
+            ''', (match, limit)).fetchall()
+        finally:
+            conn.close()
+        return [(row['resume_id'], row['score']) for row in rows]
+
+    def iter_resume_data(self, updated_after: str = None, updated_before: str = None,
+                         batch_size: int = 1000):
+        """Stream resume_data rows (id, document, created_at, updated_at) in batches, oldest update first"""
+        conn = get_sqlite_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, document, created_at, updated_at FROM resume_data
+                WHERE (? IS NULL OR updated_at > ?) AND (? IS NULL OR updated_at < ?)
+                ORDER BY updated_at, id
+            ''', (updated_after, updated_after, updated_before, updated_before))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+        finally:
+            conn.close()
@@ -0,0 +1,300 @@
+# database/parquet_export.py
+"""
+Incremental columnar export of the parsed resume corpus.
+
+Flattens resume_data into three Parquet datasets, partitioned by category:
+
+- resumes/     one row per resume (contact, category, seniority, years, counts)
+- skills/      one row per (resume, skill), with a normalized skill name
+- experience/  one row per work experience entry, with start/end years and
+               duration parsed from the free-text duration
+
+Each run appends only rows updated since the watermark kept in
+`<export dir>/_watermark.json`. A resume updated after it was exported is
+appended again under a newer export_run; read_corpus_table keeps only the
+latest run per resume. Analytics then read just the columns they need:
+
+    python -m database.parquet_export             # append new rows
+    python -m database.parquet_export --full      # rebuild from scratch
+
+    read_corpus_table("exports/corpus", "skills", columns=["skill_normalized"])
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+from .operations import DatabaseOperations
+
+
+CORPUS_TABLES = ("resumes", "skills", "experience")
+PARTITION_COLUMNS = ["category"]
+WATERMARK_FILE = "_watermark.json"
+
+_YEAR = re.compile(r"\b(19[5-9]\d|20\d\d)\b")
+_ONGOING = re.compile(r"\b(present|current|now|ongoing|today)\b", re.IGNORECASE)
+
+
+class CorpusExportSettings(BaseSettings):
+    """Parquet export settings from environment variables."""
+    sqlite_db_path: str = "recruiter.db"
+    corpus_export_path: str = "exports/corpus"
+    corpus_export_batch_size: int = 5000
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install 'ai-recruiter[analytics]')") from e
+    return pyarrow, pyarrow.parquet
+
+
+# Column types of each corpus table. Declared rather than inferred, so a
+# column that is empty in one run (all None) is not written as null-typed
+# and later runs with values stay readable alongside it.
+_COMMON_COLUMNS = [("resume_id", "string"), ("category", "string"), ("updated_at", "string"),
+                   ("export_run", "string")]
+CORPUS_COLUMNS = {
+    "resumes": _COMMON_COLUMNS + [
+        ("name", "string"), ("email", "string"), ("location", "string"), ("seniority_level", "string"),
+        ("years_of_experience", "int64"), ("professional_summary", "string"), ("pdf_path", "string"),
+        ("skill_count", "int64"), ("experience_count", "int64"), ("education_count", "int64"),
+    ],
+    "skills": _COMMON_COLUMNS + [
+        ("skill", "string"), ("skill_normalized", "string"), ("seniority_level", "string"),
+    ],
+    "experience": _COMMON_COLUMNS + [
+        ("position", "int64"), ("job_title", "string"), ("company", "string"), ("location", "string"),
+        ("duration", "string"), ("start_year", "int64"), ("end_year", "int64"), ("is_current", "bool"),
+        ("duration_years", "int64"), ("responsibility_count", "int64"),
+    ],
+}
+
+
+def corpus_schema(table: str):
+    """pyarrow schema of a corpus table."""
+    pa, _ = _require_pyarrow()
+    return pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in CORPUS_COLUMNS[table]])
+
+
+def _text(value) -> Optional[str]:
+    """A string column value; the parser occasionally returns numbers or objects."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace so 'Python ' and 'python' count together."""
+    return " ".join(str(skill).lower().split())
+
+
+def parse_duration(duration: Optional[str], current_year: int) -> tuple:
+    """(start_year, end_year, is_current) from strings like '2015-2020' or 'Jan 2018 - Present'."""
+    if not duration:
+        return None, None, False
+    years = [int(year) for year in _YEAR.findall(str(duration))]
+    ongoing = bool(_ONGOING.search(str(duration)))
+    if not years:
+        return None, None, ongoing
+    start = min(years)
+    end = current_year if ongoing else max(years)
+    return start, end, ongoing
+
+
+def flatten_resume(resume_id: str, resume: dict, updated_at: str, export_run: str,
+                   current_year: int) -> Dict[str, List[dict]]:
+    """Rows for each corpus table from one parsed resume."""
+    personal = resume.get("personal_info") or {}
+    # Partition directory names cannot hold path separators or '='
+    category = re.sub(r"[/\\=]+", "-", str(resume.get("category") or "")).strip() or "Unknown"
+    seniority = _text(resume.get("seniority_level"))
+    years = resume.get("years_of_experience")
+    common = {"resume_id": resume_id, "category": category, "updated_at": updated_at, "export_run": export_run}
+    skills = [s for s in resume.get("skills") or [] if isinstance(s, str) and s.strip()]
+    experience = [e for e in resume.get("work_experience") or [] if isinstance(e, dict)]
+
+    rows = {
+        "resumes": [{
+            **common,
+            "name": _text(personal.get("name")),
+            "email": _text(personal.get("email")),
+            "location": _text(personal.get("location")),
+            "seniority_level": seniority,
+            "years_of_experience": years if isinstance(years, int) and not isinstance(years, bool) else None,
+            "professional_summary": _text(resume.get("professional_summary")),
+            "pdf_path": _text(resume.get("pdf_path")),
+            "skill_count": len(skills),
+            "experience_count": len(experience),
+            "education_count": len(resume.get("education") or []),
+        }],
+        "skills": [
+            {**common, "skill": skill.strip(), "skill_normalized": normalize_skill(skill),
+             "seniority_level": seniority}
+            for skill in skills
+        ],
+        "experience": [],
+    }
+    for position, entry in enumerate(experience):
+        start, end, ongoing = parse_duration(entry.get("duration"), current_year)
+        rows["experience"].append({
+            **common,
+            "position": position,
+            "job_title": _text(entry.get("job_title")),
+            "company": _text(entry.get("company")),
+            "location": _text(entry.get("location")),
+            "duration": _text(entry.get("duration")),
+            "start_year": start,
+            "end_year": end,
+            "is_current": ongoing,
+            "duration_years": end - start if start is not None and end is not None else None,
+            "responsibility_count": len(entry.get("responsibilities") or []),
+        })
+    return rows
+
+
+class CorpusExporter:
+    def __init__(self, export_path: str = "exports/corpus", db: DatabaseOperations = None,
+                 batch_size: int = 5000):
+        self.export_path = export_path
+        self.db = db or DatabaseOperations()
+        self.batch_size = batch_size
+
+    @property
+    def watermark_path(self) -> str:
+        return os.path.join(self.export_path, WATERMARK_FILE)
+
+    def load_watermark(self) -> Optional[str]:
+        """updated_at of the newest exported row, or None before the first export"""
+        try:
+            with open(self.watermark_path) as f:
+                return json.load(f).get("updated_at")
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_watermark(self, updated_at: str, export_run: str, rows: int):
+        tmp_path = f"{self.watermark_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"updated_at": updated_at, "export_run": export_run, "rows": rows}, f, indent=2)
+        os.replace(tmp_path, self.watermark_path)
+
+    def export(self, full: bool = False) -> dict:
+        """Append resumes updated since the watermark; returns what was written.
+
+        Rows updated in the current second are left for the next run, since
+        updated_at has one-second resolution and more may still arrive in it.
+        """
+        pa, pq = _require_pyarrow()
+        if full and os.path.exists(self.export_path):
+            shutil.rmtree(self.export_path)
+        os.makedirs(self.export_path, exist_ok=True)
+
+        watermark = self.load_watermark()
+        now = datetime.now(timezone.utc)
+        cutoff = now.strftime("%Y-%m-%d %H:%M:%S")
+        export_run = now.strftime("%Y%m%dT%H%M%S%fZ")
+        written = {table: 0 for table in CORPUS_TABLES}
+        exported = 0
+        newest = watermark
+
+        for chunk_index, rows in enumerate(self.db.iter_resume_data(watermark, cutoff, self.batch_size)):
+            tables = {table: [] for table in CORPUS_TABLES}
+            for row in rows:
+                try:
+                    resume = json.loads(row["document"])
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(resume, dict):
+                    continue
+                for table, table_rows in flatten_resume(row["id"], resume, row["updated_at"], export_run,
+                                                        now.year).items():
+                    tables[table].extend(table_rows)
+            for table, table_rows in tables.items():
+                if not table_rows:
+                    continue
+                schema = corpus_schema(table)
+                pq.write_to_dataset(
+                    pa.Table.from_pandas(pd.DataFrame(table_rows, columns=schema.names), schema=schema,
+                                         preserve_index=False),
+                    os.path.join(self.export_path, table),
+                    partition_cols=PARTITION_COLUMNS,
+                    schema=schema,
+                    basename_template=f"part-{export_run}-{chunk_index:05d}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+                written[table] += len(table_rows)
+            exported += len(rows)
+            newest = rows[-1]["updated_at"]
+
+        # Advanced only after every file is written: a crashed run is simply
+        # exported again under a newer export_run, which supersedes it
+        if newest != watermark:
+            self._save_watermark(newest, export_run, exported)
+        return {"export_run": export_run, "resumes": exported, "rows": written, "watermark": newest}
+
+
+def read_corpus_table(export_path: str, table: str, columns: List[str] = None, filters=None,
+                      latest_only: bool = True) -> pd.DataFrame:
+    """Read only `columns` of a corpus table (plus what deduplication needs).
+
+    `filters` are pyarrow filters, e.g. [("category", "=", "ENGINEERING")],
+    and prune partitions. With latest_only, only rows from the latest export
+    run of each resume are kept. That run is taken from the resumes table,
+    which gets a row for every exported resume, so a resume re-exported with
+    no skills or experience no longer keeps the rows of its previous run.
+    """
+    if table not in CORPUS_TABLES:
+        raise ValueError(f"Unknown corpus table '{table}'. Choose one of: {', '.join(CORPUS_TABLES)}")
+    _, pq = _require_pyarrow()
+
+    def read(name: str, read_columns: Optional[List[str]], read_filters=None) -> pd.DataFrame:
+        # The declared schema also reads exports written before it was
+        # declared, whose all-None columns were stored as null-typed
+        return pq.read_table(os.path.join(export_path, name), columns=read_columns, filters=read_filters,
+                             schema=corpus_schema(name), partitioning="hive").to_pandas()
+
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys([*columns, *(["resume_id", "export_run"] if latest_only else [])]))
+    frame = read(table, read_columns, filters)
+    if latest_only and not frame.empty:
+        runs = read("resumes", ["resume_id", "export_run"])
+        latest = runs.groupby("resume_id")["export_run"].max()
+        frame = frame[frame["export_run"] == frame["resume_id"].map(latest)]
+        if columns is not None:
+            frame = frame[columns]
+    return frame.reset_index(drop=True)
+
+
+def main():
+    """Export new or updated parsed resumes to the Parquet corpus."""
+    parser = argparse.ArgumentParser(description="Export parsed resumes to partitioned Parquet files")
+    parser.add_argument("--output", default=None, help="Export directory (default: CORPUS_EXPORT_PATH)")
+    parser.add_argument("--full", action="store_true", help="Discard the existing export and rebuild it")
+    args = parser.parse_args()
+
+    settings = CorpusExportSettings()
+    exporter = CorpusExporter(
+        args.output or settings.corpus_export_path,
+        DatabaseOperations(settings.sqlite_db_path),
+        batch_size=settings.corpus_export_batch_size,
+    )
+    result = exporter.export(full=args.full)
+    print(f"Exported {result['resumes']} resumes ({', '.join(f'{n} {t}' for t, n in result['rows'].items())} rows) "
+          f"to {exporter.export_path}; watermark {result['watermark']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# database/watch_manifest.py
+from typing import Dict, Optional
+
+from .models import WatchedFile
+from config.database import get_sqlite_connection, init_sqlite_database
+
+
+class WatchManifest:
+    """
+    Files the directory watcher (and the upload endpoint) have already seen.
+
+    Each path keeps the size, mtime and content hash it had when it was last
+    handled, so an unchanged file is skipped on the stat alone and a touched
+    but identical file is skipped on its hash.
+    """
+
+    def __init__(self, db_path: str = "recruiter.db"):
+        self.db_path = db_path
+        init_sqlite_database(db_path)
+
+    def get(self, path: str) -> Optional[WatchedFile]:
+        """Fetch the manifest entry for a path"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT * FROM watch_manifest WHERE path = ?', (path,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return WatchedFile.from_dict(dict(row)) if row else None
+
+    def load_stats(self) -> Dict[str, tuple]:
+        """(size, mtime_ns) of every known path, for cheap change detection"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT path, size, mtime_ns FROM watch_manifest')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {row['path']: (row['size'], row['mtime_ns']) for row in rows}
+
+    def find_by_hash(self, content_hash: str) -> Optional[WatchedFile]:
+        """Any queued or uploaded file with the same content"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM watch_manifest
+            WHERE content_hash = ? AND status IN ('queued', 'uploaded')
+            LIMIT 1
+        ''', (content_hash,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return WatchedFile.from_dict(dict(row)) if row else None
+
+    def record(self, entry: WatchedFile):
+        """Insert or update a path's entry"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO watch_manifest (path, content_hash, size, mtime_ns, status, job_id, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                content_hash = excluded.content_hash, size = excluded.size, mtime_ns = excluded.mtime_ns,
+                status = excluded.status, job_id = COALESCE(excluded.job_id, job_id), error = excluded.error,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (entry.path, entry.content_hash, entry.size, entry.mtime_ns, entry.status, entry.job_id, entry.error))
+
+        conn.commit()
+        conn.close()
+
+    def count_by_status(self) -> dict:
+        """Number of manifest entries in each status"""
+        conn = get_sqlite_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT status, COUNT(*) AS n FROM watch_manifest GROUP BY status')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {row['status']: row['n'] for row in rows}
@@ -0,0 +1,43 @@
+from .documents import (
+    DOCUMENT_EXTRACTORS,
+    SUPPORTED_EXTENSIONS,
+    DocumentExtractor,
+    ExtractionResult,
+    UnsupportedFileError,
+    extract_document,
+    extract_document_text,
+    get_document_extractor,
+    sniff_file_type,
+    validate_document,
+)
+from .pdf import (
+    DEFAULT_PDF_BACKEND,
+    PDF_BACKENDS,
+    PdfBackend,
+    available_pdf_backends,
+    extract_pdf_pages,
+    extract_pdf_text,
+    get_pdf_backend,
+    iter_pdf_pages,
+)
+
+__all__ = [
+    "DEFAULT_PDF_BACKEND",
+    "DOCUMENT_EXTRACTORS",
+    "PDF_BACKENDS",
+    "SUPPORTED_EXTENSIONS",
+    "DocumentExtractor",
+    "ExtractionResult",
+    "PdfBackend",
+    "UnsupportedFileError",
+    "available_pdf_backends",
+    "extract_document",
+    "extract_document_text",
+    "extract_pdf_pages",
+    "extract_pdf_text",
+    "get_document_extractor",
+    "get_pdf_backend",
+    "iter_pdf_pages",
+    "sniff_file_type",
+    "validate_document",
+]
@@ -0,0 +1,193 @@
+# extractors/documents.py
+"""
+Document text extraction keyed by the sniffed file type.
+
+The type comes from the file's leading bytes, never its extension, so a
+renamed DOCX is not handed to a PDF parser and a binary blob named
+resume.pdf is rejected before any parsing or LLM work.
+
+Extractors:
+- pdf: the configured PDF backend (see extractors.pdf)
+- docx: python-docx, paragraphs and table cells in document order
+- txt: decoded directly, no parsing at all
+"""
+
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Type
+
+from .pdf import DEFAULT_PDF_BACKEND, extract_pdf_text, get_pdf_backend
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+_SNIFF_BYTES = 8192
+
+
+class UnsupportedFileError(ValueError):
+    """The file is not a readable PDF, DOCX or plain-text document."""
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return True
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sniffed block
+        if e.start < len(head) - 3:
+            return False
+    return True
+
+
+def sniff_file_type(path: str) -> Optional[str]:
+    """Return "pdf", "docx" or "txt" from the file's content, or None if unsupported."""
+    with open(path, "rb") as file:
+        head = file.read(_SNIFF_BYTES)
+    if not head:
+        return None
+    # The PDF header may follow a little leading junk
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                return "docx" if "word/document.xml" in archive.namelist() else None
+        except zipfile.BadZipFile:
+            return None
+    if _looks_like_text(head):
+        return "txt"
+    return None
+
+
+class DocumentExtractor:
+    """Base class for per-type text extractors."""
+    file_type: str = ""
+
+    def extract(self, path: str, **options) -> str:
+        raise NotImplementedError
+
+    def validate(self, path: str, **options):
+        """Cheap structural check; raises UnsupportedFileError when the file cannot be read."""
+
+
+class PdfExtractor(DocumentExtractor):
+    file_type = "pdf"
+
+    def extract(self, path: str, pdf_backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                parallel_page_threshold: int = 8, **options) -> str:
+        return extract_pdf_text(path, pdf_backend, max_workers, parallel_page_threshold)
+
+    def validate(self, path: str, pdf_backend: str = DEFAULT_PDF_BACKEND, **options):
+        try:
+            pages = get_pdf_backend(pdf_backend).page_count(path)
+        except Exception as e:
+            raise UnsupportedFileError(f"Unreadable PDF: {e}") from e
+        if not pages:
+            raise UnsupportedFileError("PDF has no pages")
+
+
+class DocxExtractor(DocumentExtractor):
+    file_type = "docx"
+
+    def extract(self, path: str, **options) -> str:
+        try:
+            import docx
+        except ImportError as e:
+            raise ImportError("DOCX extraction needs python-docx (pip install python-docx)") from e
+        document = docx.Document(path)
+        blocks = [paragraph.text for paragraph in document.paragraphs]
+        for table in document.tables:
+            for row in table.rows:
+                cells = []
+                for cell in row.cells:
+                    # Merged cells repeat across the row
+                    if cell.text and (not cells or cells[-1] != cell.text):
+                        cells.append(cell.text)
+                blocks.append(" | ".join(cells))
+        return "\n".join(block for block in blocks if block.strip()).strip()
+
+    def validate(self, path: str, **options):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                bad_member = archive.testzip()
+        except zipfile.BadZipFile as e:
+            raise UnsupportedFileError(f"Unreadable DOCX: {e}") from e
+        if bad_member:
+            raise UnsupportedFileError(f"Corrupt DOCX member: {bad_member}")
+
+
+class TextExtractor(DocumentExtractor):
+    file_type = "txt"
+
+    def extract(self, path: str, **options) -> str:
+        with open(path, "rb") as file:
+            data = file.read()
+        if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+            return data.decode("utf-16").strip()
+        try:
+            return data.decode("utf-8-sig").strip()
+        except UnicodeDecodeError:
+            return data.decode("latin-1").strip()
+
+    def validate(self, path: str, **options):
+        if not self.extract(path):
+            raise UnsupportedFileError("Text file is empty")
+
+
+DOCUMENT_EXTRACTORS: Dict[str, Type[DocumentExtractor]] = {
+    PdfExtractor.file_type: PdfExtractor,
+    DocxExtractor.file_type: DocxExtractor,
+    TextExtractor.file_type: TextExtractor,
+}
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text plus how it was obtained and how long it took."""
+    text: str
+    file_type: str
+    extractor: str
+    seconds: float
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+
+def get_document_extractor(file_type: str) -> DocumentExtractor:
+    if file_type not in DOCUMENT_EXTRACTORS:
+        raise UnsupportedFileError(f"Unsupported file type '{file_type}'")
+    return DOCUMENT_EXTRACTORS[file_type]()
+
+
+def validate_document(path: str, pdf_backend: str = DEFAULT_PDF_BACKEND) -> str:
+    """Sniff and structurally check a file; returns its type or raises UnsupportedFileError."""
+    file_type = sniff_file_type(path)
+    if file_type is None:
+        raise UnsupportedFileError("File is not a PDF, DOCX or plain-text document")
+    get_document_extractor(file_type).validate(path, pdf_backend=pdf_backend)
+    return file_type
+
+
+def extract_document(path: str, pdf_backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                     parallel_page_threshold: int = 8) -> ExtractionResult:
+    """Extract a document's text with the extractor for its sniffed type."""
+    started = time.perf_counter()
+    file_type = sniff_file_type(path)
+    if file_type is None:
+        raise UnsupportedFileError(f"{path} is not a PDF, DOCX or plain-text document")
+    extractor = get_document_extractor(file_type)
+    text = extractor.extract(path, pdf_backend=pdf_backend, max_workers=max_workers,
+                             parallel_page_threshold=parallel_page_threshold)
+    name = f"pdf:{pdf_backend}" if file_type == "pdf" else file_type
+    return ExtractionResult(text=text, file_type=file_type, extractor=name, seconds=time.perf_counter() - started)
+
+
+def extract_document_text(path: str, pdf_backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                          parallel_page_threshold: int = 8) -> str:
+    """Extract just the text of a document of any supported type."""
+    return extract_document(path, pdf_backend, max_workers, parallel_page_threshold).text
@@ -0,0 +1,177 @@
+# extractors/pdf.py
+"""
+Streaming PDF text extraction with swappable backends.
+
+Pages are yielded one at a time so callers never build the whole document
+with repeated string concatenation. Large documents can be split into page
+ranges that are extracted in parallel worker processes.
+
+Backends:
+- pypdf2: pure Python, always available (default)
+- pypdfium2: PDFium bindings, much faster
+- pymupdf: MuPDF bindings (fitz), much faster
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Type
+
+
+class PdfBackend:
+    """Base class for PDF text extraction backends."""
+    name: str = ""
+
+    def page_count(self, pdf_path: str) -> int:
+        raise NotImplementedError
+
+    def iter_pages(self, pdf_path: str, start: int = 0, stop: int = None) -> Iterator[str]:
+        """Yield the text of pages [start, stop) in order."""
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PdfBackend):
+    name = "pypdf2"
+
+    def __init__(self):
+        import PyPDF2
+        self._PyPDF2 = PyPDF2
+
+    def page_count(self, pdf_path: str) -> int:
+        with open(pdf_path, 'rb') as file:
+            return len(self._PyPDF2.PdfReader(file).pages)
+
+    def iter_pages(self, pdf_path: str, start: int = 0, stop: int = None) -> Iterator[str]:
+        with open(pdf_path, 'rb') as file:
+            reader = self._PyPDF2.PdfReader(file)
+            for index in range(start, min(stop or len(reader.pages), len(reader.pages))):
+                yield reader.pages[index].extract_text() or ""
+
+
+class PdfiumBackend(PdfBackend):
+    name = "pypdfium2"
+
+    def __init__(self):
+        import pypdfium2
+        self._pdfium = pypdfium2
+
+    def page_count(self, pdf_path: str) -> int:
+        document = self._pdfium.PdfDocument(pdf_path)
+        try:
+            return len(document)
+        finally:
+            document.close()
+
+    def iter_pages(self, pdf_path: str, start: int = 0, stop: int = None) -> Iterator[str]:
+        document = self._pdfium.PdfDocument(pdf_path)
+        try:
+            for index in range(start, min(stop or len(document), len(document))):
+                page = document[index]
+                text_page = page.get_textpage()
+                try:
+                    yield text_page.get_text_range()
+                finally:
+                    text_page.close()
+                    page.close()
+        finally:
+            document.close()
+
+
+class PyMuPDFBackend(PdfBackend):
+    name = "pymupdf"
+
+    def __init__(self):
+        try:
+            import pymupdf as fitz
+        except ImportError:
+            import fitz
+        self._fitz = fitz
+
+    def page_count(self, pdf_path: str) -> int:
+        with self._fitz.open(pdf_path) as document:
+            return document.page_count
+
+    def iter_pages(self, pdf_path: str, start: int = 0, stop: int = None) -> Iterator[str]:
+        with self._fitz.open(pdf_path) as document:
+            for index in range(start, min(stop or document.page_count, document.page_count)):
+                yield document.load_page(index).get_text()
+
+
+PDF_BACKENDS: Dict[str, Type[PdfBackend]] = {
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfiumBackend.name: PdfiumBackend,
+    PyMuPDFBackend.name: PyMuPDFBackend,
+}
+
+DEFAULT_PDF_BACKEND = PyPDF2Backend.name
+
+_backend_instances: Dict[str, PdfBackend] = {}
+
+
+def get_pdf_backend(name: str = DEFAULT_PDF_BACKEND) -> PdfBackend:
+    """Return a (cached) backend instance by name.
+
+    Raises ValueError for unknown names and ImportError when the backend's
+    library is not installed.
+    """
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Choose one of: {', '.join(PDF_BACKENDS)}")
+    if name not in _backend_instances:
+        try:
+            _backend_instances[name] = PDF_BACKENDS[name]()
+        except ImportError as e:
+            raise ImportError(f"PDF backend '{name}' is not installed: {e}") from e
+    return _backend_instances[name]
+
+
+def available_pdf_backends() -> List[str]:
+    """Names of the backends whose libraries are importable here."""
+    available = []
+    for name in PDF_BACKENDS:
+        try:
+            get_pdf_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def iter_pdf_pages(pdf_path: str, backend: str = DEFAULT_PDF_BACKEND) -> Iterator[str]:
+    """Stream the text of each page of a PDF."""
+    return get_pdf_backend(backend).iter_pages(pdf_path)
+
+
+def _extract_page_range(backend: str, pdf_path: str, start: int, stop: int) -> List[str]:
+    """Process pool worker: extract one contiguous range of pages."""
+    return list(get_pdf_backend(backend).iter_pages(pdf_path, start, stop))
+
+
+def extract_pdf_pages(pdf_path: str, backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                      parallel_page_threshold: int = 8) -> List[str]:
+    """Extract every page's text, splitting large documents across processes.
+
+    Documents with fewer than `parallel_page_threshold` pages (most resumes)
+    are extracted inline since process start-up would dominate.
+    """
+    pdf_backend = get_pdf_backend(backend)
+    if max_workers <= 1:
+        return list(pdf_backend.iter_pages(pdf_path))
+
+    page_count = pdf_backend.page_count(pdf_path)
+    if page_count < parallel_page_threshold:
+        return list(pdf_backend.iter_pages(pdf_path))
+
+    workers = min(max_workers, page_count)
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_page_range, backend, pdf_path, start, stop) for start, stop in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+    return pages
+
+
+def extract_pdf_text(pdf_path: str, backend: str = DEFAULT_PDF_BACKEND, max_workers: int = 1,
+                     parallel_page_threshold: int = 8) -> str:
+    """Extract the full text of a PDF, one page per line block."""
+    pages = extract_pdf_pages(pdf_path, backend, max_workers, parallel_page_threshold)
+    return "\n".join(pages).strip()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from agents.ingest_benchmark import _build_agent
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+
+
+def write_resumes(tmp_path, count, prefix="resume"):
+    paths = []
+    for n in range(count):
+        path = tmp_path / f"{prefix}{n}.txt"
+        path.write_text(f"Candidate {prefix} {n}\nSkills: Python\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_aprocess_resume_reports_stages(agent, tmp_path):
+    stages = []
+
+    async def on_stage(stage, resume_id):
+        await asyncio.sleep(0)
+        stages.append(stage)
+
+    path, = write_resumes(tmp_path, 1)
+    resume_id = asyncio.run(agent.aprocess_resume(path, on_stage=on_stage, strict=True))
+
+    assert stages == ["extracted", "parsed", "embedded", "indexed"]
+    assert agent.collection.get(ids=[resume_id])["ids"] == [resume_id]
+
+
+def test_agent_serves_several_event_loops(agent, tmp_path):
+    # The concurrency semaphore belongs to one loop; a new loop gets its own
+    async def ingest(paths):
+        return await asyncio.gather(*(agent.aprocess_resume(p, strict=True) for p in paths))
+
+    first = asyncio.run(ingest(write_resumes(tmp_path, 3, "a")))
+    second = asyncio.run(ingest(write_resumes(tmp_path, 3, "b")))
+
+    assert len(set(first + second)) == 6
+
+
+def test_repeat_upload_is_served_from_cache(agent, tmp_path):
+    path, = write_resumes(tmp_path, 1)
+    first = asyncio.run(agent.aprocess_resume(path, strict=True))
+    stages = []
+
+    second = asyncio.run(agent.aprocess_resume(path, on_stage=lambda stage, rid: stages.append(stage)))
+
+    assert second == first
+    assert stages[-1] == "indexed"
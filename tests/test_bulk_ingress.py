@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agents.bulk_ingress import BulkIngestionPipeline
+from agents.ingest_benchmark import StubMessages, _build_agent
+
+
+class CountingMessages(StubMessages):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        return super().create(**request)
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+    agent.anthropic_client = SimpleNamespace(messages=CountingMessages())
+    return agent
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    root = tmp_path / "resumes"
+    (root / "copies").mkdir(parents=True)
+    (root / "ada.txt").write_text("Ada Lovelace\nSkills: Python\n")
+    (root / "grace.txt").write_text("Grace Hopper\nSkills: COBOL\n")
+    (root / "copies" / "ada.txt").write_text("Ada Lovelace\nSkills: Python\n")
+    return root
+
+
+def test_identical_files_are_ingested_once(agent, resumes):
+    report = BulkIngestionPipeline(agent, extract_workers=1).run(str(resumes))
+
+    assert [r.status for r in report.results.values()] == ["success"] * 3
+    assert agent.anthropic_client.messages.calls == 2
+    original = report.results[str(resumes / "ada.txt")]
+    copy = report.results[str(resumes / "copies" / "ada.txt")]
+    assert copy.resume_id == original.resume_id
+    assert copy.content_hash == original.content_hash
+    assert len({r.resume_id for r in report.results.values()}) == 2
+
+
+def test_rerun_is_served_from_the_ingest_cache(agent, resumes):
+    first = BulkIngestionPipeline(agent, extract_workers=1).run(str(resumes))
+    calls = agent.anthropic_client.messages.calls
+
+    second = BulkIngestionPipeline(agent, extract_workers=1).run(str(resumes))
+
+    assert agent.anthropic_client.messages.calls == calls
+    assert all(r.cached and r.status == "success" for r in second.results.values())
+    assert {p: r.resume_id for p, r in second.results.items()} == {p: r.resume_id for p, r in first.results.items()}
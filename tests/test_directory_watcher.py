@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import pytest
+
+from agents.directory_watcher import DirectoryWatcher
+from database.watch_manifest import WatchManifest
+
+
+class Submissions(list):
+    def __call__(self, job_id, file_path, filename):
+        self.append((job_id, file_path, filename))
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return WatchManifest(str(tmp_path / "recruiter.db"))
+
+
+def watcher(inbox, manifest, submit):
+    return DirectoryWatcher(submit, [str(inbox)], manifest, debounce_seconds=0, use_inotify=False)
+
+
+def test_new_file_is_queued_once(inbox, manifest):
+    submit = Submissions()
+    (inbox / "ada.txt").write_text("Ada Lovelace\nSkills: Python\n")
+    w = watcher(inbox, manifest, submit)
+
+    assert w.run_once() == 1
+    assert w.run_once() == 0
+    assert [filename for _, _, filename in submit] == ["ada.txt"]
+    entry = manifest.get(str(inbox / "ada.txt"))
+    assert (entry.status, entry.job_id) == ("queued", submit[0][0])
+
+
+def test_restart_skips_known_files_on_stat(inbox, manifest):
+    (inbox / "ada.txt").write_text("Ada Lovelace\nSkills: Python\n")
+    watcher(inbox, manifest, Submissions()).run_once()
+
+    submit = Submissions()
+    assert watcher(inbox, manifest, submit).run_once() == 0
+    assert submit == []
+
+
+def test_touched_identical_file_is_not_queued_again(inbox, manifest):
+    path = inbox / "ada.txt"
+    path.write_text("Ada Lovelace\nSkills: Python\n")
+    submit = Submissions()
+    w = watcher(inbox, manifest, submit)
+    w.run_once()
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert w.run_once() == 0
+    assert len(submit) == 1
+
+
+def test_copy_of_queued_file_is_a_duplicate(inbox, manifest):
+    (inbox / "ada.txt").write_text("Ada Lovelace\nSkills: Python\n")
+    submit = Submissions()
+    w = watcher(inbox, manifest, submit)
+    w.run_once()
+
+    shutil.copy(inbox / "ada.txt", inbox / "ada (1).txt")
+    assert w.run_once() == 0
+
+    copy = manifest.get(str(inbox / "ada (1).txt"))
+    assert (copy.status, copy.job_id) == ("duplicate", submit[0][0])
+    assert manifest.count_by_status() == {"queued": 1, "duplicate": 1}
+
+
+def test_changed_file_is_queued_again(inbox, manifest):
+    path = inbox / "ada.txt"
+    path.write_text("Ada Lovelace\nSkills: Python\n")
+    submit = Submissions()
+    w = watcher(inbox, manifest, submit)
+    w.run_once()
+
+    path.write_text("Ada Lovelace\nSkills: Python, Rust\n")
+
+    assert w.run_once() == 1
+    assert len({job_id for job_id, _, _ in submit}) == 2
+
+
+def test_ignored_files(inbox, manifest):
+    (inbox / ".hidden.txt").write_text("hidden")
+    (inbox / "photo.png").write_bytes(b"\x89PNG")
+    submit = Submissions()
+
+    assert watcher(inbox, manifest, submit).run_once() == 0
+    assert submit == []
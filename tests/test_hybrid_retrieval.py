@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+from config.database import get_sqlite_connection
+from database.operations import DatabaseOperations, resume_fts_query
+from utils.hybrid_retrieval import HybridRetriever, reciprocal_rank_fusion
+
+
+class FakeCollection:
+    """Just enough of a Chroma collection: fixed vector ranking and per-id metadata."""
+
+    def __init__(self, ranking, metadata=None):
+        self.ranking = ranking
+        self.metadata = metadata or {}
+        self.get_calls = []
+
+    def _matches(self, resume_id, where):
+        return all(self.metadata.get(resume_id, {}).get(k) == v for k, v in (where or {}).items())
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        ids = [i for i in self.ranking if self._matches(i, where)][:n_results]
+        return {"ids": [ids], "distances": [[0.1 * rank for rank in range(len(ids))]]}
+
+    def get(self, ids, where=None, include=None):
+        self.get_calls.append(list(ids))
+        indexed = set(self.ranking) | set(self.metadata)
+        return {"ids": [i for i in ids if i in indexed and self._matches(i, where)]}
+
+
+def resume(skills, title="Designer", summary=""):
+    return json.dumps({"skills": skills, "keywords": [], "professional_summary": summary,
+                       "work_experience": [{"job_title": title}]})
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseOperations(str(tmp_path / "recruiter.db"))
+
+
+def test_rrf_rewards_agreement():
+    # Second in both rankings beats first in one
+    fused = reciprocal_rank_fusion([["a", "b", "d"], ["c", "b"]], k=60)
+    assert [item for item, _ in fused] == ["b", "a", "c", "d"]
+    assert dict(fused)["b"] == pytest.approx(2 / 62)
+
+
+def test_rrf_ties_keep_first_seen_order():
+    assert [item for item, _ in reciprocal_rank_fusion([["a"], ["b"]])] == ["a", "b"]
+
+
+def test_fts_query_drops_stopwords_and_adds_phrases():
+    assert resume_fts_query("Cinema 4D and InDesign") == (
+        '"cinema" OR "4d" OR "indesign" OR "cinema 4d" OR "4d indesign"'
+    )
+    assert resume_fts_query("the and of") is None
+
+
+def test_search_resume_text_follows_inserts_updates_and_deletes(db):
+    db.save_resume_data("r1", resume(["Cinema 4D", "Photoshop"]))
+    db.save_resume_data("r2", resume(["Photoshop"]))
+
+    assert [i for i, _ in db.search_resume_text("Cinema 4D")] == ["r1"]
+    assert {i for i, _ in db.search_resume_text("photoshop")} == {"r1", "r2"}
+
+    db.save_resume_data("r2", resume(["InDesign"]))
+    assert [i for i, _ in db.search_resume_text("photoshop")] == ["r1"]
+    assert [i for i, _ in db.search_resume_text("indesign")] == ["r2"]
+
+    conn = get_sqlite_connection(db.db_path)
+    conn.execute("DELETE FROM resume_data WHERE id = 'r1'")
+    conn.commit()
+    conn.close()
+    assert db.search_resume_text("cinema") == []
+
+
+def test_skill_match_outranks_summary_mention(db):
+    db.save_resume_data("summary", resume(["Excel"], summary="Once watched a Cinema 4D tutorial"))
+    db.save_resume_data("skill", resume(["Cinema 4D"]))
+
+    assert [i for i, _ in db.search_resume_text("Cinema 4D")] == ["skill", "summary"]
+
+
+def test_lexical_search_over_fetches_past_unindexed_resumes(db):
+    # Ten unindexed resumes outrank the indexed one on BM25
+    for n in range(10):
+        db.save_resume_data(f"new{n}", resume(["Cinema 4D", "Cinema 4D"], title="Cinema 4D"))
+    db.save_resume_data("indexed", resume(["Cinema 4D"]))
+    retriever = HybridRetriever(FakeCollection(["indexed"]), db, lambda q: [0.0])
+
+    hits = retriever.lexical_search("Cinema 4D", limit=1)
+
+    assert [i for i, _ in hits] == ["indexed"]
+    assert len(retriever.collection.get_calls) > 1
+
+
+def test_lexical_search_applies_metadata_filter(db):
+    db.save_resume_data("r1", resume(["Python"]))
+    db.save_resume_data("r2", resume(["Python"]))
+    collection = FakeCollection([], {"r1": {"category": "ENGINEERING"}, "r2": {"category": "FINANCE"}})
+    retriever = HybridRetriever(collection, db, lambda q: [0.0])
+
+    hits = retriever.lexical_search("python", limit=5, where={"category": "FINANCE"})
+
+    assert [i for i, _ in hits] == ["r2"]
+
+
+def test_hybrid_search_fuses_both_rankings(db):
+    db.save_resume_data("exact", resume(["Cinema 4D"]))
+    db.save_resume_data("both", resume(["Cinema 4D", "Blender"]))
+    collection = FakeCollection(["paraphrase", "both", "exact"])
+    retriever = HybridRetriever(collection, db, lambda q: [0.0], pool_size=10)
+
+    results = retriever.search("Cinema 4D Blender", n_results=3)
+
+    assert [r["id"] for r in results] == ["both", "exact", "paraphrase"]
+    top = results[0]
+    assert (top["vector_rank"], top["lexical_rank"]) == (2, 1)
+    assert results[2]["lexical_rank"] is None
+    assert results[2]["lexical_score"] is None
+
+
+def test_single_modes_and_unknown_mode(db):
+    db.save_resume_data("exact", resume(["Cinema 4D"]))
+    retriever = HybridRetriever(FakeCollection(["paraphrase", "exact"]), db, lambda q: [0.0])
+
+    assert [r["id"] for r in retriever.search("Cinema 4D", mode="vector")] == ["paraphrase", "exact"]
+    assert [r["id"] for r in retriever.search("Cinema 4D", mode="lexical")] == ["exact"]
+    with pytest.raises(ValueError):
+        retriever.search("Cinema 4D", mode="keyword")
@@ -0,0 +1,110 @@
+import pytest
+
+from agents.ingest_benchmark import StubEmbeddingProvider, _build_agent
+from config.database import get_sqlite_connection
+
+
+class CountingEmbeddingProvider(StubEmbeddingProvider):
+    def __init__(self):
+        super().__init__(dimensions=8)
+        self.texts = 0
+
+    def embed_documents(self, texts):
+        self.texts += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    # Keep every relative path the agent or its caches use out of the repo
+    monkeypatch.chdir(tmp_path)
+    agent = _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+    agent.embedding_provider = CountingEmbeddingProvider()
+    agent.embedding_batcher = agent._create_embedding_batcher()
+    return agent
+
+
+@pytest.fixture
+def resume_id(agent, tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Ada Lovelace\nSkills: Python, SQL\nExperience\nEngineer at Acme 2018 - 2022\n")
+    return agent.process_resume(str(path))
+
+
+def execute(agent, sql, params=()):
+    conn = get_sqlite_connection(agent.db.db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def stage_of(agent, resume_id):
+    return agent.db.get_ingest_entries_by_resume_ids([resume_id])[0].stage
+
+
+def test_clean_state_needs_no_repair(agent, resume_id):
+    assert stage_of(agent, resume_id) == "indexed"
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["rolled_forward"] == counts["restored"] == counts["reindexed"] == counts["embedded"] == 0
+    assert counts["vectors_removed"] == 0
+
+
+def test_lost_vector_is_reindexed_without_embedding_again(agent, resume_id):
+    embedded = agent.embedding_provider.texts
+    agent.collection.delete(ids=[resume_id])
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["reindexed"] == 1
+    assert agent.embedding_provider.texts == embedded
+    assert agent.collection.get(ids=[resume_id])["ids"] == [resume_id]
+    assert stage_of(agent, resume_id) == "indexed"
+
+
+def test_missing_resume_row_is_restored_from_cache(agent, resume_id):
+    document = agent.db.get_resume_document(resume_id)
+    execute(agent, "DELETE FROM resume_data WHERE id = ?", (resume_id,))
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["restored"] == 1
+    assert counts["vectors_removed"] == 0
+    assert agent.db.get_resume_document(resume_id) == document
+
+
+def test_uncommitted_parse_is_rolled_forward_and_embedded(agent, resume_id):
+    # Crash after resume_data was written but before the parse was committed
+    agent.collection.delete(ids=[resume_id])
+    execute(agent, "UPDATE ingest_cache SET parsed_json = NULL, embedding = NULL, stage = 'extracted'"
+                   " WHERE resume_id = ?", (resume_id,))
+    embedded = agent.embedding_provider.texts
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["rolled_forward"] == 1
+    assert counts["embedded"] == 1
+    assert agent.embedding_provider.texts == embedded + 1
+    assert stage_of(agent, resume_id) == "indexed"
+
+
+def test_unparsed_reservation_is_left_for_the_next_ingest(agent):
+    reserved = agent.db.reserve_ingest_resume_id("f" * 64)
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["rolled_forward"] == counts["embedded"] == 0
+    assert stage_of(agent, reserved) == "reserved"
+
+
+def test_orphan_vector_is_removed(agent, resume_id):
+    version = agent.db.get_corpus_version()
+    agent.collection.add(ids=["orphan"], embeddings=[[0.1] * 8], documents=["orphan"])
+
+    counts = agent.repair_ingest_state()
+
+    assert counts["vectors_removed"] == 1
+    assert agent.collection.get(ids=["orphan"])["ids"] == []
+    assert agent.collection.get(ids=[resume_id])["ids"] == [resume_id]
+    assert agent.db.get_corpus_version() > version
@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+from database.job_queue import IngestJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return IngestJobQueue(str(tmp_path / "recruiter.db"))
+
+
+def test_lease_claims_oldest_job_once(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf", "a.pdf")
+    queue.enqueue("job-2", "/tmp/b.pdf", "b.pdf")
+
+    first = queue.lease_next_job("worker-1")
+    second = queue.lease_next_job("worker-2")
+
+    assert first.id == "job-1"
+    assert first.status == "running"
+    assert first.attempts == 1
+    assert second.id == "job-2"
+    assert queue.lease_next_job("worker-3") is None
+
+
+def test_expired_lease_is_picked_up_again(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+
+    assert queue.lease_next_job("worker-1", lease_seconds=0.05) is not None
+    assert queue.lease_next_job("worker-2") is None
+
+    time.sleep(0.1)
+    job = queue.lease_next_job("worker-2")
+    assert job.id == "job-1"
+    assert job.attempts == 2
+
+
+def test_complete_stage_records_progress_and_extends_lease(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    queue.lease_next_job("worker-1", lease_seconds=0.05)
+
+    queue.complete_stage("job-1", "parsed", resume_id="resume-1", lease_seconds=60)
+    time.sleep(0.1)
+
+    assert queue.lease_next_job("worker-2") is None
+    job = queue.get_job("job-1")
+    assert job.stage == "parsed"
+    assert job.resume_id == "resume-1"
+    assert job.has_completed("extracted")
+    assert not job.has_completed("embedded")
+
+    # A later stage without a resume id keeps the recorded one
+    queue.complete_stage("job-1", "embedded")
+    assert queue.get_job("job-1").resume_id == "resume-1"
+
+
+def test_complete_stage_rejects_unknown_stage(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    with pytest.raises(ValueError):
+        queue.complete_stage("job-1", "uploaded")
+
+
+def test_complete_job(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    queue.lease_next_job("worker-1")
+    queue.complete_job("job-1", "resume-1")
+
+    job = queue.get_job("job-1")
+    assert job.status == "completed"
+    assert job.stage == "indexed"
+    assert job.resume_id == "resume-1"
+    assert queue.lease_next_job("worker-2") is None
+    assert queue.count_by_status() == {"completed": 1}
+
+
+def test_failed_job_backs_off_before_retry(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    queue.lease_next_job("worker-1")
+
+    dead = queue.fail_job("job-1", "timeout", max_attempts=3, base_backoff=0.1)
+
+    assert dead is False
+    job = queue.get_job("job-1")
+    assert job.status == "pending"
+    assert job.last_error == "timeout"
+    assert queue.lease_next_job("worker-1") is None
+
+    time.sleep(0.15)
+    assert queue.lease_next_job("worker-1").attempts == 2
+
+
+def test_backoff_is_capped(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    for _ in range(4):
+        queue.lease_next_job("worker-1")
+        queue.fail_job("job-1", "timeout", max_attempts=10, base_backoff=0, max_backoff=0)
+
+    before = time.time()
+    queue.lease_next_job("worker-1")
+    queue.fail_job("job-1", "timeout", max_attempts=10, base_backoff=100, max_backoff=0.1)
+
+    assert queue.lease_next_job("worker-1") is None
+    time.sleep(max(0.0, before + 0.15 - time.time()))
+    assert queue.lease_next_job("worker-1").attempts == 6
+
+
+def test_job_is_dead_lettered_after_max_attempts(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    for attempt in range(1, 4):
+        queue.lease_next_job("worker-1")
+        dead = queue.fail_job("job-1", f"error {attempt}", max_attempts=3, base_backoff=0)
+        assert dead is (attempt == 3)
+
+    assert queue.get_job("job-1").status == "dead"
+    assert queue.lease_next_job("worker-1") is None
+    letters = queue.get_dead_letters()
+    assert [(l["job_id"], l["attempts"], l["last_error"]) for l in letters] == [("job-1", 3, "error 3")]
+    assert queue.count_by_status() == {"dead": 1}
+
+
+def test_requeue_dead_letter_resets_attempts(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    queue.lease_next_job("worker-1")
+    queue.fail_job("job-1", "error", max_attempts=1)
+
+    queue.requeue_dead_letter("job-1")
+
+    assert queue.get_dead_letters() == []
+    job = queue.lease_next_job("worker-1")
+    assert job.id == "job-1"
+    assert job.attempts == 1
+
+
+def test_requeue_ignores_live_jobs(queue):
+    queue.enqueue("job-1", "/tmp/a.pdf")
+    queue.lease_next_job("worker-1")
+
+    queue.requeue_dead_letter("job-1")
+
+    job = queue.get_job("job-1")
+    assert job.status == "running"
+    assert job.attempts == 1
+
+
+def test_fail_unknown_job(queue):
+    assert queue.fail_job("missing", "error") is False
@@ -0,0 +1,150 @@
+import time
+
+import pytest
+from crewai.llms.base_llm import BaseLLM
+
+from utils.llm_cache import CachedLLM, LLMCache, llm_provider, make_cache_key
+
+
+class RecordingLLM(BaseLLM):
+    """Answers with a counter and records the stop words of each call."""
+
+    def __init__(self, model="anthropic/claude-test", temperature=0.1):
+        super().__init__(model=model, temperature=temperature)
+        self.calls = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        self.calls.append(list(self.stop))
+        return f"answer {len(self.calls)}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm_cache.db"), max_entries=100)
+
+
+def test_key_ignores_whitespace_only_prompt_changes():
+    messages = [{"role": "user", "content": "Rank   these\ncandidates"}]
+    reformatted = [{"role": "user", "content": "Rank these candidates "}]
+    assert make_cache_key("m", messages) == make_cache_key("m", reformatted)
+
+
+@pytest.mark.parametrize("change", [
+    {"model": "other-model"},
+    {"messages": [{"role": "user", "content": "Rank these resumes"}]},
+    {"tools": [{"name": "search"}]},
+    {"temperature": 0.7},
+    {"stop": ["\nObservation:"]},
+])
+def test_key_changes_with_model_messages_tools_and_params(change):
+    base = {"model": "m", "messages": [{"role": "user", "content": "Rank these candidates"}]}
+    assert make_cache_key(**base) != make_cache_key(**{**base, **change})
+
+
+def test_key_skips_unset_params():
+    messages = [{"role": "user", "content": "hi"}]
+    assert make_cache_key("m", messages, max_tokens=None) == make_cache_key("m", messages)
+
+
+def test_cache_round_trip_and_stats(cache):
+    assert cache.get("k") is None
+    cache.put("k", "response", "m")
+
+    assert cache.get("k") == "response"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.db"), max_entries=2)
+    cache.put("a", "1")
+    time.sleep(0.01)
+    cache.put("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_cache_expires_entries(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.db"), ttl_seconds=1)
+    cache.put("k", "response")
+    assert cache.get("k") == "response"
+
+    time.sleep(1.1)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_is_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    LLMCache(path).put("k", "response")
+    assert LLMCache(path).get("k") == "response"
+
+
+def test_cached_llm_answers_repeated_calls_from_cache(cache):
+    llm = RecordingLLM()
+    cached = CachedLLM(llm, cache)
+    messages = [{"role": "user", "content": "Parse this resume"}]
+
+    assert cached.call(messages) == "answer 1"
+    assert cached.call(messages) == "answer 1"
+    assert len(llm.calls) == 1
+
+
+def test_cached_llm_passes_stop_words_and_keys_on_them(cache):
+    llm = RecordingLLM()
+    cached = CachedLLM(llm, cache)
+    messages = [{"role": "user", "content": "Parse this resume"}]
+
+    cached.call(messages)
+    # The agent executor sets stop words on the wrapper it was given
+    cached.stop = ["\nObservation:"]
+    assert cached.call(messages) == "answer 2"
+
+    assert llm.calls == [[], ["\nObservation:"]]
+
+
+def test_cached_llm_does_not_cache_tool_executing_calls(cache):
+    llm = RecordingLLM()
+    cached = CachedLLM(llm, cache)
+    messages = [{"role": "user", "content": "Search candidates"}]
+    functions = {"search": lambda query: []}
+
+    cached.call(messages, available_functions=functions)
+    cached.call(messages, available_functions=functions)
+
+    assert len(llm.calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_llm_waits_for_governor_on_miss_only(cache):
+    class CountingGovernor:
+        calls = 0
+
+        def call(self, fn, tokens=0):
+            self.calls += 1
+            return fn()
+
+    governor = CountingGovernor()
+    cached = CachedLLM(RecordingLLM(), cache, governor)
+    messages = [{"role": "user", "content": "Parse this resume"}]
+
+    cached.call(messages)
+    cached.call(messages)
+
+    assert governor.calls == 1
+
+
+@pytest.mark.parametrize("model, provider", [
+    ("anthropic/claude-3-5-sonnet", "anthropic"),
+    ("openai/gpt-4o", "openai"),
+    ("claude-3-5-sonnet", "anthropic"),
+])
+def test_llm_provider(model, provider):
+    assert llm_provider(RecordingLLM(model=model)) == provider
@@ -0,0 +1,130 @@
+import json
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from database.operations import DatabaseOperations
+from database.parquet_export import CorpusExporter, flatten_resume, parse_duration, read_corpus_table
+
+
+def make_resume(name, skills, category="ENGINEERING", **fields):
+    return {
+        "personal_info": {"name": name, "email": None, "location": None},
+        "category": category,
+        "skills": skills,
+        "work_experience": [{"job_title": "Engineer", "company": "Acme", "duration": "2018 - Present",
+                             "responsibilities": ["Build things"]}],
+        "education": [],
+        **fields,
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseOperations(str(tmp_path / "recruiter.db"))
+
+
+@pytest.fixture
+def exporter(tmp_path, db):
+    return CorpusExporter(str(tmp_path / "corpus"), db)
+
+
+def export(exporter):
+    # Rows updated in the current second are left for the next run
+    time.sleep(1.1)
+    return exporter.export()
+
+
+def test_parse_duration():
+    assert parse_duration("2015-2020", 2026) == (2015, 2020, False)
+    assert parse_duration("Jan 2018 - Present", 2026) == (2018, 2026, True)
+    assert parse_duration("three years", 2026) == (None, None, False)
+    assert parse_duration(None, 2026) == (None, None, False)
+
+
+def test_flatten_resume_sanitizes_category_and_types():
+    rows = flatten_resume("r1", make_resume("Ada", ["Python ", "python"], category="IT/Software",
+                                            years_of_experience="5"), "2026-01-01 00:00:00", "run", 2026)
+
+    resume = rows["resumes"][0]
+    assert resume["category"] == "IT-Software"
+    assert resume["years_of_experience"] is None
+    assert [s["skill_normalized"] for s in rows["skills"]] == ["python", "python"]
+    assert rows["experience"][0]["is_current"] is True
+
+
+def test_two_runs_append_only_updated_resumes(db, exporter):
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python"])))
+    db.save_resume_data("r2", json.dumps(make_resume("Grace", ["COBOL"], category="FINANCE")))
+    first = export(exporter)
+    assert first["resumes"] == 2
+
+    db.save_resume_data("r2", json.dumps(make_resume("Grace", ["COBOL", "Fortran"], category="FINANCE")))
+    second = export(exporter)
+    assert second["resumes"] == 1
+    assert second["rows"]["skills"] == 2
+
+    skills = read_corpus_table(exporter.export_path, "skills", columns=["resume_id", "skill"])
+    assert sorted(map(tuple, skills.values.tolist())) == [("r1", "Python"), ("r2", "COBOL"), ("r2", "Fortran")]
+    assert read_corpus_table(exporter.export_path, "resumes", latest_only=False).shape[0] == 3
+
+    assert export(exporter)["resumes"] == 0
+
+
+def test_column_empty_in_first_run_reads_with_values_in_second(db, exporter):
+    # Every email is None in the first run, so an inferred type would be null
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python"])))
+    export(exporter)
+
+    resume = make_resume("Grace", ["COBOL"])
+    resume["personal_info"]["email"] = "grace@example.com"
+    db.save_resume_data("r2", json.dumps(resume))
+    export(exporter)
+
+    resumes = read_corpus_table(exporter.export_path, "resumes", columns=["resume_id", "email"])
+    emails = dict(zip(resumes["resume_id"], resumes["email"]))
+    assert emails["r2"] == "grace@example.com"
+    assert pd.isna(emails["r1"])
+
+
+def test_reexport_without_skills_drops_previous_skills(db, exporter):
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python", "SQL"])))
+    db.save_resume_data("r2", json.dumps(make_resume("Grace", ["COBOL"])))
+    export(exporter)
+
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", [])))
+    export(exporter)
+
+    skills = read_corpus_table(exporter.export_path, "skills", columns=["resume_id", "skill"])
+    assert skills["resume_id"].tolist() == ["r2"]
+
+
+def test_filters_prune_categories(db, exporter):
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python"])))
+    db.save_resume_data("r2", json.dumps(make_resume("Grace", ["COBOL"], category="FINANCE")))
+    export(exporter)
+
+    skills = read_corpus_table(exporter.export_path, "skills", columns=["skill"],
+                               filters=[("category", "=", "FINANCE")])
+    assert skills["skill"].tolist() == ["COBOL"]
+
+
+def test_full_export_rebuilds(db, exporter):
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python"])))
+    export(exporter)
+    db.save_resume_data("r1", json.dumps(make_resume("Ada", ["Python", "Go"])))
+    export(exporter)
+
+    result = exporter.export(full=True)
+
+    assert result["resumes"] == 1
+    resumes = read_corpus_table(exporter.export_path, "resumes", latest_only=False)
+    assert resumes["resume_id"].tolist() == ["r1"]
+
+
+def test_unknown_table(tmp_path):
+    with pytest.raises(ValueError):
+        read_corpus_table(str(tmp_path), "education")
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from agents.ingest_benchmark import _build_agent
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+
+
+@pytest.fixture
+def parsed_dir(tmp_path):
+    directory = tmp_path / "legacy_parsed"
+    directory.mkdir()
+    (directory / "r1.json").write_text(json.dumps({"category": "ENGINEERING", "skills": ["Python"]}))
+    (directory / "r2.json").write_text(json.dumps({"category": "DESIGNER", "skills": ["Figma"]}))
+    (directory / "notes.txt").write_text("not a resume")
+    return directory
+
+
+def test_agent_construction_does_not_migrate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "parsed_resumes").mkdir()
+    (tmp_path / "parsed_resumes" / "r1.json").write_text("{}")
+
+    _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+
+    assert (tmp_path / "parsed_resumes" / "r1.json").exists()
+
+
+def test_migration_imports_files_once(agent, parsed_dir):
+    assert agent.migrate_parsed_resume_files(str(parsed_dir)) == 2
+
+    assert json.loads(agent.db.get_resume_document("r2"))["skills"] == ["Figma"]
+    assert not parsed_dir.exists()
+    assert (parsed_dir.parent / "legacy_parsed.migrated" / "r1.json").exists()
+    assert agent.migrate_parsed_resume_files(str(parsed_dir)) == 0
+
+
+def test_migration_keeps_existing_rows(agent, parsed_dir):
+    agent.db.save_resume_data("r1", json.dumps({"category": "ENGINEERING", "skills": ["Rust"]}))
+
+    assert agent.migrate_parsed_resume_files(str(parsed_dir)) == 1
+    assert json.loads(agent.db.get_resume_document("r1"))["skills"] == ["Rust"]
@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.query_embedding_cache import QueryEmbeddingCache, normalize_query, query_cache_key
+
+
+class CountingEmbedder:
+    def __init__(self, delay: threading.Event = None):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, query):
+        self.calls.append(query)
+        if self.delay is not None:
+            self.delay.wait(5)
+        return [float(len(query)), 1.0]
+
+
+def test_normalize_query():
+    assert normalize_query("  Senior   Python\nEngineer ") == "senior python engineer"
+
+
+def test_key_depends_on_provider_model_and_normalized_text():
+    key = query_cache_key("openai", "text-embedding-3-small", "Senior Python Engineer")
+    assert key == query_cache_key("openai", "text-embedding-3-small", " senior  python engineer")
+    assert key != query_cache_key("anthropic", "text-embedding-3-small", "Senior Python Engineer")
+    assert key != query_cache_key("openai", "text-embedding-3-large", "Senior Python Engineer")
+    assert key != query_cache_key("openai", "text-embedding-3-small", "Senior Java Engineer")
+
+
+def test_reformatted_query_hits_memory():
+    cache = QueryEmbeddingCache(max_entries=10)
+    embed = CountingEmbedder()
+
+    first = cache.get_or_embed("openai", "m", "Senior Python Engineer", embed)
+    second = cache.get_or_embed("openai", "m", "senior python  engineer", embed)
+
+    assert first == second
+    assert len(embed.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_model_change_misses():
+    cache = QueryEmbeddingCache(max_entries=10)
+    embed = CountingEmbedder()
+
+    cache.get_or_embed("openai", "small", "python", embed)
+    cache.get_or_embed("openai", "large", "python", embed)
+
+    assert len(embed.calls) == 2
+
+
+def test_memory_is_bounded():
+    cache = QueryEmbeddingCache(max_entries=2)
+    embed = CountingEmbedder()
+    for query in ["a", "b", "c", "a"]:
+        cache.get_or_embed("p", "m", query, embed)
+
+    assert embed.calls == ["a", "b", "c", "a"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_vectors_survive_restart(tmp_path):
+    path = str(tmp_path / "query_embeddings.db")
+    embed = CountingEmbedder()
+    QueryEmbeddingCache(path=path).get_or_embed("p", "m", "python", embed)
+
+    restarted = QueryEmbeddingCache(path=path)
+    assert restarted.get_or_embed("p", "m", "Python", embed) == [6.0, 1.0]
+    assert len(embed.calls) == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_concurrent_misses_share_one_call():
+    cache = QueryEmbeddingCache()
+    release = threading.Event()
+    embed = CountingEmbedder(delay=release)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get_or_embed, "p", "m", "python", embed) for _ in range(4)]
+        while cache.stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(embed.calls) == 1
+    assert all(r == [6.0, 1.0] for r in results)
+
+
+def test_failed_embedding_is_not_cached():
+    cache = QueryEmbeddingCache()
+
+    def fail(query):
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_embed("p", "m", "python", fail)
+
+    embed = CountingEmbedder()
+    assert cache.get_or_embed("p", "m", "python", embed) == [6.0, 1.0]
+    assert len(embed.calls) == 1
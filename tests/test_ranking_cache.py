@@ -0,0 +1,100 @@
+import pytest
+
+from database.operations import DatabaseOperations, job_description_hash
+from utils.ranking_cache import RankingCache, ranking_cache_key
+
+RANKING = {"candidates": [{"resume_id": "r1", "score": 0.9}]}
+
+
+def test_job_description_hash_ignores_formatting():
+    assert job_description_hash("Senior  Python\nEngineer") == job_description_hash("senior python engineer ")
+    assert job_description_hash("Senior Python Engineer") != job_description_hash("Senior Java Engineer")
+
+
+def test_key_depends_on_title_model_and_filters():
+    key = ranking_cache_key("jd", "Backend  Engineer", "claude")
+    assert key == ranking_cache_key("jd", "Backend Engineer", "claude")
+    assert key == ranking_cache_key("jd", "Backend Engineer", "claude", filters={})
+    assert key != ranking_cache_key("jd2", "Backend Engineer", "claude")
+    assert key != ranking_cache_key("jd", "Frontend Engineer", "claude")
+    assert key != ranking_cache_key("jd", "Backend Engineer", "gpt-4o")
+    assert key != ranking_cache_key("jd", "Backend Engineer", "claude", filters={"location": "berlin"})
+
+
+def test_filter_order_does_not_change_key():
+    a = ranking_cache_key("jd", "t", "m", filters={"location": "berlin", "min_years": 3})
+    b = ranking_cache_key("jd", "t", "m", filters={"min_years": 3, "location": "berlin"})
+    assert a == b
+
+
+def test_hit_for_same_corpus_version():
+    cache = RankingCache()
+    cache.put("k", 1, RANKING)
+
+    assert cache.get("k", 1) == RANKING
+    assert cache.stats()["hits"] == 1
+
+
+def test_newer_corpus_version_invalidates(tmp_path):
+    cache = RankingCache(path=str(tmp_path / "ranking_cache.db"))
+    cache.put("k", 1, RANKING)
+
+    assert cache.get("k", 2) is None
+    stats = cache.stats()
+    assert stats["invalidated"] == 1
+    assert stats["entries"] == 0
+    assert stats["disk_entries"] == 0
+    # Going back to the old version does not resurrect the entry
+    assert cache.get("k", 1) is None
+
+
+def test_older_run_does_not_replace_newer_ranking(tmp_path):
+    path = str(tmp_path / "ranking_cache.db")
+    cache = RankingCache(path=path)
+    newer = {"candidates": []}
+    cache.put("k", 2, newer)
+    cache.put("k", 1, RANKING)
+
+    assert cache.get("k", 2) == newer
+    # Another process with an empty memory LRU must not overwrite the file either
+    RankingCache(path=path).put("k", 1, RANKING)
+    assert RankingCache(path=path).get("k", 2) == newer
+
+
+def test_rankings_survive_restart(tmp_path):
+    path = str(tmp_path / "ranking_cache.db")
+    RankingCache(path=path).put("k", 3, RANKING, model="claude", job_title="Engineer")
+
+    restarted = RankingCache(path=path)
+    assert restarted.get("k", 3) == RANKING
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_memory_is_bounded():
+    cache = RankingCache(max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.put(key, 1, RANKING)
+
+    assert cache.get("a", 1) is None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseOperations(str(tmp_path / "recruiter.db"))
+
+
+def test_corpus_version_bumps(db):
+    version = db.get_corpus_version()
+    assert db.bump_corpus_version() == version + 1
+    assert db.get_corpus_version() == version + 1
+
+
+def test_cached_ranking_is_dropped_after_corpus_change(db):
+    cache = RankingCache()
+    key = ranking_cache_key(job_description_hash("Senior Python Engineer"), "Engineer", "claude")
+    cache.put(key, db.get_corpus_version(), RANKING)
+
+    assert cache.get(key, db.get_corpus_version()) == RANKING
+    db.bump_corpus_version()
+    assert cache.get(key, db.get_corpus_version()) is None
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utils.rate_limiter import RateGovernor, TokenBucket, is_rate_limit_error
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+def wrapped(cause):
+    try:
+        raise RuntimeError("call failed") from cause
+    except RuntimeError as e:
+        return e
+
+
+def test_rate_limit_errors_by_status_or_type():
+    assert is_rate_limit_error(StatusError(429))
+    assert is_rate_limit_error(RateLimitError("slow down"))
+    assert is_rate_limit_error(wrapped(StatusError(429)))
+    assert not is_rate_limit_error(StatusError(500))
+    # The message alone is not enough
+    assert not is_rate_limit_error(ValueError("resume 429 failed to parse"))
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60, bucket.updated) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1, bucket.updated) == pytest.approx(1.0)
+    assert TokenBucket(0).wait_time(1000, 0) == 0
+
+
+def test_rate_limited_call_is_retried_and_halves_concurrency():
+    governor = RateGovernor("test", initial_concurrency=8, max_retries=2)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise StatusError(429, retry_after=0.05)
+        return "ok"
+
+    assert governor.call(call) == "ok"
+    assert len(attempts) == 2
+    stats = governor.stats()
+    assert (stats["rate_limited"], stats["retries"]) == (1, 1)
+    # Halved by the 429, then +1/limit for the successful retry
+    assert stats["concurrency_limit"] == 4.25
+
+
+def test_other_errors_are_not_retried():
+    governor = RateGovernor("test", initial_concurrency=8)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        raise ValueError("429 in a message")
+
+    with pytest.raises(ValueError):
+        governor.call(call)
+    assert len(attempts) == 1
+    assert governor.stats()["concurrency_limit"] == 8
+
+
+def test_retries_are_bounded():
+    governor = RateGovernor("test", max_retries=1)
+
+    def call():
+        raise StatusError(429, retry_after=0.01)
+
+    with pytest.raises(StatusError):
+        governor.call(call)
+    assert governor.stats()["retries"] == 1
+
+
+def test_successful_calls_grow_concurrency():
+    governor = RateGovernor("test", initial_concurrency=2, max_concurrency=3)
+    for _ in range(20):
+        governor.call(lambda: None)
+
+    assert governor.stats()["concurrency_limit"] == 3
+
+
+def test_async_call_retries():
+    governor = RateGovernor("test", max_retries=2)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RateLimitError("slow down")
+        return "ok"
+
+    assert asyncio.run(governor.acall(call)) == "ok"
+    assert len(attempts) == 2
+
+
+def test_concurrency_limit_is_respected():
+    governor = RateGovernor("test", initial_concurrency=2, max_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, governor.in_flight)
+        await asyncio.sleep(0.02)
+
+    async def run():
+        await asyncio.gather(*(governor.acall(call) for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
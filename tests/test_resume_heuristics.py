@@ -0,0 +1,32 @@
+from datetime import date
+
+from utils.resume_heuristics import pre_extract
+
+TODAY = date(2026, 1, 1)
+
+
+def test_years_from_closed_experience_ranges():
+    result = pre_extract("Ada Lovelace\nada@example.com | 555-123-4567\n\n"
+                         "EXPERIENCE\nEngineer, Acme\n2012 - 2016\nLead, Globex\n2016 - 2020\n\n"
+                         "EDUCATION\nBSc Mathematics, University of London, 2008 - 2012\n", TODAY)
+
+    assert result.fields["years_of_experience"] == 8
+    assert result.fields["personal_info"] == {"email": "ada@example.com", "phone": "555-123-4567"}
+    # Degree dates are not experience
+    assert [r.text for r in result.date_ranges] == ["2012 - 2016", "2016 - 2020"]
+
+
+def test_no_experience_section_leaves_years_to_the_llm():
+    result = pre_extract("Ada Lovelace\n\nSUMMARY\nMathematician.\n\n"
+                         "EDUCATION\nBSc Mathematics, University of London, 2008 - 2012\n\n"
+                         "CERTIFICATIONS\nAWS Solutions Architect 2019 - 2022\n", TODAY)
+
+    assert "years_of_experience" not in result.fields
+    assert result.date_ranges == []
+
+
+def test_open_ended_range_leaves_years_to_the_llm():
+    result = pre_extract("Ada Lovelace\n\nEXPERIENCE\nEngineer, Acme\n2016 - Present\n", TODAY)
+
+    assert "years_of_experience" not in result.fields
+    assert [r.is_current for r in result.date_ranges] == [True]
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from agents.ingest_benchmark import _build_agent
+from utils.ranking_cache import ranking_cache_key
+from utils.resume_metadata import (
+    RESUME_METADATA_VERSION,
+    build_where,
+    normalize_category,
+    normalize_filters,
+    resume_metadata,
+    skill_flag,
+)
+
+
+@pytest.mark.parametrize("value, category", [
+    ("ENGINEERING", "ENGINEERING"),
+    ("Software Engineering", "ENGINEERING"),
+    ("UI/UX Design", "DESIGNER"),
+    ("designer", "DESIGNER"),
+    ("Business Developer", "BUSINESS-DEVELOPMENT"),
+    ("business-development", "BUSINESS-DEVELOPMENT"),
+    ("Culinary Arts", None),
+])
+def test_normalize_category(value, category):
+    assert normalize_category(value) == category
+
+
+def test_skill_flag():
+    assert skill_flag("Node.js") == "skill_node_js"
+    assert skill_flag("C++") == "skill_c++"
+    assert skill_flag("  ") == ""
+
+
+def test_resume_metadata_leaves_out_missing_fields():
+    metadata = resume_metadata({
+        "category": "Design",
+        "seniority_level": " Senior ",
+        "years_of_experience": "seven",
+        "skills": ["Figma", "figma", "Adobe XD", 3],
+    })
+
+    assert metadata == {
+        "metadata_version": RESUME_METADATA_VERSION,
+        "category": "DESIGNER",
+        "seniority_level": "senior",
+        "skill_figma": True,
+        "skill_adobe_xd": True,
+    }
+    assert None not in metadata.values()
+
+
+def test_normalize_filters_is_canonical_and_idempotent():
+    filters = normalize_filters({"category": ["design", "DESIGNER"], "seniority_level": "Senior",
+                                 "min_yoe": "3", "skills": ["Python", "python", ""], "max_yoe": None})
+
+    assert filters == {"category": ["DESIGNER"], "seniority_level": ["senior"], "min_yoe": 3,
+                       "skills": ["python"]}
+    assert normalize_filters(filters) == filters
+
+
+def test_equal_filters_share_a_ranking_cache_key():
+    a = normalize_filters({"category": "Design", "skills": ["Figma", "Sketch"]})
+    b = normalize_filters({"skills": ["sketch", "figma"], "category": "DESIGNER"})
+    assert ranking_cache_key("jd", "t", "m", a) == ranking_cache_key("jd", "t", "m", b)
+
+
+@pytest.mark.parametrize("filters", [
+    {"location": "Berlin"},
+    {"category": "Culinary Arts"},
+])
+def test_normalize_filters_rejects_unknown(filters):
+    with pytest.raises(ValueError):
+        normalize_filters(filters)
+
+
+def test_build_where():
+    assert build_where(None) is None
+    assert build_where({"category": "", "skills": []}) is None
+    assert build_where({"category": "Design"}) == {"category": "DESIGNER"}
+    assert build_where({"category": ["Design", "Engineering"], "min_yoe": 3, "max_yoe": 8,
+                        "skills": ["Python"]}) == {"$and": [
+        {"category": {"$in": ["DESIGNER", "ENGINEERING"]}},
+        {"years_of_experience": {"$gte": 3}},
+        {"years_of_experience": {"$lte": 8}},
+        {"skill_python": True},
+    ]}
+
+
+def test_backfill_rewrites_stale_metadata_and_keeps_vector(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = _build_agent(str(tmp_path), "stub", "stub", 0, 0)
+    resume = {"category": "Design", "skills": ["Figma"], "years_of_experience": 4}
+    agent.db.save_resume_data("r1", json.dumps(resume))
+    # Stored by an older version, with a skill the resume no longer lists
+    agent.collection.add(ids=["r1"], embeddings=[[0.5] * 8], documents=["r1"],
+                         metadatas=[{"metadata_version": 1, "skill_sketch": True, "embedding_text_version": 1}])
+
+    assert agent.backfill_embedding_metadata() == 1
+
+    stored = agent.collection.get(ids=["r1"], include=["metadatas", "embeddings"])
+    assert stored["metadatas"][0] == {**resume_metadata(resume), "embedding_text_version": 1}
+    assert list(stored["embeddings"][0]) == pytest.approx([0.5] * 8)
+    assert agent.backfill_embedding_metadata() == 0
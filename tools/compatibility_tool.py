@@ -1,8 +1,8 @@
 # tools/compatibility_tool.py
 from crewai_tools import BaseTool
-from database.operations import DatabaseOperations
+from database.operations import DatabaseOperations, job_description_hash
 from utils.embeddings import calculate_similarity
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 class CompatibilityTool(BaseTool):
@@ -15,6 +15,9 @@ class CompatibilityTool(BaseTool):
 
     def _run(self, job_description: str) -> Dict[str, List]:
         candidates = self.db.get_parsed_resumes()
+        # Skills and experience range from the stored analysis of this posting,
+        # if the candidate matcher has analyzed it
+        requirement = self.db.get_job_requirement(job_description_hash(job_description))
 
         rankings = {
             'highly_desirable': [],
@@ -25,7 +28,7 @@ class CompatibilityTool(BaseTool):
         }
 
         for candidate in candidates:
-            score = self._calculate_compatibility_score(candidate, job_description)
+            score = self._calculate_compatibility_score(candidate, job_description, requirement)
             category = self._categorize_score(score)
             rankings[category].append({
                 'candidate_id': candidate.candidate_id,
@@ -38,25 +41,28 @@ class CompatibilityTool(BaseTool):
 
         return rankings
 
-    def _calculate_compatibility_score(self, candidate, job_description: str) -> float:
+    def _calculate_compatibility_score(self, candidate, job_description: str, requirement=None) -> float:
         # Combine semantic and quantitative scoring
         semantic_score = calculate_similarity(candidate.raw_text, job_description)
-        skill_score = self._calculate_skill_match(candidate.skills, job_description)
-        yoe_score = self._calculate_yoe_score(candidate.yoe)
+        skill_score = self._calculate_skill_match(candidate.skills, job_description,
+                                                  requirement.required_skills if requirement else None)
+        yoe_score = self._calculate_yoe_score(candidate.yoe, requirement.min_yoe if requirement else None)
 
         return (semantic_score * 0.4 + skill_score * 0.4 + yoe_score * 0.2)
 
-    def _calculate_skill_match(self, candidate_skills: List[str], job_description: str) -> float:
-        # Mock skill matching logic
-        job_keywords = ['python', 'django', 'react', 'postgresql']
+    def _calculate_skill_match(self, candidate_skills: List[str], job_description: str,
+                               required_skills: Optional[List[str]] = None) -> float:
+        # Mock skill matching logic unless the posting has been analyzed
+        job_keywords = [skill.lower() for skill in required_skills or []] or ['python', 'django', 'react', 'postgresql']
         matches = sum(1 for skill in candidate_skills if skill.lower() in job_keywords)
         return matches / len(job_keywords)
 
-    def _calculate_yoe_score(self, yoe: int) -> float:
-        # Mock YOE scoring (5+ years preferred)
-        if yoe >= 5:
+    def _calculate_yoe_score(self, yoe: int, min_yoe: Optional[int] = None) -> float:
+        # Mock YOE scoring (5+ years preferred) unless the posting states a minimum
+        preferred = min_yoe if min_yoe else 5
+        if yoe >= preferred:
             return 1.0
-        return yoe / 5.0
+        return yoe / preferred
 
     def _categorize_score(self, score: float) -> str:
         if score >= 0.8:
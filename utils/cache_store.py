@@ -0,0 +1,170 @@
+# utils/cache_store.py
+"""
+Storage shared by the caches in utils: a bounded in-memory LRU and a SQLite
+table of entries with least-recently-used eviction.
+
+Each cache (LLM responses, query embeddings, candidate rankings) decides
+what it keys on and when an entry is valid; these classes only hold the
+entries:
+
+    memory = MemoryLRU(1024)
+    disk = SQLiteCacheStore("query_embeddings.db", "query_embeddings",
+                            {"model": "TEXT", "embedding": "TEXT NOT NULL"}, max_entries=50000)
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class MemoryLRU:
+    """Least-recently-used mapping bounded to max_entries. Not thread-safe: callers hold their own lock."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.evictions = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The value stored for the key, marked as most recently used."""
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """The value stored for the key, without touching its recency."""
+        return self._entries.get(key, default)
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        return self._entries.pop(key, default)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SQLiteCacheStore:
+    """One SQLite table of cache entries, keyed by `key`, bounded by LRU eviction and an optional TTL.
+
+    `columns` maps the stored fields to their SQL types; the table also has
+    created_at and last_accessed_at (epoch seconds), plus hit_count when
+    `track_hits` is set. A connection is opened per call, so one store can be
+    shared by threads and the file by processes.
+    """
+
+    def __init__(self, path: str, table: str, columns: Dict[str, str], max_entries: int = 0,
+                 ttl_seconds: int = 0, track_hits: bool = False):
+        self.path = path
+        self.table = table
+        self.columns = list(columns)
+        # 0 disables the bound
+        self.max_entries = max_entries
+        # 0 keeps entries until they are evicted by the size bound
+        self.ttl_seconds = ttl_seconds
+        self.track_hits = track_hits
+        self._init_db(columns)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self, columns: Dict[str, str]):
+        definitions = ",\n".join(f"{name} {definition}" for name, definition in columns.items())
+        hit_count = ",\nhit_count INTEGER DEFAULT 0" if self.track_hits else ""
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                {definitions},
+                created_at REAL NOT NULL,
+                last_accessed_at REAL NOT NULL{hit_count}
+            )
+        ''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_lru ON {self.table}(last_accessed_at)')
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str) -> Optional[sqlite3.Row]:
+        """The stored row, marked as recently used; None if absent or expired (expired rows are deleted)."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(f'SELECT * FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row['created_at'] > self.ttl_seconds:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+                return None
+            if row is None:
+                return None
+            hit_count = ", hit_count = hit_count + 1" if self.track_hits else ""
+            conn.execute(f'UPDATE {self.table} SET last_accessed_at = ?{hit_count} WHERE key = ?', (now, key))
+            conn.commit()
+        finally:
+            conn.close()
+        return row
+
+    def put(self, key: str, values: Dict[str, Any], replace_if: str = None):
+        """Store an entry and evict the least recently used ones over the bound.
+
+        An existing entry is replaced only when the `replace_if` SQL condition
+        holds; it can compare `excluded.<column>` (the new values) with the
+        stored columns.
+        """
+        now = time.time()
+        names = [name for name in self.columns if name in values]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in [*names, "created_at", "last_accessed_at"])
+        if self.track_hits:
+            updates += ", hit_count = 0"
+        conn = self._connect()
+        try:
+            conn.execute(f'''
+                INSERT INTO {self.table} (key, {", ".join(names)}, created_at, last_accessed_at)
+                VALUES ({", ".join("?" * (len(names) + 3))})
+                ON CONFLICT(key) DO UPDATE SET {updates}
+                {f"WHERE {replace_if}" if replace_if else ""}
+            ''', (key, *[values[name] for name in names], now, now))
+            if self.max_entries:
+                conn.execute(f'''
+                    DELETE FROM {self.table} WHERE key IN (
+                        SELECT key FROM {self.table} ORDER BY last_accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, key: str, condition: str = None, params: tuple = ()):
+        """Delete the entry, or only if it also matches the SQL `condition` (with `params`)."""
+        conn = self._connect()
+        conn.execute(f'DELETE FROM {self.table} WHERE key = ?{f" AND ({condition})" if condition else ""}',
+                     (key, *params))
+        conn.commit()
+        conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute(f'DELETE FROM {self.table}')
+        conn.commit()
+        conn.close()
+
+    def count(self) -> int:
+        conn = self._connect()
+        entries = conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        conn.close()
+        return entries
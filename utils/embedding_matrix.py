@@ -0,0 +1,250 @@
+# utils/embedding_matrix.py
+"""
+Compact, memory-mapped copy of the resume embeddings.
+
+Chroma keeps vectors inside its HNSW index, so analytical scans (batch
+matching, candidate-to-candidate similarity, re-ranking) would otherwise
+materialize Python float lists through collection.get/query. EmbeddingMatrix
+stores the same vectors L2-normalized and quantized to float16 (half the
+size of float32) or int8 (a quarter, plus one float32 scale per row) in a
+flat file that NumPy maps zero-copy. An id -> row index sits next to it.
+
+Layout of a matrix directory:
+    meta.json    dim, dtype, row count and the row ids in order
+    vectors.bin  rows x dim values (capacity grows by doubling)
+    scales.bin   per-row dequantization scale (int8 only)
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+MATRIX_DTYPES = ("float16", "int8")
+_INITIAL_CAPACITY = 1024
+# Rows dequantized per step while scoring, bounding the float32 working set
+_SCORE_BLOCK_ROWS = 8192
+
+
+class EmbeddingMatrix:
+    """Quantized id-addressed embedding matrix backed by np.memmap."""
+
+    def __init__(self, path: str, dtype: str = "float16"):
+        if dtype not in MATRIX_DTYPES:
+            raise ValueError(f"Unknown embedding matrix dtype '{dtype}'. Choose one of: {', '.join(MATRIX_DTYPES)}")
+        self.path = path
+        self.dtype = dtype
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._capacity = 0
+        self._vectors = None
+        self._scales = None
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # -- storage ---------------------------------------------------------
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta["dtype"] != self.dtype:
+            raise ValueError(f"{self.path} holds {meta['dtype']} vectors, not {self.dtype}; rebuild it to switch")
+        self.dim = meta["dim"]
+        self.ids = meta["ids"]
+        self.index = {resume_id: row for row, resume_id in enumerate(self.ids)}
+        if self.dim is not None and meta["capacity"]:
+            self._map(meta["capacity"])
+
+    def reload(self):
+        """Pick up rows written by another process."""
+        with self._lock:
+            self._load()
+
+    def _map(self, capacity: int):
+        """(Re)map the data files at `capacity` rows, growing them if needed."""
+        self._vectors = self._scales = None
+        files = [("vectors.bin", self.dtype, (capacity, self.dim))]
+        if self.dtype == "int8":
+            files.append(("scales.bin", "float32", (capacity,)))
+        mapped = []
+        for name, dtype, shape in files:
+            file_path = os.path.join(self.path, name)
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            with open(file_path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            mapped.append(np.memmap(file_path, dtype=dtype, mode="r+", shape=shape))
+        self._vectors = mapped[0]
+        self._scales = mapped[1] if len(mapped) > 1 else None
+        self._capacity = capacity
+
+    def _save_meta(self):
+        meta = {"dim": self.dim, "dtype": self.dtype, "capacity": self._capacity,
+                "rows": len(self.ids), "ids": self.ids}
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _quantize(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        if self.dtype == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    # -- writes ----------------------------------------------------------
+
+    def upsert(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """Insert or overwrite rows for `ids` and flush them to disk."""
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match matrix dimension {self.dim}")
+
+            rows = []
+            for resume_id in ids:
+                row = self.index.get(resume_id)
+                if row is None:
+                    row = len(self.ids)
+                    self.ids.append(resume_id)
+                    self.index[resume_id] = row
+                rows.append(row)
+            if len(self.ids) > self._capacity:
+                capacity = max(self._capacity, _INITIAL_CAPACITY)
+                while capacity < len(self.ids):
+                    capacity *= 2
+                self._map(capacity)
+
+            quantized, scales = self._quantize(vectors)
+            self._vectors[rows] = quantized
+            self._vectors.flush()
+            if scales is not None:
+                self._scales[rows] = scales
+                self._scales.flush()
+            self._save_meta()
+
+    def delete(self, ids: Sequence[str]):
+        """Remove rows, moving the last row into each freed slot."""
+        with self._lock:
+            for resume_id in ids:
+                row = self.index.pop(resume_id, None)
+                if row is None:
+                    continue
+                last = len(self.ids) - 1
+                if row != last:
+                    moved = self.ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    if self._scales is not None:
+                        self._scales[row] = self._scales[last]
+                    self.ids[row] = moved
+                    self.index[moved] = row
+                self.ids.pop()
+            if self._vectors is not None:
+                self._vectors.flush()
+                if self._scales is not None:
+                    self._scales.flush()
+            self._save_meta()
+
+    def clear(self):
+        with self._lock:
+            self.ids, self.index = [], {}
+            self.dim, self._vectors, self._scales, self._capacity = None, None, None, 0
+            self._save_meta()
+
+    # -- reads -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self.index
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Zero-copy view of the stored (quantized) rows."""
+        if self._vectors is None:
+            return np.empty((0, self.dim or 0), dtype=self.dtype)
+        return self._vectors[:len(self.ids)]
+
+    def vectors(self, ids: Sequence[str] = None) -> np.ndarray:
+        """Dequantized float32 unit vectors for `ids` (all rows by default)."""
+        if ids is None:
+            rows = slice(0, len(self.ids))
+        else:
+            rows = [self.index[resume_id] for resume_id in ids]
+        if self._vectors is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        vectors = self._vectors[rows].astype(np.float32)
+        if self._scales is not None:
+            vectors *= self._scales[rows][:, None]
+        return vectors
+
+    def scores(self, query: Sequence[float], ids: Sequence[str] = None) -> np.ndarray:
+        """Cosine similarity of `query` against every row (or just `ids`)."""
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+        if ids is None:
+            rows = slice(0, len(self.ids))
+        else:
+            rows = [self.index[resume_id] for resume_id in ids]
+        if self._vectors is None:
+            return np.empty(0, dtype=np.float32)
+        vectors = self._vectors[rows]
+        scales = self._scales[rows] if self._scales is not None else None
+        scores = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), _SCORE_BLOCK_ROWS):
+            end = start + _SCORE_BLOCK_ROWS
+            scores[start:end] = vectors[start:end].astype(np.float32) @ query
+        if scales is not None:
+            scores *= scales
+        return scores
+
+    def top_k(self, query: Sequence[float], k: int = 10) -> List[Tuple[str, float]]:
+        """The k most similar rows as (id, cosine similarity), best first."""
+        scores = self.scores(query)
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[row], float(scores[row])) for row in best]
+
+    def similarity_matrix(self, ids: Sequence[str] = None) -> np.ndarray:
+        """Pairwise cosine similarity between the given rows (all by default)."""
+        vectors = self.vectors(ids)
+        return vectors @ vectors.T
+
+    def nbytes(self) -> int:
+        """Bytes used by the live rows (vectors plus int8 scales)."""
+        size = len(self.ids) * (self.dim or 0) * np.dtype(self.dtype).itemsize
+        if self.dtype == "int8":
+            size += len(self.ids) * 4
+        return size
+
+    def sync_from_collection(self, collection, batch_size: int = 1000) -> int:
+        """Rebuild the matrix from every vector stored in a Chroma collection."""
+        with self._lock:
+            self.clear()
+            total = collection.count()
+            for offset in range(0, total, batch_size):
+                batch = collection.get(include=["embeddings"], limit=batch_size, offset=offset)
+                self.upsert(batch["ids"], batch["embeddings"])
+            return len(self.ids)
@@ -0,0 +1,178 @@
+# utils/embedding_providers.py
+"""
+Embedding providers shared by ingestion and search.
+
+- voyage: Voyage AI API (default)
+- local: sentence-transformers on CPU; the model is downloaded once into
+  EMBEDDING_MODEL_CACHE_DIR and runs fully offline afterwards
+
+Vectors from different models are not comparable, so every provider/model
+pair gets its own Chroma collection. Switching providers therefore needs a
+re-ingest (or `--rebuild-embeddings`) into the new collection.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pydantic_settings import BaseSettings
+
+from utils.embeddings import estimate_tokens
+from utils.rate_limiter import get_rate_governor
+
+
+EMBEDDING_PROVIDERS = ("voyage", "local")
+
+
+class EmbeddingProviderSettings(BaseSettings):
+    """Embedding provider settings from environment variables."""
+    embedding_provider: str = "voyage"
+    voyage_api_key: str = ""
+    embedding_model: str = "voyage-2"
+    local_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_model_cache_dir: str = "models"
+    local_embedding_device: str = "cpu"
+    local_embedding_batch_size: int = 32
+    local_embedding_workers: int = 2
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+class EmbeddingProvider:
+    """Base class for embedding providers."""
+    name: str = ""
+    model: str = ""
+    # Largest number of texts sent to embed_documents at once
+    max_batch_size: int = 128
+
+    @property
+    def collection_name(self) -> str:
+        slug = re.sub(r"[^a-zA-Z0-9_-]+", "_", self.model).strip("_")
+        return f"resume_embeddings_{self.name}_{slug}"[:63]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+
+class VoyageEmbeddingProvider(EmbeddingProvider):
+    name = "voyage"
+    max_batch_size = 128
+
+    def __init__(self, api_key: str, model: str = "voyage-2"):
+        import voyageai
+        self.client = voyageai.Client(api_key=api_key)
+        self.model = model
+        self.governor = get_rate_governor("voyage")
+
+    @property
+    def collection_name(self) -> str:
+        # Collection created before providers were pluggable
+        return "resume_embeddings"
+
+    def _embed(self, texts: List[str], input_type: str) -> List[List[float]]:
+        def embed():
+            return self.client.embed(texts=texts, model=self.model, input_type=input_type)
+
+        if self.governor is None:
+            return embed().embeddings
+        tokens = sum(estimate_tokens(text) for text in texts)
+        result = self.governor.call(embed, tokens)
+        if getattr(result, "total_tokens", None) is not None:
+            self.governor.settle(tokens, result.total_tokens)
+        return result.embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """sentence-transformers model run on a small thread pool.
+
+    Large batches are split across `workers` threads (the encoder releases
+    the GIL), and concurrent callers share the pool instead of oversubscribing
+    the CPU.
+    """
+    name = "local"
+    max_batch_size = 256
+
+    def __init__(self, model: str = "sentence-transformers/all-MiniLM-L6-v2", cache_dir: str = "models",
+                 device: str = "cpu", batch_size: int = 32, workers: int = 2):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The local embedding provider needs sentence-transformers (pip install sentence-transformers)"
+            ) from e
+        self.model = model
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self._encoder = SentenceTransformer(model, cache_folder=cache_dir, device=device)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="local-embed")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._encoder.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) <= self.batch_size:
+            return self._pool.submit(self._encode, texts).result()
+        chunk = max(self.batch_size, -(-len(texts) // self.workers))
+        futures = [self._pool.submit(self._encode, texts[i:i + chunk]) for i in range(0, len(texts), chunk)]
+        embeddings = []
+        for future in futures:
+            embeddings.extend(future.result())
+        return embeddings
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._pool.submit(self._encode, [text]).result()[0]
+
+
+_providers: Dict[tuple, EmbeddingProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_embedding_provider(**overrides) -> Optional[EmbeddingProvider]:
+    """Return the configured provider, shared process-wide per model.
+
+    Keyword arguments override EmbeddingProviderSettings fields (e.g. an
+    agent's own voyage_api_key). Returns None when Voyage is selected but
+    no API key is configured.
+    """
+    settings = EmbeddingProviderSettings(**{k: v for k, v in overrides.items() if v is not None})
+    if settings.embedding_provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(
+            f"Unknown embedding provider '{settings.embedding_provider}'. Choose one of: {', '.join(EMBEDDING_PROVIDERS)}"
+        )
+
+    if settings.embedding_provider == "voyage":
+        if not settings.voyage_api_key:
+            return None
+        key = ("voyage", settings.embedding_model, settings.voyage_api_key)
+    else:
+        key = ("local", settings.local_embedding_model, settings.local_embedding_device)
+
+    with _providers_lock:
+        if key not in _providers:
+            if settings.embedding_provider == "voyage":
+                _providers[key] = VoyageEmbeddingProvider(settings.voyage_api_key, settings.embedding_model)
+            else:
+                _providers[key] = LocalEmbeddingProvider(
+                    settings.local_embedding_model,
+                    cache_dir=settings.embedding_model_cache_dir,
+                    device=settings.local_embedding_device,
+                    batch_size=settings.local_embedding_batch_size,
+                    workers=settings.local_embedding_workers,
+                )
+        return _providers[key]
@@ -0,0 +1,153 @@
+# utils/embedding_text.py
+"""
+Canonical embedding document for a parsed resume.
+
+Instead of embedding the raw resume JSON (keys, nulls, indentation and
+placeholder contact details), only the high-signal fields are rendered as
+short labeled lines. Each field's weight is its share of the token cap, so
+the fields that matter most for matching always make it into the vector;
+fields with weight 0 are left out. Bump EMBEDDING_TEXT_VERSION whenever the
+rendering changes so stored documents can be found and rebuilt.
+"""
+
+from typing import Callable, Dict, List
+
+from utils.embeddings import estimate_tokens
+
+
+EMBEDDING_TEXT_VERSION = 1
+
+DEFAULT_FIELD_WEIGHTS = {
+    "profile": 1.0,           # category, seniority and years of experience
+    "titles": 2.0,
+    "summary": 2.0,
+    "skills": 3.0,
+    "keywords": 2.0,
+    "responsibilities": 3.0,
+    "education": 0.5,
+    "certifications": 0.5,
+}
+
+DEFAULT_EMBEDDING_TEXT_MAX_TOKENS = 512
+
+
+def _join(values, separator: str = ", ") -> str:
+    return separator.join(str(v).strip() for v in values if v and str(v).strip())
+
+
+def _profile(resume: Dict) -> str:
+    parts = []
+    if resume.get("seniority_level"):
+        parts.append(str(resume["seniority_level"]))
+    if resume.get("category"):
+        parts.append(str(resume["category"]))
+    if resume.get("years_of_experience") is not None:
+        parts.append(f"{resume['years_of_experience']} years of experience")
+    return f"Profile: {_join(parts, ' | ')}" if parts else ""
+
+
+def _titles(resume: Dict) -> str:
+    titles = []
+    for job in resume.get("work_experience") or []:
+        title = (job or {}).get("job_title")
+        if title and title not in titles:
+            titles.append(title)
+    return f"Job titles: {_join(titles, '; ')}" if titles else ""
+
+
+def _summary(resume: Dict) -> str:
+    summary = resume.get("professional_summary")
+    return f"Summary: {summary.strip()}" if summary else ""
+
+
+def _skills(resume: Dict) -> str:
+    skills = resume.get("skills") or []
+    return f"Skills: {_join(skills)}" if skills else ""
+
+
+def _keywords(resume: Dict) -> str:
+    skills = {str(s).lower() for s in resume.get("skills") or []}
+    keywords = [k for k in resume.get("keywords") or [] if str(k).lower() not in skills]
+    return f"Keywords: {_join(keywords)}" if keywords else ""
+
+
+def _responsibilities(resume: Dict) -> str:
+    items = []
+    for job in resume.get("work_experience") or []:
+        job = job or {}
+        if job.get("description"):
+            items.append(job["description"])
+        items.extend(job.get("responsibilities") or [])
+    return f"Responsibilities: {_join(items, '; ')}" if items else ""
+
+
+def _education(resume: Dict) -> str:
+    degrees = []
+    for entry in resume.get("education") or []:
+        entry = entry or {}
+        degree = _join([entry.get("degree"), entry.get("field_of_study")], " in ")
+        if degree:
+            degrees.append(degree)
+    return f"Education: {_join(degrees, '; ')}" if degrees else ""
+
+
+def _certifications(resume: Dict) -> str:
+    names = [(c or {}).get("name") for c in resume.get("certifications") or []]
+    return f"Certifications: {_join(names, '; ')}" if any(names) else ""
+
+
+FIELD_RENDERERS: Dict[str, Callable[[Dict], str]] = {
+    "profile": _profile,
+    "titles": _titles,
+    "summary": _summary,
+    "skills": _skills,
+    "keywords": _keywords,
+    "responsibilities": _responsibilities,
+    "education": _education,
+    "certifications": _certifications,
+}
+
+
+def _cut(text: str, max_tokens: int) -> str:
+    """Trim text to about max_tokens, at a word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max(0, max_tokens * 4)]
+    return cut[:cut.rfind(" ")].rstrip(",; ") if " " in cut else cut
+
+
+def build_embedding_text(resume: Dict, weights: Dict[str, float] = None,
+                         max_tokens: int = DEFAULT_EMBEDDING_TEXT_MAX_TOKENS) -> str:
+    """Render the weighted, token-capped embedding document for a parsed resume.
+
+    Each field first gets its weight's share of `max_tokens`; budget left
+    over by short fields is handed to the remaining ones in weight order.
+    Lines keep a fixed field order so documents stay comparable.
+    """
+    weights = DEFAULT_FIELD_WEIGHTS if weights is None else weights
+    rendered = {name: FIELD_RENDERERS[name](resume) for name, weight in weights.items()
+                if weight > 0 and name in FIELD_RENDERERS}
+    rendered = {name: text for name, text in rendered.items() if text}
+    if not rendered:
+        return ""
+
+    total_weight = sum(weights[name] for name in rendered)
+    shares = {name: max_tokens * weights[name] / total_weight for name in rendered}
+    need = {name: estimate_tokens(text) for name, text in rendered.items()}
+
+    # Redistribute what short fields don't use, heaviest fields first
+    spare = sum(max(0.0, shares[name] - need[name]) for name in rendered)
+    budgets = {name: min(shares[name], need[name]) for name in rendered}
+    for name in sorted(rendered, key=lambda n: -weights[n]):
+        extra = min(spare, need[name] - budgets[name])
+        if extra > 0:
+            budgets[name] += extra
+            spare -= extra
+
+    lines: List[str] = []
+    for name in FIELD_RENDERERS:
+        if name in rendered:
+            line = _cut(rendered[name], int(budgets[name]))
+            if line:
+                lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+# utils/embeddings.py
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch sizing."""
+    return len(text) // 4 + 1
+
+
+class BatchFlushError(Exception):
+    """Raised on a pending embedding when its batch fails to embed or index."""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"{stage} failed: {error}")
+        self.stage = stage  # embed or index
+        self.error = error
+
+
+class _PendingEmbedding:
+    __slots__ = ("item_id", "text", "document", "metadata", "tokens", "future", "enqueued_at")
+
+    def __init__(self, item_id, text, document, metadata, tokens):
+        self.item_id = item_id
+        self.text = text
+        self.document = document
+        self.metadata = metadata
+        self.tokens = tokens
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces individual embedding requests into batched provider calls.
+
+    Pending texts are flushed as one `embed_fn(texts)` call followed by one
+    `sink_fn(ids, embeddings, documents, metadatas)` call (e.g. a single
+    `collection.add`) as soon as the batch hits `max_batch_size` texts,
+    `max_batch_tokens` estimated tokens, or its oldest entry has waited
+    `max_wait` seconds. The wait bound keeps single-upload latency low.
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]],
+                 sink_fn: Optional[Callable] = None, max_batch_size: int = 128,
+                 max_batch_tokens: int = 120_000, max_wait: float = 0.05,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.embed_fn = embed_fn
+        self.sink_fn = sink_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait
+        self.count_tokens = count_tokens
+
+        self._pending: List[_PendingEmbedding] = []
+        self._pending_tokens = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._flusher.start()
+
+    def submit(self, item_id: str, text: str, document: str = None, metadata: dict = None) -> Future:
+        """Queue a text for embedding; the future resolves to its vector once stored."""
+        pending = _PendingEmbedding(item_id, text, document if document is not None else text,
+                                    metadata, self.count_tokens(text))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+            self._pending.append(pending)
+            self._pending_tokens += pending.tokens
+            self._condition.notify()
+        return pending.future
+
+    def embed(self, item_id: str, text: str, document: str = None, metadata: dict = None,
+              timeout: float = None) -> List[float]:
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(item_id, text, document, metadata).result(timeout=timeout)
+
+    def flush(self) -> None:
+        """Flush everything currently pending on the calling thread."""
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._flush_batch(batch)
+
+    def close(self) -> None:
+        """Flush remaining work and stop the background flusher."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+
+    def _batch_ready(self) -> bool:
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.max_batch_size or self._pending_tokens >= self.max_batch_tokens:
+            return True
+        return time.monotonic() - self._pending[0].enqueued_at >= self.max_wait
+
+    def _take_batch(self) -> List[_PendingEmbedding]:
+        """Pop the next batch that fits the size and token limits (caller holds the lock)."""
+        batch = []
+        tokens = 0
+        while self._pending and len(batch) < self.max_batch_size:
+            candidate = self._pending[0]
+            # An oversized single text still goes out, alone
+            if batch and tokens + candidate.tokens > self.max_batch_tokens:
+                break
+            batch.append(self._pending.pop(0))
+            tokens += candidate.tokens
+        self._pending_tokens -= tokens
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._batch_ready():
+                    if self._pending:
+                        remaining = self.max_wait - (time.monotonic() - self._pending[0].enqueued_at)
+                        self._condition.wait(timeout=max(remaining, 0.001))
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                batch = self._take_batch()
+            self._flush_batch(batch)
+
+    def _flush_batch(self, batch: Sequence[_PendingEmbedding]) -> None:
+        try:
+            embeddings = self.embed_fn([p.text for p in batch])
+            if len(embeddings) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            self._fail(batch, BatchFlushError("embed", e))
+            return
+
+        if self.sink_fn is not None:
+            try:
+                metadatas = [p.metadata for p in batch]
+                self.sink_fn(
+                    [p.item_id for p in batch],
+                    embeddings,
+                    [p.document for p in batch],
+                    metadatas if any(m for m in metadatas) else None,
+                )
+            except Exception as e:
+                self._fail(batch, BatchFlushError("index", e))
+                return
+
+        for pending, embedding in zip(batch, embeddings):
+            pending.future.set_result(embedding)
+
+    @staticmethod
+    def _fail(batch: Sequence[_PendingEmbedding], error: Exception) -> None:
+        for pending in batch:
+            pending.future.set_exception(error)
@@ -0,0 +1,119 @@
+# utils/hybrid_retrieval.py
+"""
+Hybrid lexical + vector candidate retrieval.
+
+Embedding search misses exact skill names ("Cinema 4D", "InDesign") that a
+recruiter's query hinges on, while BM25 over resume_fts finds them but not
+paraphrases. Both queries run concurrently and their rankings are merged
+with reciprocal rank fusion: a resume scores sum(1 / (k + rank)) over the
+rankings it appears in, so agreement between the two beats a high rank in
+either alone, and the raw scores (cosine distance vs. BM25) never have to
+be put on one scale.
+
+    retriever = HybridRetriever(collection, db, embed_query)
+    retriever.search("Senior designer Cinema 4D InDesign", n_results=10)
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+
+# Rank offset of reciprocal rank fusion; 60 is the usual choice and damps
+# the difference between the first few ranks
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = DEFAULT_RRF_K) -> List[Tuple[str, float]]:
+    """Fuse id rankings (best first) into one; returns (id, score) best first, ties in first-seen order."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class HybridRetriever:
+    """Retrieve resume ids from ChromaDB (vector) and resume_fts (BM25), optionally fused."""
+
+    def __init__(self, collection, db, embed_query: Callable[[str], List[float]], rrf_k: int = DEFAULT_RRF_K,
+                 pool_size: int = 50):
+        self.collection = collection
+        self.db = db
+        self.embed_query = embed_query
+        self.rrf_k = rrf_k
+        # Candidates taken from each ranking before fusion
+        self.pool_size = pool_size
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lexical-search")
+            return self._executor
+
+    def vector_search(self, query: str, limit: int, where: Dict = None) -> List[Tuple[str, float]]:
+        """(resume_id, cosine similarity) best first"""
+        results = self.collection.query(
+            query_embeddings=[self.embed_query(query)],
+            n_results=limit,
+            where=where,
+            include=["distances"]
+        )
+        return [(resume_id, max(0, 1 - distance))
+                for resume_id, distance in zip(results['ids'][0], results['distances'][0])]
+
+    def lexical_search(self, query: str, limit: int, where: Dict = None) -> List[Tuple[str, float]]:
+        """(resume_id, BM25 score) best first, limited to indexed resumes matching `where`"""
+        # resume_fts is written with resume_data, before the vector is
+        # indexed, and knows nothing of the metadata filters; only resumes
+        # the vector side can also see are searchable. BM25 is over-fetched
+        # until `limit` of them are found or the matches run out.
+        fetch = limit
+        checked = set()
+        searchable = set()
+        while True:
+            hits = self.db.search_resume_text(query, fetch)
+            unchecked = [resume_id for resume_id, _ in hits if resume_id not in checked]
+            if unchecked:
+                searchable.update(self.collection.get(ids=unchecked, where=where, include=[])["ids"])
+                checked.update(unchecked)
+            found = [(resume_id, score) for resume_id, score in hits if resume_id in searchable]
+            if len(found) >= limit or len(hits) < fetch:
+                return found[:limit]
+            fetch *= 4
+
+    def search(self, query: str, n_results: int = 10, where: Dict = None,
+               mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """Top resumes for the query, each with its similarity, BM25 score and ranks (None where absent)."""
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}'. Choose one of: {', '.join(RETRIEVAL_MODES)}")
+        if mode == "vector":
+            return [{"id": resume_id, "score": similarity, "similarity_score": similarity, "vector_rank": rank,
+                     "lexical_score": None, "lexical_rank": None}
+                    for rank, (resume_id, similarity) in enumerate(self.vector_search(query, n_results, where), 1)]
+        if mode == "lexical":
+            return [{"id": resume_id, "score": score, "similarity_score": None, "vector_rank": None,
+                     "lexical_score": score, "lexical_rank": rank}
+                    for rank, (resume_id, score) in enumerate(self.lexical_search(query, n_results, where), 1)]
+
+        pool = max(self.pool_size, n_results)
+        # BM25 runs on a worker while this thread embeds the query and searches Chroma
+        lexical_future = self._get_executor().submit(self.lexical_search, query, pool, where)
+        try:
+            vector_hits = self.vector_search(query, pool, where)
+        finally:
+            lexical_hits = lexical_future.result()
+
+        similarity = dict(vector_hits)
+        vector_rank = {resume_id: rank for rank, (resume_id, _) in enumerate(vector_hits, 1)}
+        lexical_score = dict(lexical_hits)
+        lexical_rank = {resume_id: rank for rank, (resume_id, _) in enumerate(lexical_hits, 1)}
+        fused = reciprocal_rank_fusion([[resume_id for resume_id, _ in vector_hits],
+                                        [resume_id for resume_id, _ in lexical_hits]], self.rrf_k)
+        return [{"id": resume_id, "score": score, "similarity_score": similarity.get(resume_id),
+                 "vector_rank": vector_rank.get(resume_id), "lexical_score": lexical_score.get(resume_id),
+                 "lexical_rank": lexical_rank.get(resume_id)}
+                for resume_id, score in fused[:n_results]]
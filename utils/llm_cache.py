@@ -0,0 +1,207 @@
+# utils/llm_cache.py
+"""
+Disk-backed LLM response cache shared by every agent.
+
+Responses are keyed by a hash of the model, the normalized messages, the
+tools offered and any sampling parameters, and stored in a small SQLite file
+with LRU eviction (bounded entry count) and an optional TTL. One process-wide
+instance is returned by get_llm_cache(); CachedLLM plugs it in front of a
+crewai LLM, and the async ingestion path uses it around direct Anthropic
+calls. Calls that miss the cache go through the provider's rate governor
+(utils.rate_limiter).
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from pydantic_settings import BaseSettings
+
+from utils.cache_store import SQLiteCacheStore
+from utils.embeddings import estimate_tokens
+from utils.rate_limiter import get_rate_governor
+
+
+class LLMCacheSettings(BaseSettings):
+    """LLM cache settings from environment variables."""
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "llm_cache.db"
+    llm_cache_max_entries: int = 10000
+    # 0 keeps entries until they are evicted by the size bound
+    llm_cache_ttl_seconds: int = 0
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace in strings so formatting-only prompt changes still hit."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _describe_tool(tool: Any) -> Any:
+    """A JSON-serializable description of a tool (BaseTool, schema dict or name)."""
+    if isinstance(tool, dict):
+        return {k: _describe_tool(v) for k, v in tool.items()}
+    name = getattr(tool, "name", None)
+    if name is not None:
+        return {"name": name, "description": getattr(tool, "description", "")}
+    return str(tool)
+
+
+def make_cache_key(model: str, messages: Any, tools: List = None, **params) -> str:
+    """SHA-256 over the model, normalized messages, tools and call parameters."""
+    payload = {
+        "model": model,
+        "messages": _normalize(messages),
+        "tools": [_describe_tool(t) for t in tools or []],
+        "params": _normalize({k: v for k, v in params.items() if v is not None}),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response store with LRU/TTL eviction and hit/miss counters."""
+
+    def __init__(self, path: str = "llm_cache.db", max_entries: int = 10000, ttl_seconds: int = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._store = SQLiteCacheStore(path, "llm_cache", {"model": "TEXT", "response": "TEXT NOT NULL"},
+                                       max_entries=max_entries, ttl_seconds=ttl_seconds, track_hits=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or an expired entry."""
+        row = self._store.get(key)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row['response']
+
+    def put(self, key: str, response: str, model: str = None):
+        """Store a response and evict the least recently used entries over the bound."""
+        self._store.put(key, {"model": model, "response": response})
+
+    def clear(self):
+        self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry count."""
+        entries = self._store.count()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """The process-wide cache, or None when LLM_CACHE_ENABLED is off."""
+    global _llm_cache
+    settings = LLMCacheSettings()
+    if not settings.llm_cache_enabled:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache(
+                settings.llm_cache_path,
+                max_entries=settings.llm_cache_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+            )
+    return _llm_cache
+
+
+class CachedLLM(BaseLLM):
+    """A crewai LLM that answers repeated calls from the shared cache.
+
+    Only plain text completions are cached. Calls that execute tools
+    themselves (`available_functions`) or come back as native tool calls
+    always go to the wrapped LLM, since replaying them would skip side
+    effects or lose the result type.
+    Calls that do reach the wrapped LLM wait for the rate governor.
+    """
+
+    def __init__(self, llm: BaseLLM, cache: LLMCache = None, governor=None):
+        super().__init__(model=llm.model, temperature=llm.temperature)
+        self.llm = llm
+        self.cache = cache
+        self.governor = governor
+        self.max_tokens = getattr(llm, "max_tokens", None)
+        # The agent executor adds its stop words here; they are passed on per call
+        self.stop = list(llm.stop or [])
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        cacheable = self.cache is not None and not available_functions
+        key = None
+        if cacheable:
+            key = make_cache_key(self.model, messages, tools, stop=self.stop,
+                                 temperature=self.temperature, max_tokens=self.max_tokens)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        def invoke():
+            self.llm.stop = list(self.stop)
+            return self.llm.call(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                from_task=from_task, from_agent=from_agent,
+            )
+
+        if self.governor is not None:
+            result = self.governor.call(invoke, tokens=estimate_tokens(json.dumps(messages, default=str)))
+        else:
+            result = invoke()
+        if cacheable and isinstance(result, str) and result:
+            self.cache.put(key, result, self.model)
+        return result
+
+    def supports_function_calling(self) -> bool:
+        supports = getattr(self.llm, "supports_function_calling", None)
+        return bool(supports and supports())
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+
+def llm_provider(llm: BaseLLM) -> str:
+    """Provider of a crewai LLM from its model name ("anthropic/claude-..." -> "anthropic")."""
+    model = str(getattr(llm, "model", "") or "")
+    return model.split("/", 1)[0].lower() if "/" in model else "anthropic"
+
+
+def with_llm_cache(llm: BaseLLM) -> BaseLLM:
+    """Put the shared response cache and the provider's rate governor in front of an LLM.
+
+    Returns the LLM unchanged when both are disabled.
+    """
+    cache = get_llm_cache()
+    governor = get_rate_governor(llm_provider(llm))
+    if cache is None and governor is None:
+        return llm
+    return CachedLLM(llm, cache, governor)
@@ -0,0 +1,195 @@
+# utils/prompt_compaction.py
+"""
+Fit resume text into a fixed LLM token budget without losing content.
+
+compact_sections normalizes whitespace, drops page furniture (page numbers
+and header/footer lines repeated across sections) and duplicate lines, then
+either packs the sections into budget-sized chunks for a map-reduce parse or,
+with the "truncate" strategy, keeps the most valuable sections that fit.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+from utils.embeddings import estimate_tokens
+from utils.resume_heuristics import ResumeSection
+
+
+# Lower ranks are kept first when a resume has to be truncated
+SECTION_PRIORITY = {
+    "header": 0,
+    "summary": 1,
+    "experience": 2,
+    "skills": 3,
+    "education": 4,
+    "certifications": 5,
+    "languages": 6,
+    "accomplishments": 7,
+    "additional": 8,
+}
+DEFAULT_SECTION_PRIORITY = 7
+
+OVERFLOW_STRATEGIES = ("map_reduce", "truncate")
+
+# UTF-8 punctuation decoded as cp1252 by some PDF producers
+_MOJIBAKE = {
+    "â€“": "–", "â€”": "—", "â€™": "'", "â€˜": "'", "â€œ": '"', "â€\x9d": '"', "â€¢": "•", "â€‹": "", "Â ": " ", "\u200b": "",
+}
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?[-–]?\s*\d+\s*(?:of\s*\d+)?\s*[-–]?$", re.IGNORECASE)
+_SPACES_RE = re.compile(r"[ \t ]+")
+
+
+@dataclass
+class CompactedResume:
+    """Resume text split into chunks that each fit the token budget."""
+    chunks: List[str] = field(default_factory=list)
+    original_tokens: int = 0
+    tokens: int = 0
+    dropped_tokens: int = 0  # only non-zero with the truncate strategy
+
+    @property
+    def over_budget(self) -> bool:
+        return len(self.chunks) > 1
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines and repair common mojibake."""
+    for broken, fixed in _MOJIBAKE.items():
+        text = text.replace(broken, fixed)
+    lines = [_SPACES_RE.sub(" ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def dedupe_sections(sections: List[ResumeSection]) -> List[ResumeSection]:
+    """Drop page numbers and lines or sections the resume repeats.
+
+    Lines repeated from elsewhere in the resume (page headers/footers,
+    a skills list rendered twice, jobs echoed under "Accomplishments") are
+    kept only at their first occurrence. Experience is exempt so that lines
+    such as "Company Name - City , State" stay with every job.
+    """
+    experience_lines = {line for s in sections if s.label == "experience" for line in s.text.splitlines()}
+    compacted = []
+    seen_lines = set()
+    seen_texts = set()
+    for section in sections:
+        kept = []
+        for line in section.text.splitlines():
+            if _PAGE_NUMBER_RE.match(line):
+                continue
+            if line and section.label != "experience":
+                if line in seen_lines or line in experience_lines:
+                    continue
+                seen_lines.add(line)
+            kept.append(line)
+        text = re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+        if not text or (section.label, text) in seen_texts:
+            continue
+        seen_texts.add((section.label, text))
+        compacted.append(ResumeSection(label=section.label, heading=section.heading, text=text))
+    return compacted
+
+
+def _render(section: ResumeSection) -> str:
+    return f"{section.heading}\n{section.text}" if section.heading else section.text
+
+
+def _split_lines(text: str, budget: int) -> List[str]:
+    """Split text at line boundaries into pieces of at most `budget` tokens."""
+    pieces, current = [], []
+    for line in text.splitlines():
+        if current and estimate_tokens("\n".join(current + [line])) > budget:
+            pieces.append("\n".join(current))
+            current = []
+        # A single line over budget is cut by characters (4 per token)
+        while estimate_tokens(line) > budget:
+            pieces.append(line[:budget * 4])
+            line = line[budget * 4:]
+        current.append(line)
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def _pack(sections: List[ResumeSection], budget: int) -> List[str]:
+    """Pack sections in document order into chunks of at most `budget` tokens."""
+    chunks, current = [], []
+    for section in sections:
+        rendered = _render(section)
+        candidate = "\n\n".join(current + [rendered])
+        if estimate_tokens(candidate) <= budget:
+            current.append(rendered)
+            continue
+        if current:
+            chunks.append("\n\n".join(current))
+            current = []
+        if estimate_tokens(rendered) <= budget:
+            current.append(rendered)
+            continue
+        # Section larger than a whole chunk: continue it across chunks
+        heading = section.heading or section.label.title()
+        pieces = _split_lines(section.text, budget - estimate_tokens(heading) - 4)
+        for i, piece in enumerate(pieces):
+            label = heading if i == 0 else f"{heading} (continued)"
+            current.append(f"{label}\n{piece}")
+            if i < len(pieces) - 1:
+                chunks.append("\n\n".join(current))
+                current = []
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _truncate(sections: List[ResumeSection], budget: int) -> List[str]:
+    """Keep the highest-priority sections that fit, in document order."""
+    ranked = sorted(range(len(sections)),
+                    key=lambda i: (SECTION_PRIORITY.get(sections[i].label, DEFAULT_SECTION_PRIORITY), i))
+    kept = {}
+    remaining = budget
+    for index in ranked:
+        rendered = _render(sections[index])
+        cost = estimate_tokens(rendered) + 1
+        if cost <= remaining:
+            kept[index] = rendered
+            remaining -= cost
+        elif remaining > 16:
+            # Partially fit the first section that overflows, then stop
+            kept[index] = _split_lines(rendered, remaining - 1)[0]
+            break
+        else:
+            break
+    return ["\n\n".join(kept[i] for i in sorted(kept))]
+
+
+def compact_sections(sections: List[ResumeSection], budget: int, strategy: str = "map_reduce") -> CompactedResume:
+    """Normalize, dedupe and fit resume sections to a token budget.
+
+    With "map_reduce" nothing is dropped; over-budget resumes come back as
+    several chunks to be parsed separately. With "truncate" there is always
+    one chunk holding the highest-priority sections that fit.
+    """
+    if strategy not in OVERFLOW_STRATEGIES:
+        raise ValueError(f"Unknown overflow strategy '{strategy}'. Choose one of: {', '.join(OVERFLOW_STRATEGIES)}")
+
+    original_tokens = estimate_tokens("\n\n".join(_render(s) for s in sections))
+    normalized = [ResumeSection(label=s.label, heading=s.heading, text=normalize_text(s.text)) for s in sections]
+    sections = dedupe_sections(normalized)
+    full_text = "\n\n".join(_render(s) for s in sections)
+    tokens = estimate_tokens(full_text)
+
+    if tokens <= budget:
+        chunks = [full_text]
+    elif strategy == "truncate":
+        chunks = _truncate(sections, budget)
+    else:
+        chunks = _pack(sections, budget)
+
+    kept_tokens = sum(estimate_tokens(c) for c in chunks)
+    return CompactedResume(
+        chunks=chunks,
+        original_tokens=original_tokens,
+        tokens=kept_tokens,
+        dropped_tokens=max(0, tokens - kept_tokens) if strategy == "truncate" else 0,
+    )
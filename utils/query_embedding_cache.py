@@ -0,0 +1,158 @@
+# utils/query_embedding_cache.py
+"""
+Cache of search-query embeddings.
+
+The ranking agent often re-issues the same (or a trivially reformatted)
+query within a run, and the same job description is searched again across
+runs. Query vectors are therefore kept in an in-memory LRU keyed by the
+provider, model and normalized query text, backed by an optional SQLite
+file so they survive restarts. Concurrent requests for the same key share
+one provider call instead of each embedding it.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic_settings import BaseSettings
+
+from utils.cache_store import MemoryLRU, SQLiteCacheStore
+
+
+class QueryEmbeddingCacheSettings(BaseSettings):
+    """Query embedding cache settings from environment variables."""
+    query_embedding_cache_enabled: bool = True
+    # Vectors kept in memory
+    query_embedding_cache_size: int = 1024
+    # SQLite file for persistence across restarts; empty keeps the cache in memory only
+    query_embedding_cache_path: str = "query_embeddings.db"
+    query_embedding_cache_max_disk_entries: int = 50000
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used for the cache key."""
+    return " ".join(text.lower().split())
+
+
+def query_cache_key(provider: str, model: str, text: str) -> str:
+    return hashlib.sha256(f"{provider}\0{model}\0{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query vectors with optional SQLite persistence and single-flight misses."""
+
+    def __init__(self, max_entries: int = 1024, path: str = None, max_disk_entries: int = 50000):
+        self.max_entries = max(1, max_entries)
+        self.path = path or None
+        self.max_disk_entries = max_disk_entries
+        self._entries = MemoryLRU(self.max_entries)
+        self._disk = SQLiteCacheStore(
+            self.path, "query_embeddings",
+            {"model": "TEXT", "query": "TEXT", "embedding": "TEXT NOT NULL"},
+            max_entries=max_disk_entries,
+        ) if self.path else None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _load(self, key: str) -> Optional[List[float]]:
+        row = self._disk.get(key) if self._disk else None
+        return json.loads(row['embedding']) if row is not None else None
+
+    def _store(self, key: str, embedding: List[float], model: str, query: str):
+        if self._disk:
+            self._disk.put(key, {"model": model, "query": query, "embedding": json.dumps(embedding)})
+
+    def get_or_embed(self, provider: str, model: str, query: str,
+                     embed: Callable[[str], List[float]]) -> List[float]:
+        """Return the cached vector for the query, calling `embed(query)` at most once per key.
+
+        A caller arriving while the same key is being embedded waits for that
+        call's result (or exception) instead of making its own.
+        """
+        key = query_cache_key(provider, model, query)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries.get(key)
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+        if not owner:
+            return pending.result()
+
+        try:
+            embedding = self._load(key)
+            if embedding is not None:
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                embedding = embed(query)
+                self._store(key, embedding, model, normalize_query(query))
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._entries.put(key, embedding)
+            del self._inflight[key]
+        pending.set_result(embedding)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._disk:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry counts."""
+        disk_entries = self._disk.count() if self._disk else 0
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+            }
+
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> Optional[QueryEmbeddingCache]:
+    """The process-wide cache, or None when QUERY_EMBEDDING_CACHE_ENABLED is off."""
+    global _query_cache
+    settings = QueryEmbeddingCacheSettings()
+    if not settings.query_embedding_cache_enabled:
+        return None
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryEmbeddingCache(
+                settings.query_embedding_cache_size,
+                path=settings.query_embedding_cache_path,
+                max_disk_entries=settings.query_embedding_cache_max_disk_entries,
+            )
+    return _query_cache
@@ -0,0 +1,157 @@
+# utils/ranking_cache.py
+"""
+Cache of complete candidate rankings.
+
+Recruiters re-run the same job description many times a day, and each run
+is an LLM ranking over a retrieval. A ranking only changes when the posting,
+the model or the searchable corpus does, so results are kept under a key of
+the job description hash, job title, model and search filters, tagged with
+the corpus version they were computed against (see
+DatabaseOperations.bump_corpus_version).
+A lookup under a newer corpus version drops the entry instead of serving it.
+
+Entries live in an in-memory LRU backed by an optional SQLite file, so they
+survive restarts; both are bounded in size (see utils.cache_store).
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+
+from utils.cache_store import MemoryLRU, SQLiteCacheStore
+
+
+class RankingCacheSettings(BaseSettings):
+    """Ranking result cache settings from environment variables."""
+    ranking_cache_enabled: bool = True
+    # Rankings kept in memory
+    ranking_cache_size: int = 256
+    # SQLite file for persistence across restarts; empty keeps the cache in memory only
+    ranking_cache_path: str = "ranking_cache.db"
+    ranking_cache_max_disk_entries: int = 5000
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+def ranking_cache_key(jd_hash: str, job_title: str, model: str, filters: Dict[str, Any] = None) -> str:
+    """Key of a ranking; the corpus version is checked separately so old versions can be counted and dropped."""
+    key = f"{jd_hash}\0{' '.join(job_title.split())}\0{model}"
+    if filters:
+        key += f"\0{json.dumps(filters, sort_keys=True)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class RankingCache:
+    """Thread-safe LRU of ranking results, each valid for exactly one corpus version."""
+
+    def __init__(self, max_entries: int = 256, path: str = None, max_disk_entries: int = 5000):
+        self.max_entries = max(1, max_entries)
+        self.path = path or None
+        self.max_disk_entries = max_disk_entries
+        # key -> (corpus_version, result)
+        self._entries = MemoryLRU(self.max_entries)
+        self._disk = SQLiteCacheStore(
+            self.path, "ranking_results",
+            {"corpus_version": "INTEGER NOT NULL", "model": "TEXT", "job_title": "TEXT", "result": "TEXT NOT NULL"},
+            max_entries=max_disk_entries,
+        ) if self.path else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    @property
+    def evictions(self) -> int:
+        return self._entries.evictions
+
+    def _load(self, key: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        row = self._disk.get(key) if self._disk else None
+        return (row['corpus_version'], json.loads(row['result'])) if row is not None else None
+
+    def get(self, key: str, corpus_version: int) -> Optional[Dict[str, Any]]:
+        """The ranking stored for the key if it was computed against `corpus_version`."""
+        with self._lock:
+            entry = self._entries.peek(key)
+            if entry is not None and entry[0] == corpus_version:
+                self._entries.get(key)
+                self.hits += 1
+                return entry[1]
+        # Another process may have stored a ranking for the current corpus
+        entry = self._load(key) or entry
+        with self._lock:
+            if entry is not None and entry[0] == corpus_version:
+                self.disk_hits += 1
+                self._entries.put(key, entry)
+                return entry[1]
+            self.misses += 1
+            stale = entry is not None and entry[0] < corpus_version
+            if stale:
+                # Computed against an older corpus: never valid again
+                self.invalidated += 1
+                current = self._entries.peek(key)
+                if current is not None and current[0] < corpus_version:
+                    self._entries.pop(key)
+        if stale and self._disk:
+            self._disk.delete(key, "corpus_version < ?", (corpus_version,))
+        return None
+
+    def put(self, key: str, corpus_version: int, result: Dict[str, Any], model: str = None, job_title: str = None):
+        with self._lock:
+            current = self._entries.peek(key)
+            if current is not None and current[0] > corpus_version:
+                # A slower run over an older corpus must not replace a newer ranking
+                return
+            self._entries.put(key, (corpus_version, result))
+        if self._disk:
+            self._disk.put(key, {"corpus_version": corpus_version, "model": model, "job_title": job_title,
+                                 "result": json.dumps(result)},
+                           replace_if="excluded.corpus_version >= ranking_results.corpus_version")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._disk:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry counts."""
+        disk_entries = self._disk.count() if self._disk else 0
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "invalidated": self.invalidated,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+            }
+
+
+_ranking_cache = None
+_ranking_cache_lock = threading.Lock()
+
+
+def get_ranking_cache() -> Optional[RankingCache]:
+    """The process-wide cache, or None when RANKING_CACHE_ENABLED is off."""
+    global _ranking_cache
+    settings = RankingCacheSettings()
+    if not settings.ranking_cache_enabled:
+        return None
+    with _ranking_cache_lock:
+        if _ranking_cache is None:
+            _ranking_cache = RankingCache(
+                settings.ranking_cache_size,
+                path=settings.ranking_cache_path,
+                max_disk_entries=settings.ranking_cache_max_disk_entries,
+            )
+    return _ranking_cache
@@ -0,0 +1,294 @@
+# utils/rate_limiter.py
+"""
+Process-wide rate governor for external model APIs.
+
+Every Anthropic and Voyage call goes through the RateGovernor for its
+provider, which combines:
+
+- token buckets for requests/min and tokens/min, so bursts from concurrent
+  ingestion and search threads stay under the provider's budgets;
+- an AIMD concurrency limit: +1 slot per window of successful calls,
+  halved on a 429 and trimmed when latency climbs well above its baseline;
+- retries of rate-limited calls after the provider's retry-after (or an
+  exponential backoff), which all waiting callers honour.
+
+Both threads and asyncio tasks can wait on the same governor.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class RateLimitSettings(BaseSettings):
+    """Rate governor settings from environment variables."""
+    rate_limit_enabled: bool = True
+    # Budgets per provider (tokens are input tokens); 0 disables that bucket
+    anthropic_requests_per_minute: int = 50
+    anthropic_tokens_per_minute: int = 40000
+    voyage_requests_per_minute: int = 300
+    voyage_tokens_per_minute: int = 1000000
+    # AIMD concurrency bounds (per provider)
+    rate_limit_initial_concurrency: int = 4
+    rate_limit_max_concurrency: int = 32
+    # Latency (smoothed) above this multiple of the baseline shrinks concurrency
+    rate_limit_latency_tolerance: float = 3.0
+    rate_limit_max_retries: int = 4
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for HTTP 429 / rate-limit errors from the Anthropic, Voyage or litellm clients.
+
+    Decided by the status code or exception type of the error (or the error
+    it was raised from), never by its message, so unrelated failures that
+    mention "429" are neither retried nor counted against the concurrency limit.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        if status == 429:
+            return True
+        if any(cls.__name__ == "RateLimitError" for cls in type(error).__mro__):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a retry-after header, when the error carries a response."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 when it is available now)."""
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        # May go negative when actual usage exceeds the estimate (see settle)
+        if self.rate:
+            self.level -= amount
+
+
+class RateGovernor:
+    """Token buckets plus an AIMD concurrency limit for one provider."""
+
+    def __init__(self, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 initial_concurrency: int = 4, max_concurrency: int = 32,
+                 latency_tolerance: float = 3.0, max_retries: int = 4):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(min(max(1, initial_concurrency), self.max_concurrency))
+        self.latency_tolerance = latency_tolerance
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._consecutive_limited = 0
+        self._latency_fast: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+        self._cond = threading.Condition()
+        self.stats_counters = {"calls": 0, "rate_limited": 0, "retries": 0, "waited_seconds": 0.0}
+
+    # -- admission -------------------------------------------------------
+
+    def _try_enter(self, tokens: int) -> float:
+        """Admit the call (returns 0) or return how long to wait. Caller holds the lock."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= int(self.limit):
+            return 0.05
+        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.in_flight += 1
+        return 0.0
+
+    def _enter(self, tokens: int):
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_enter(tokens)
+                if not wait:
+                    break
+                self._cond.wait(timeout=min(wait, 1.0))
+            self.stats_counters["waited_seconds"] += time.monotonic() - started
+
+    async def _aenter(self, tokens: int):
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_enter(tokens)
+                if not wait:
+                    self.stats_counters["waited_seconds"] += time.monotonic() - started
+                    return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def _exit(self, latency: Optional[float], error: BaseException = None):
+        with self._cond:
+            self.in_flight -= 1
+            self.stats_counters["calls"] += 1
+            now = time.monotonic()
+            if error is not None and is_rate_limit_error(error):
+                self.stats_counters["rate_limited"] += 1
+                if self._decrease(0.5, now):
+                    self._consecutive_limited += 1
+                pause = _retry_after(error) or min(30.0, 0.25 * 2.0 ** (self._consecutive_limited - 1))
+                self._paused_until = max(self._paused_until, now + pause)
+            elif error is None and latency is not None:
+                self._consecutive_limited = 0
+                self._observe_latency(latency, now)
+            self._cond.notify_all()
+
+    # -- AIMD ------------------------------------------------------------
+
+    def _decrease(self, factor: float, now: float) -> bool:
+        # One decrease per round trip at most, so the failures of calls that
+        # were already in flight do not collapse the limit to 1
+        if now - self._last_decrease < max(self._latency_fast or 0.0, 0.05):
+            return False
+        self.limit = max(1.0, self.limit * factor)
+        self._last_decrease = now
+        return True
+
+    def _observe_latency(self, latency: float, now: float):
+        self._latency_fast = latency if self._latency_fast is None else 0.7 * self._latency_fast + 0.3 * latency
+        self._latency_baseline = (latency if self._latency_baseline is None
+                                  else min(self._latency_fast, 0.99 * self._latency_baseline + 0.01 * latency))
+        if self._latency_fast > self.latency_tolerance * self._latency_baseline:
+            self._decrease(0.9, now)
+        else:
+            # Additive increase: about +1 slot per `limit` successful calls
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Charge (or refund) the difference once the real token usage is known."""
+        with self._cond:
+            self.tokens.take(actual_tokens - estimated_tokens)
+
+    # -- call wrappers ---------------------------------------------------
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        """Hold one admitted call for the duration of the block."""
+        self._enter(tokens)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._exit(None, e)
+            raise
+        self._exit(time.monotonic() - started)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        await self._aenter(tokens)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._exit(None, e)
+            raise
+        self._exit(time.monotonic() - started)
+
+    def call(self, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """Run fn under the governor, retrying it when the provider rate-limits."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot(tokens):
+                    return fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+                self.stats_counters["retries"] += 1
+                time.sleep(random.uniform(0, 0.25))
+
+    async def acall(self, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """Await fn() under the governor, retrying it when the provider rate-limits."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.aslot(tokens):
+                    return await fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+                self.stats_counters["retries"] += 1
+                await asyncio.sleep(random.uniform(0, 0.25))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "requests_available": round(self.requests.level, 1),
+                "tokens_available": round(self.tokens.level, 1),
+                "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats_counters.items()},
+            }
+
+
+_governors: Dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_rate_governor(provider: str) -> Optional[RateGovernor]:
+    """The process-wide governor for a provider, or None when RATE_LIMIT_ENABLED is off."""
+    settings = RateLimitSettings()
+    if not settings.rate_limit_enabled:
+        return None
+    with _governors_lock:
+        if provider not in _governors:
+            _governors[provider] = RateGovernor(
+                provider,
+                requests_per_minute=getattr(settings, f"{provider}_requests_per_minute", 0),
+                tokens_per_minute=getattr(settings, f"{provider}_tokens_per_minute", 0),
+                initial_concurrency=settings.rate_limit_initial_concurrency,
+                max_concurrency=settings.rate_limit_max_concurrency,
+                latency_tolerance=settings.rate_limit_latency_tolerance,
+                max_retries=settings.rate_limit_max_retries,
+            )
+        return _governors[provider]
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    with _governors_lock:
+        governors = list(_governors.values())
+    return {governor.name: governor.stats() for governor in governors}
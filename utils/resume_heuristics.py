@@ -0,0 +1,305 @@
+# utils/resume_heuristics.py
+"""
+Deterministic, rule-based resume pre-extraction.
+
+Fills the ResumeData fields that regexes and dictionaries handle reliably
+(contact details, education degrees, employment date ranges and the years
+of experience they imply) and splits the resume into labeled sections, so
+the LLM only has to complete what is left.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+SECTION_ALIASES = {
+    "summary": [
+        "summary", "professional summary", "executive summary", "executive profile", "profile",
+        "professional profile", "career overview", "objective", "career objective",
+        "summary of qualifications", "qualifications summary", "career focus",
+    ],
+    "skills": [
+        "skills", "skill highlights", "highlights", "technical skills", "key skills", "computer skills",
+        "core qualifications", "core competencies", "areas of expertise", "qualifications", "skill set",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "work history", "employment history",
+        "relevant experience", "career history", "professional background", "employment",
+    ],
+    "education": [
+        "education", "education and training", "academic background", "educational background",
+        "academic qualifications", "education and certifications",
+    ],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses", "professional certifications",
+    ],
+    "languages": ["languages", "language skills"],
+    "accomplishments": ["accomplishments", "achievements", "awards", "honors", "awards and honors"],
+    "additional": [
+        "additional information", "interests", "activities", "affiliations", "professional affiliations",
+        "volunteer experience", "presentations", "publications", "references",
+    ],
+}
+
+_HEADING_LOOKUP = {alias: label for label, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_RE = re.compile(r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]\d{4}(?!\d)")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_-]+/?", re.IGNORECASE)
+
+DEGREE_PATTERNS = [
+    r"Bachelor(?:'s|s)?(?:\s+(?:of|in))?\s+(?:Applied\s+)?(?:Science|Arts|Fine\s+Arts|Business\s+Administration|Engineering|Technology|Architecture|Music|Education|Social\s+Work|Nursing)",
+    r"Master(?:'s|s)?(?:\s+(?:of|in))?\s+(?:Applied\s+)?(?:Science|Arts|Fine\s+Arts|Business\s+Administration|Engineering|Technology|Architecture|Education|Public\s+Administration|Public\s+Health|Social\s+Work)",
+    r"Associate(?:'s|s)?(?:\s+(?:of|in))?\s+(?:Applied\s+)?(?:Science|Arts|Business)",
+    r"Associate(?:'s)?\s+Degree",
+    r"Doctor\s+of\s+(?:Philosophy|Medicine|Education)",
+    r"Ph\.?\s?D\.?",
+    r"M\.?B\.?A\.?",
+    r"B\.S\.|B\.A\.|M\.S\.|M\.A\.|B\.Sc\.?|M\.Sc\.?|B\.Tech\.?|M\.Tech\.?|B\.E\.|M\.E\.",
+    r"Bachelor(?:'s|s)?|Master(?:'s|s)?|Associate(?:'s|s)",
+    r"High\s+School\s+Diploma",
+    r"GED",
+]
+DEGREE_RE = re.compile(r"\b(?:" + "|".join(f"(?:{p})" for p in DEGREE_PATTERNS) + r")(?![A-Za-z])")
+
+INSTITUTION_RE = re.compile(
+    r"((?:[A-Z][\w&'.-]*\s+){0,3}(?:University|College|Institute|School|Academy|Polytechnic)"
+    r"(?:\s+(?:of|for|at)(?:\s+[A-Z][\w&'.-]*){1,4})?)"
+)
+_INSTITUTION_WORD_RE = re.compile(r"\b(?:university|college|institute|school|academy)\b", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_NAME = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+_DATE = rf"(?:{_MONTH_NAME}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:to|-|–|—|until)\s*(?P<end>{_DATE}|Current|Present|Now|Today|Date)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class ResumeSection:
+    """A labeled block of resume text under one heading."""
+    label: str  # header, summary, skills, experience, education, ... or other
+    heading: str
+    text: str
+
+
+@dataclass
+class DateRange:
+    text: str
+    start: Tuple[int, int]  # (year, month)
+    end: Tuple[int, int]
+    is_current: bool = False
+
+    @property
+    def months(self) -> int:
+        return max(0, (self.end[0] - self.start[0]) * 12 + self.end[1] - self.start[1])
+
+
+@dataclass
+class PreExtraction:
+    """Fields resolved without the LLM, plus the sections it still needs to read."""
+    fields: Dict = field(default_factory=dict)
+    sections: List[ResumeSection] = field(default_factory=list)
+    date_ranges: List[DateRange] = field(default_factory=list)
+    resolved_labels: set = field(default_factory=set)
+
+    def unresolved_sections(self) -> List[ResumeSection]:
+        return [s for s in self.sections if s.label not in self.resolved_labels and s.text.strip()]
+
+    def unresolved_text(self) -> str:
+        """Resume text with resolved sections and contact details removed."""
+        parts = []
+        for section in self.unresolved_sections():
+            parts.append(f"{section.heading}\n{section.text}" if section.heading else section.text)
+        return "\n\n".join(parts).strip()
+
+
+def _heading_label(line: str) -> Optional[str]:
+    candidate = line.strip().strip(":").strip().lower()
+    if not candidate or len(candidate) > 40:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def split_sections(text: str) -> List[ResumeSection]:
+    """Split resume text into sections at lines that are known headings."""
+    sections = [ResumeSection(label="header", heading="", text="")]
+    lines: List[str] = []
+    for raw_line in text.splitlines():
+        label = _heading_label(raw_line)
+        if label:
+            sections[-1].text = "\n".join(lines).strip()
+            sections.append(ResumeSection(label=label, heading=raw_line.strip(), text=""))
+            lines = []
+        else:
+            lines.append(raw_line.rstrip())
+    sections[-1].text = "\n".join(lines).strip()
+    return [s for s in sections if s.text or s.label != "header"]
+
+
+def extract_contact_info(text: str) -> Dict[str, Optional[str]]:
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    linkedin = LINKEDIN_RE.search(text)
+    return {
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0).strip() if phone else None,
+        "linkedin": linkedin.group(0) if linkedin else None,
+    }
+
+
+def _parse_date(value: str, today: date) -> Tuple[Tuple[int, int], bool]:
+    value = value.strip().rstrip(".")
+    lowered = value.lower()
+    if lowered in ("current", "present", "now", "today", "date"):
+        return (today.year, today.month), True
+    if "/" in value:
+        month, year = value.split("/")
+        return (int(year), max(1, min(12, int(month)))), False
+    parts = value.split()
+    if len(parts) == 2:
+        return (int(parts[1]), _MONTHS[parts[0][:3].lower()]), False
+    return (int(value), 1), False
+
+
+def extract_date_ranges(text: str, today: date = None) -> List[DateRange]:
+    """Find employment-style date ranges like '08/2006 to Current' or 'June 2013 - March 2016'."""
+    today = today or date.today()
+    ranges = []
+    for match in DATE_RANGE_RE.finditer(text):
+        try:
+            start, _ = _parse_date(match.group("start"), today)
+            end, is_current = _parse_date(match.group("end"), today)
+        except (ValueError, KeyError):
+            continue
+        if start > end or start[0] < 1950:
+            continue
+        ranges.append(DateRange(text=" ".join(match.group(0).split()), start=start, end=end, is_current=is_current))
+    return ranges
+
+
+def estimate_years_of_experience(ranges: List[DateRange]) -> Optional[int]:
+    """Total years covered by the date ranges, counting overlaps once."""
+    if not ranges:
+        return None
+    intervals = sorted((r.start[0] * 12 + r.start[1], r.end[0] * 12 + r.end[1]) for r in ranges)
+    total = 0
+    current_start, current_end = intervals[0]
+    for start, end in intervals[1:]:
+        if start <= current_end:
+            current_end = max(current_end, end)
+        else:
+            total += current_end - current_start
+            current_start, current_end = start, end
+    total += current_end - current_start
+    return round(total / 12)
+
+
+def _clean_entry_text(value: str) -> Optional[str]:
+    """Drop trailing years and the corpus' 'City , State' placeholders."""
+    words = value.split()
+    while words and (YEAR_RE.fullmatch(words[-1]) or words[-1] in ("City", "State", ",")):
+        words.pop()
+    return " ".join(words) or None
+
+
+def _is_clean_field(field_of_study: Optional[str], institution: str) -> bool:
+    """False when the field of study bleeds into dates or the institution name.
+
+    The boundary between them is then a guess, so the entry is left to the LLM.
+    """
+    if not field_of_study:
+        return True
+    if set(field_of_study.split()) & set(institution.split()):
+        return False
+    return not (YEAR_RE.search(field_of_study) or _INSTITUTION_WORD_RE.search(field_of_study)
+                or re.search(rf"\b{_MONTH_NAME}(?:\s|$)", field_of_study))
+
+
+def extract_education(text: str) -> Tuple[List[Dict], bool]:
+    """Extract degree entries from an education section.
+
+    Returns the entries and whether every degree was fully resolved
+    (degree and institution), i.e. the section can skip the LLM.
+    """
+    matches = list(DEGREE_RE.finditer(text))
+    if not matches:
+        return [], False
+
+    entries = []
+    complete = True
+    for i, match in enumerate(matches):
+        # The corpus often puts the year on the line before the degree
+        window_start = text.rfind("\n", 0, max(0, text.rfind("\n", 0, match.start()))) + 1
+        if i > 0:
+            window_start = max(window_start, matches[i - 1].end())
+        window_end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        window = text[window_start:window_end]
+        after = text[match.end():window_end]
+
+        near = "\n".join(after.split("\n")[:2])
+        before = text[window_start:match.start()]
+        institution = INSTITUTION_RE.search(near) or INSTITUTION_RE.search(window)
+        field_match = re.match(r"\s*(?::|in|,|-)\s*([A-Z][^\n:,]*?)(?=\s+(?:[A-Z][\w&'.-]*\s+){0,3}"
+                               r"(?:University|College|Institute|School|Academy)|[\n,]|$)", after)
+        # Prefer a year on the degree's own line, then the line before it
+        years = (YEAR_RE.findall(after.split("\n")[0]) or YEAR_RE.findall(before)
+                 or YEAR_RE.findall(window))
+
+        entry = {
+            "degree": " ".join(match.group(0).split()),
+            "field_of_study": _clean_entry_text(field_match.group(1)) if field_match else None,
+            "institution": _clean_entry_text(institution.group(1)) if institution else None,
+            "graduation_year": max(years) if years else None,
+            "gpa": None,
+            "location": None,
+        }
+        if not entry["institution"] or not _is_clean_field(entry["field_of_study"], entry["institution"]):
+            complete = False
+        entries.append(entry)
+    return entries, complete
+
+
+def pre_extract(text: str, today: date = None) -> PreExtraction:
+    """Run every rule-based extractor over the resume text."""
+    result = PreExtraction(sections=split_sections(text))
+
+    contact = extract_contact_info(text)
+    if any(contact.values()):
+        result.fields["personal_info"] = {k: v for k, v in contact.items() if v}
+
+    # Contact lines carry no further information for the LLM
+    for section in result.sections:
+        if section.label == "header":
+            kept = [line for line in section.text.splitlines()
+                    if not (EMAIL_RE.search(line) or PHONE_RE.search(line) or LINKEDIN_RE.search(line))]
+            section.text = "\n".join(kept).strip()
+
+    education_text = "\n".join(s.text for s in result.sections if s.label == "education")
+    if education_text:
+        education, complete = extract_education(education_text)
+        if education and complete:
+            result.fields["education"] = education
+            result.resolved_labels.add("education")
+
+    # Only dates in an experience section count: elsewhere they are as
+    # likely degrees or certifications, so without one the LLM decides
+    experience_text = "\n".join(s.text for s in result.sections if s.label == "experience")
+    result.date_ranges = extract_date_ranges(experience_text, today) if experience_text else []
+    # Open-ended ranges ("to Current") depend on when the resume was written,
+    # which the text doesn't say; leave those to the LLM
+    if result.date_ranges and not any(r.is_current for r in result.date_ranges):
+        years = estimate_years_of_experience(result.date_ranges)
+        if years is not None:
+            result.fields["years_of_experience"] = years
+
+    return result
@@ -0,0 +1,170 @@
+# utils/resume_metadata.py
+"""
+Filterable ChromaDB metadata for a parsed resume, and the `where` clauses
+that filter on it.
+
+Each vector carries the resume's category, seniority level, years of
+experience and one boolean flag per listed skill, so a search can be
+restricted before ranking instead of the LLM discarding off-target
+candidates afterwards. Values are normalized the same way on both sides:
+
+    resume_metadata(resume)
+    build_where({"category": "ENGINEERING", "min_yoe": 5, "skills": ["Python"]})
+
+The parser's free-text category ("Design", "Software Engineering") is mapped
+onto RESUME_CATEGORIES when stored, and filters only accept those values, so
+a filter can never silently match nothing because of a spelling difference.
+
+Bump RESUME_METADATA_VERSION whenever the fields change so stored vectors
+are found and backfilled.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+
+RESUME_METADATA_VERSION = 2
+
+# Categories resumes are filed under (the data/ folders)
+RESUME_CATEGORIES = ("ENGINEERING", "DESIGNER", "BUSINESS-DEVELOPMENT")
+
+# Words of a free-text category that place it in a canonical one, checked in
+# order: "Business Developer" is business development, not engineering
+_CATEGORY_KEYWORDS = (
+    ("BUSINESS-DEVELOPMENT", ("business", "sales", "bd", "bizdev", "partnership", "partnerships", "account",
+                              "accounts")),
+    ("DESIGNER", ("design", "designer", "designers", "ux", "ui", "graphic", "graphics", "creative", "visual")),
+    ("ENGINEERING", ("engineering", "engineer", "engineers", "software", "developer", "development", "devops",
+                     "data", "backend", "frontend", "fullstack", "programming", "technology", "it")),
+)
+
+# Skill flags are named "skill_<slug>"; resumes listing more skills keep the first ones
+SKILL_FLAG_PREFIX = "skill_"
+MAX_SKILL_FLAGS = 64
+
+FILTER_KEYS = ("category", "seniority_level", "min_yoe", "max_yoe", "skills")
+
+
+def normalize_category(value: Any) -> Optional[str]:
+    """The canonical category a free-text category names, or None if it names none of them.
+
+    'Design', 'designer' and 'UI/UX Design' all map to 'DESIGNER'.
+    """
+    text = " ".join(str(value).split()).upper()
+    if text in RESUME_CATEGORIES:
+        return text
+    words = set(re.findall(r"[a-z]+", text.lower()))
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if words.intersection(keywords):
+            return category
+    return None
+
+
+def normalize_seniority(value: Any) -> str:
+    return " ".join(str(value).split()).lower()
+
+
+def skill_slug(skill: Any) -> str:
+    return re.sub(r"[^a-z0-9+#]+", "_", str(skill).lower()).strip("_")
+
+
+def skill_flag(skill: Any) -> str:
+    """Metadata key flagging a skill, e.g. 'Node.js' -> 'skill_node_js'."""
+    slug = skill_slug(skill)
+    return f"{SKILL_FLAG_PREFIX}{slug}" if slug else ""
+
+
+def resume_metadata(resume: Dict) -> Dict[str, Any]:
+    """Metadata for a parsed resume; fields the resume lacks are left out (Chroma rejects None)."""
+    metadata = {"metadata_version": RESUME_METADATA_VERSION}
+    if not isinstance(resume, dict):
+        return metadata
+    category = normalize_category(resume["category"]) if resume.get("category") else None
+    if category:
+        metadata["category"] = category
+    if resume.get("seniority_level"):
+        metadata["seniority_level"] = normalize_seniority(resume["seniority_level"])
+    years = resume.get("years_of_experience")
+    if isinstance(years, int) and not isinstance(years, bool):
+        metadata["years_of_experience"] = years
+    flags = 0
+    for skill in resume.get("skills") or []:
+        key = skill_flag(skill) if isinstance(skill, str) else ""
+        if key and key not in metadata:
+            metadata[key] = True
+            flags += 1
+            if flags >= MAX_SKILL_FLAGS:
+                break
+    return metadata
+
+
+def _one_of(field: str, values: Any, normalize) -> Dict:
+    values = values if isinstance(values, (list, tuple)) else [values]
+    values = list(dict.fromkeys(normalize(v) for v in values if v not in (None, "")))
+    if len(values) == 1:
+        return {field: values[0]}
+    return {field: {"$in": values}}
+
+
+def normalize_filters(filters: Optional[Dict]) -> Dict[str, Any]:
+    """Drop empty filters, reject unknown ones and normalize values, so equal filters compare (and cache) equal.
+
+    Normalizing normalized filters returns them unchanged.
+    """
+    if not filters:
+        return {}
+    if not isinstance(filters, dict):
+        raise TypeError("Search filters must be an object")
+    unknown = set(filters) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown search filter(s): {', '.join(sorted(unknown))}. "
+                         f"Supported: {', '.join(FILTER_KEYS)}")
+    normalized = {}
+    categories = filters.get("category")
+    categories = [v for v in (categories if isinstance(categories, (list, tuple)) else [categories])
+                  if v not in (None, "")]
+    unknown = [str(v) for v in categories if normalize_category(v) is None]
+    if unknown:
+        raise ValueError(f"Unknown category filter value(s): {', '.join(unknown)}. "
+                         f"Supported: {', '.join(RESUME_CATEGORIES)}")
+    if categories:
+        normalized["category"] = sorted({normalize_category(v) for v in categories})
+    seniority = filters.get("seniority_level")
+    seniority = seniority if isinstance(seniority, (list, tuple)) else [seniority]
+    seniority = sorted({normalize_seniority(v) for v in seniority if v not in (None, "")})
+    if seniority:
+        normalized["seniority_level"] = seniority
+    for key in ("min_yoe", "max_yoe"):
+        if filters.get(key) not in (None, ""):
+            normalized[key] = int(filters[key])
+    skills = filters.get("skills") or []
+    skills = [skills] if isinstance(skills, str) else skills
+    skills = sorted({slug for slug in (skill_slug(skill) for skill in skills) if slug})
+    if skills:
+        normalized["skills"] = skills
+    return normalized
+
+
+def build_where(filters: Optional[Dict]) -> Optional[Dict]:
+    """Chroma `where` clause for structured search filters, or None to search everything.
+
+    Supported filters: category and seniority_level (a value or a list of
+    accepted values), min_yoe / max_yoe (inclusive), and skills (all required).
+    Resumes without a stated years of experience never match a YOE bound.
+    """
+    filters = normalize_filters(filters)
+    clauses: List[Dict] = []
+    if "category" in filters:
+        clauses.append(_one_of("category", filters["category"], normalize_category))
+    if "seniority_level" in filters:
+        clauses.append(_one_of("seniority_level", filters["seniority_level"], normalize_seniority))
+    if "min_yoe" in filters:
+        clauses.append({"years_of_experience": {"$gte": filters["min_yoe"]}})
+    if "max_yoe" in filters:
+        clauses.append({"years_of_experience": {"$lte": filters["max_yoe"]}})
+    for skill in filters.get("skills", []):
+        clauses.append({skill_flag(skill): True})
+    if not clauses:
+        return None
+    # Chroma requires $and to have at least two operands
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
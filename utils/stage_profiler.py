@@ -0,0 +1,169 @@
+# utils/stage_profiler.py
+"""
+Per-stage timing of the ingestion pipeline.
+
+Each stage (hash, extract, parse, write, embed, index) records its wall time
+plus the bytes, tokens and items it processed. Durations go into a fixed
+log-scale histogram for the lifetime of the process, and into a window of
+recent samples from which p50/p95/p99 are computed, so the numbers track
+the current workload instead of averaging over a long-running server.
+
+    with get_stage_profiler().stage("embed", tokens=n, items=len(texts)):
+        ...
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class StageProfilerSettings(BaseSettings):
+    """Stage profiler settings from environment variables."""
+    stage_profiling_enabled: bool = True
+    # Recent samples per stage used for the percentiles
+    stage_profiling_window: int = 4096
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Linearly interpolated percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class StageSample:
+    """Counters of one timed stage run; may be filled in inside the `with` block."""
+    __slots__ = ("bytes", "tokens", "items")
+
+    def __init__(self, bytes: int = 0, tokens: int = 0, items: int = 1):
+        self.bytes = bytes
+        self.tokens = tokens
+        self.items = items
+
+
+class StageStats:
+    """Running totals, histogram and recent durations of one stage."""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.tokens = 0
+        self.items = 0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds: float, sample: StageSample, failed: bool):
+        self.count += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += sample.bytes
+        self.tokens += sample.tokens
+        self.items += sample.items
+        milliseconds = seconds * 1000
+        bucket = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if milliseconds <= bound),
+                      len(HISTOGRAM_BOUNDS_MS))
+        self.buckets[bucket] += 1
+        self.recent.append(milliseconds)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": round(self.seconds, 3),
+            "mean_ms": round(self.seconds * 1000 / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(percentile(ordered, 0.50), 2),
+            "p95_ms": round(percentile(ordered, 0.95), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "bytes": self.bytes,
+            "tokens": self.tokens,
+            "items": self.items,
+            "histogram": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class StageProfiler:
+    """Thread-safe collection of StageStats keyed by stage name."""
+
+    def __init__(self, enabled: bool = True, window: int = 4096):
+        self.enabled = enabled
+        self.window = max(1, window)
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, stage: str, seconds: float, bytes: int = 0, tokens: int = 0, items: int = 1,
+               failed: bool = False):
+        """Record a stage run timed elsewhere (e.g. in a worker process)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if stage not in self._stages:
+                self._stages[stage] = StageStats(self.window)
+            self._stages[stage].add(seconds, StageSample(bytes, tokens, items), failed)
+
+    @contextmanager
+    def stage(self, stage: str, bytes: int = 0, tokens: int = 0, items: int = 1):
+        """Time the block as one run of `stage`; failures are timed and counted as errors."""
+        sample = StageSample(bytes, tokens, items)
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield sample
+            failed = False
+        finally:
+            self.record(stage, time.perf_counter() - started, sample.bytes, sample.tokens, sample.items, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: stats.summary() for name, stats in self._stages.items()}
+        return {
+            "enabled": self.enabled,
+            "since": self.started_at,
+            "window": self.window,
+            "stages": stages,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.time()
+
+
+_profiler: Optional[StageProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_stage_profiler() -> StageProfiler:
+    """The process-wide stage profiler (a no-op when STAGE_PROFILING_ENABLED is off)."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            settings = StageProfilerSettings()
+            _profiler = StageProfiler(settings.stage_profiling_enabled, settings.stage_profiling_window)
+        return _profiler
+
+
+def stage_profile_stats() -> Dict[str, Any]:
+    return get_stage_profiler().stats()